@@ -9,6 +9,9 @@ logger = logging.getLogger("dataproduct-mcp.asset_identifier")
 if TYPE_CHECKING:
     pass
 
+# Valid values for AssetIdentifier.asset_type
+_ASSET_TYPES = frozenset(("product", "contract"))
+
 
 class AssetIdentifier:
     """Base class for all asset identifiers.
@@ -22,6 +25,9 @@ class AssetIdentifier:
     - datameshmanager:contract/123
     """
 
+    # Identifiers are created for every listed asset, so they carry no per-instance __dict__
+    __slots__ = ("asset_id", "asset_type", "_source_name")
+
     def __init__(self, asset_id: str, asset_type: str, source_name: str):
         """
         Initialize an asset identifier.
@@ -31,7 +37,7 @@ class AssetIdentifier:
             asset_type: Type of asset ("product" or "contract")
             source_name: Name of the source (e.g., 'local', 'datameshmanager')
         """
-        if asset_type not in ["product", "contract"]:
+        if asset_type not in _ASSET_TYPES:
             raise ValueError(f"Invalid asset type: {asset_type}")
 
         self.asset_id = asset_id
@@ -1,15 +1,19 @@
 """Unified manager for data contracts and data products."""
 
 import contextlib
+import functools
 import logging
-from typing import Any, Dict, Generator, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Generator, List, Optional, Tuple, Union
 
 from .asset_identifier import AssetIdentifier
 from .resources import docs
 from .sources.asset_source import AssetSourceRegistry
-from .sources.data_source import DataSourceRegistry, ServerType
+from .sources.data_source import KNOWN_SERVER_TYPES, DataSourceRegistry, ServerType
 from .types import DataAssetType
-from .utils.yaml_utils import AssetParseError, parse_yaml
+from .utils.yaml_utils import AssetParseError, parse_yaml, peek_yaml_id
+
+if TYPE_CHECKING:
+    from .query import QuerySource
 
 
 class AssetLoadError(Exception):
@@ -35,6 +39,23 @@ PORT_TYPE_TO_SERVER_TYPE = {
 
 logger = logging.getLogger("dataproduct-mcp.asset_manager")
 
+# Parsed assets by content. The same content is loaded over and over (listings, lookups
+# by id, queries), so each distinct document is only parsed once. The returned dictionaries
+# are shared between callers and must not be modified.
+_parse_asset_content = functools.lru_cache(maxsize=128)(parse_yaml)
+
+
+# Type part of asset identifiers ([source]:[type]/[id]) by asset type; source names are
+# registered by plugins, so only the part after the source is matched
+_IDENTIFIER_TYPE_PREFIXES = {asset_type.value: f"{asset_type.value}/" for asset_type in DataAssetType}
+
+
+def _is_identifier_of_type(identifier: str, asset_type: str) -> bool:
+    """Check whether a string is an asset identifier ([source]:[type]/[id]) of a type, without splitting it."""
+    colon = identifier.find(":")
+    return colon >= 0 and identifier.startswith(_IDENTIFIER_TYPE_PREFIXES[asset_type], colon + 1)
+
+
 @contextlib.contextmanager
 def handle_asset_errors(
     operation_description: str,
@@ -61,7 +82,7 @@ def handle_asset_errors(
     except reraise_types as e:
         # Re-raise these exceptions directly
         context_str = f" on {context_identifier}" if context_identifier else ""
-        logger.error(f"Error {operation_description}{context_str}: {str(e)}")
+        logger.error("Error %s%s: %s", operation_description, context_str, e)
         raise
     except Exception as e:
         # Wrap other exceptions as AssetQueryError
@@ -73,6 +94,10 @@ def handle_asset_errors(
 class DataAssetManager:
     """Manager for unified access to data contracts and data products."""
 
+    # Identifier each asset id was last found under, by (asset type, asset id). Lookups by id
+    # try it first instead of scanning all assets of the type on every query.
+    _identifier_hints: ClassVar[Dict[Tuple[str, str], AssetIdentifier]] = {}
+
     def __init__(self):
         """Initialize the DataAssetManager."""
 
@@ -146,6 +171,29 @@ class DataAssetManager:
             # Convert source-specific error to the general asset error
             raise AssetLoadError(str(e))
 
+    @staticmethod
+    def get_contract_ids(asset_identifier: AssetIdentifier) -> List[str]:
+        """
+        Get the IDs of the data contracts linked from the output ports of a data product.
+
+        Args:
+            asset_identifier: Identifier of the data product
+
+        Returns:
+            Data contract IDs, in the order of the output ports, without duplicates
+
+        Raises:
+            AssetLoadError: If loading fails
+            AssetParseError: If parsing fails
+        """
+        product = DataAssetManager._load_and_parse_asset(asset_identifier)
+        contract_ids = [
+            port["dataContractId"]
+            for port in product.get("outputPorts") or []
+            if isinstance(port, dict) and isinstance(port.get("dataContractId"), str)
+        ]
+        return list(dict.fromkeys(contract_ids))
+
     @staticmethod
     def get_contract_by_id(identifier: str) -> str:
         """
@@ -165,7 +213,7 @@ class DataAssetManager:
             AssetLoadError: If loading fails
         """
         # Check if this is an asset identifier format (contains : and / in expected format)
-        if ":" in identifier and "/" in identifier and identifier.split(":", 1)[1].split("/", 1)[0] == "contract":
+        if _is_identifier_of_type(identifier, DataAssetType.DATA_CONTRACT.value):
             try:
                 # Parse as standard asset identifier
                 asset_identifier = AssetIdentifier.from_string(identifier)
@@ -177,28 +225,29 @@ class DataAssetManager:
                 # Return the complete contract content
                 return DataAssetManager.get_asset_content(asset_identifier)
             except Exception as e:
-                logger.error(f"Error processing contract identifier '{identifier}': {str(e)}")
+                logger.error("Error processing contract identifier '%s': %s", identifier, e)
                 raise
         else:
             # Handle URN format or plain ID by finding the contract by ID
             try:
                 # Use helper method to find contract by ID
-                contract_identifier, contract_dict = DataAssetManager._find_contract_by_id(identifier)
+                contract_identifier, content, _ = DataAssetManager._find_contract_by_id(identifier)
 
                 if not contract_identifier:
                     raise ValueError(f"Could not find data contract with ID: {identifier}")
 
-                # Return the complete contract content
-                return DataAssetManager.get_asset_content(contract_identifier)
+                # Return the complete contract content that was loaded during the lookup
+                return content
             except Exception as e:
-                logger.error(f"Error finding contract with ID '{identifier}': {str(e)}")
+                logger.error("Error finding contract with ID '%s': %s", identifier, e)
                 raise
 
     def execute_query(
         self,
         sources: List[Dict[str, Any]],
         query: str,
-        include_metadata: bool = False
+        include_metadata: bool = False,
+        columnar: bool = False
     ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Unified query method that handles both single-source and federated queries.
@@ -212,6 +261,8 @@ class DataAssetManager:
                     - alias: Optional alias to use in the query
             query: SQL query to execute
             include_metadata: Whether to include metadata in the response
+            columnar: Whether to return the records as column names and value rows
+                instead of one dictionary per record
 
         Returns:
             Query results
@@ -221,12 +272,54 @@ class DataAssetManager:
             AssetQueryError: If query execution fails
         """
         # Import here to avoid circular dependency
-        from .query import FederatedQueryEngine, QuerySource
+        from .query import FederatedQueryEngine
+
+        query_sources = self._to_query_sources(sources)
+        engine = FederatedQueryEngine(self)
+        records = engine.execute_query(query, sources=query_sources, columnar=columnar)
+        return self._format_federated_result(query, query_sources, records, include_metadata, columnar)
+
+    async def execute_query_async(
+        self,
+        sources: List[Dict[str, Any]],
+        query: str,
+        include_metadata: bool = False,
+        columnar: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Execute a query like execute_query, without blocking the event loop.
+
+        Args:
+            sources: List of source configurations, as for execute_query
+            query: SQL query to execute
+            include_metadata: Whether to include metadata in the response
+            columnar: Whether to return the records as column names and value rows
+                instead of one dictionary per record
+
+        Returns:
+            Query results
+
+        Raises:
+            ValueError: If invalid parameters are provided
+            AssetQueryError: If query execution fails
+        """
+        # Import here to avoid circular dependency
+        from .query import FederatedQueryEngine
+
+        query_sources = self._to_query_sources(sources)
+        engine = FederatedQueryEngine(self)
+        records = await engine.execute_query_async(query, sources=query_sources, columnar=columnar)
+        return self._format_federated_result(query, query_sources, records, include_metadata, columnar)
+
+    @staticmethod
+    def _to_query_sources(sources: List[Dict[str, Any]]) -> List["QuerySource"]:
+        """Convert source configurations to QuerySource objects."""
+        # Import here to avoid circular dependency
+        from .query import QuerySource
 
         if not sources:
             raise ValueError("At least one source must be provided")
 
-        # Convert source dictionaries to QuerySource objects
         query_sources = []
         for source_dict in sources:
             if "product_id" not in source_dict:
@@ -240,12 +333,17 @@ class DataAssetManager:
                 alias=source_dict.get("alias")
             )
             query_sources.append(query_source)
+        return query_sources
 
-        # Create a federated query engine and execute
-        engine = FederatedQueryEngine(self)
-        results = engine.execute_query(query, sources=query_sources)
-
-        # Format the result based on include_metadata flag
+    @staticmethod
+    def _format_federated_result(
+        query: str,
+        query_sources: List["QuerySource"],
+        records: Union[List[Dict[str, Any]], Dict[str, Any]],
+        include_metadata: bool,
+        columnar: bool
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Wrap the records of a query with its metadata, if requested."""
         if include_metadata:
             metadata = {
                 "query": query,
@@ -254,15 +352,15 @@ class DataAssetManager:
                     "port_id": s.port_id
                 } for s in query_sources],
                 "federated": True,
-                "record_count": len(results)
+                "record_count": len(records["rows"]) if columnar else len(records)
             }
 
             return {
                 "metadata": metadata,
-                "records": results
+                "records": records
             }
         else:
-            return results
+            return records
 
     @staticmethod
     def query_product(
@@ -312,7 +410,7 @@ class DataAssetManager:
 
             if contract_id:
                 # Find the contract by ID using our helper method
-                matching_contract_identifier, contract = DataAssetManager._find_contract_by_id(contract_id)
+                matching_contract_identifier, _, contract = DataAssetManager._find_contract_by_id(contract_id)
 
                 if not matching_contract_identifier or not contract:
                     raise AssetQueryError(f"Couldn't find data contract with ID '{contract_id}'")
@@ -346,6 +444,43 @@ class DataAssetManager:
                 include_metadata=include_metadata
             )
 
+    @staticmethod
+    def get_model_key(
+            identifier: AssetIdentifier,
+            port_id: Optional[str] = None,
+            model_key: Optional[str] = None
+    ) -> str:
+        """
+        Get the name of the table a query against a data product runs on.
+
+        Args:
+            identifier: Identifier for the data product
+            port_id: Optional ID of the output port (uses first port if not specified)
+            model_key: Optional key of the model to use (if using data contract) or table name (if direct querying)
+
+        Returns:
+            The model key that query_product would use for the same arguments
+
+        Raises:
+            AssetLoadError: If files cannot be loaded
+            AssetParseError: If the assets are invalid
+            AssetQueryError: If required resources aren't found
+        """
+        if model_key:
+            return model_key
+
+        with handle_asset_errors("resolving model", identifier):
+            product = DataAssetManager._load_and_parse_asset(identifier)
+            port = DataAssetManager._get_output_port(product, port_id)
+
+            contract_id = port.get("dataContractId")
+            if contract_id:
+                _, _, contract = DataAssetManager._find_contract_by_id(contract_id)
+                first_model = next(iter((contract or {}).get("models") or {}), None)
+                if first_model:
+                    return first_model
+            return port.get("id", "unknown")
+
     @staticmethod
     def _load_and_parse_asset(asset_identifier: AssetIdentifier) -> Dict[str, Any]:
         """
@@ -357,19 +492,36 @@ class DataAssetManager:
         Returns:
             Parsed asset dictionary
 
+        Raises:
+            AssetLoadError: If loading fails
+            AssetParseError: If parsing fails
+        """
+        return DataAssetManager._load_asset(asset_identifier)[1]
+
+    @staticmethod
+    def _load_asset(asset_identifier: AssetIdentifier) -> Tuple[str, Dict[str, Any]]:
+        """
+        Load an asset and parse it, keeping the raw content alongside the dictionary.
+
+        Args:
+            asset_identifier: Identifier for the asset
+
+        Returns:
+            Tuple of (raw content, parsed asset dictionary)
+
         Raises:
             AssetLoadError: If loading fails
             AssetParseError: If parsing fails
         """
         with handle_asset_errors("loading and parsing asset", asset_identifier):
             content = DataAssetManager.get_asset_content(asset_identifier)
-            return parse_yaml(content)
+            return content, _parse_asset_content(content)
 
     @staticmethod
     def _find_asset_by_type_and_id(
             asset_type: DataAssetType,
             asset_id: str
-    ) -> Tuple[Optional[AssetIdentifier], Optional[Dict[str, Any]]]:
+    ) -> Tuple[Optional[AssetIdentifier], Optional[str], Optional[Dict[str, Any]]]:
         """
         Find an asset by its type and ID.
 
@@ -378,24 +530,61 @@ class DataAssetManager:
             asset_id: ID of the asset to find
 
         Returns:
-            Tuple of (asset_identifier, asset_dict) if found, or (None, None) if not found
+            Tuple of (asset_identifier, content, asset_dict) if found, or (None, None, None) if not found
         """
-        identifiers = DataAssetManager.list_assets(asset_type)
+        hint_key = (asset_type.value, asset_id)
+        hinted_identifier = DataAssetManager._identifier_hints.get(hint_key)
+        if hinted_identifier is not None:
+            found = DataAssetManager._match_asset_id(hinted_identifier, asset_id)
+            if found:
+                return found
+            # The asset was changed or removed, look for it again below
+            DataAssetManager._identifier_hints.pop(hint_key, None)
 
-        for identifier in identifiers:
-            try:
-                # Load and parse the asset
-                asset_dict = DataAssetManager._load_and_parse_asset(identifier)
+        for identifier in DataAssetManager.list_assets(asset_type):
+            found = DataAssetManager._match_asset_id(identifier, asset_id)
+            if found:
+                DataAssetManager._identifier_hints[hint_key] = identifier
+                return found
+
+        return None, None, None
+
+    @staticmethod
+    def _match_asset_id(
+            identifier: AssetIdentifier,
+            asset_id: str
+    ) -> Optional[Tuple[AssetIdentifier, str, Dict[str, Any]]]:
+        """
+        Load an asset and check whether it has the given ID.
 
-                if asset_dict.get("id") == asset_id:
-                    return identifier, asset_dict
-            except (AssetLoadError, AssetParseError):
-                continue
+        Args:
+            identifier: Identifier of the asset to check
+            asset_id: ID to look for
 
-        return None, None
+        Returns:
+            Tuple of (asset_identifier, content, asset_dict) if the asset has the ID, None otherwise
+        """
+        try:
+            with handle_asset_errors("loading and parsing asset", identifier):
+                content = DataAssetManager.get_asset_content(identifier)
+
+                # Rule out assets by their top-level id before paying for a full parse
+                header_id = peek_yaml_id(content)
+                if header_id is not None and header_id != asset_id:
+                    return None
+
+                asset_dict = _parse_asset_content(content)
+        except (AssetLoadError, AssetParseError):
+            return None
+
+        if asset_dict.get("id") == asset_id:
+            return identifier, content, asset_dict
+        return None
 
     @staticmethod
-    def _find_contract_by_id(contract_id: str) -> Tuple[Optional[AssetIdentifier], Optional[Dict[str, Any]]]:
+    def _find_contract_by_id(
+            contract_id: str
+    ) -> Tuple[Optional[AssetIdentifier], Optional[str], Optional[Dict[str, Any]]]:
         """
         Find a data contract by its ID.
 
@@ -406,7 +595,7 @@ class DataAssetManager:
                         - URN format (e.g., 'urn:datacontract:sales:customers')
 
         Returns:
-            Tuple of (contract_identifier, contract_dict) if found, or (None, None) if not found
+            Tuple of (contract_identifier, content, contract_dict) if found, or (None, None, None) if not found
         """
         # First, extract the simple ID if in prefixed format
         simple_id = contract_id
@@ -423,7 +612,7 @@ class DataAssetManager:
             # Get the last part of the URN which is typically the ID
             simple_id = contract_id.split(":")[-1]
 
-        logger.info(f"Looking for contract with ID '{contract_id}', simplified to '{simple_id}'")
+        logger.info("Looking for contract with ID '%s', simplified to '%s'", contract_id, simple_id)
 
         # Try to find by simple ID first
         result = DataAssetManager._find_asset_by_type_and_id(
@@ -436,13 +625,13 @@ class DataAssetManager:
 
         # If not found and the original ID was different, try with the original
         if simple_id != contract_id:
-            logger.info(f"Contract not found with simplified ID, trying original ID: '{contract_id}'")
+            logger.info("Contract not found with simplified ID, trying original ID: '%s'", contract_id)
             return DataAssetManager._find_asset_by_type_and_id(
                 DataAssetType.DATA_CONTRACT, contract_id
             )
 
         # Not found with either ID
-        return None, None
+        return None, None, None
 
 
     # Product output port methods (public)
@@ -581,14 +770,14 @@ class DataAssetManager:
         if not server:
             # Try using type and location if server is not specified
             if port_type and port_location:
-                logger.warning(f"Output port '{port_id}' doesn't have server object, using type and location")
+                logger.warning("Output port '%s' doesn't have server object, using type and location", port_id)
                 # Create simple server configuration from port type and location
                 return {"location": port_location}
             else:
                 raise AssetQueryError("Output port doesn't have server information")
         else:
-            # Return server as is
-            return server
+            # Return a copy, the port may be part of a cached product and the config gets amended
+            return dict(server) if isinstance(server, dict) else server
 
     @staticmethod
     def _resolve_server_type(port: Dict[str, Any], server_config: Dict[str, Any]) -> str:
@@ -621,21 +810,12 @@ class DataAssetManager:
         if server_type is None:
             if "location" in server_config:
                 server_type = ServerType.LOCAL
-                logger.warning(f"Unknown server type '{port_type}', defaulting to LOCAL")
+                logger.warning("Unknown server type '%s', defaulting to LOCAL", port_type)
             else:
                 raise AssetQueryError(f"Unsupported server type '{port_type}' for direct querying")
 
-        # Ensure we always return a string value
-        if isinstance(server_type, str):
-            return server_type
-        else:
-            # Convert any ServerType enum object to its string value
-            for attr_name in dir(ServerType):
-                if attr_name.isupper() and getattr(ServerType, attr_name) == server_type:
-                    return getattr(ServerType, attr_name)
-
-            # Fallback: convert to string if all else fails
-            return str(server_type)
+        # ServerType values are plain strings, so the mapped value can be returned as is
+        return server_type
 
     @staticmethod
     def _query_from_data_contract(
@@ -693,14 +873,18 @@ class DataAssetManager:
             if isinstance(server_type, str):
                 server_type = server_type.lower()
                 # Check if server_type corresponds to a known server type
-                if not hasattr(ServerType, server_type.upper()):
-                    logger.warning(f"Unknown server type '{server_type}', using as is")
+                if server_type not in KNOWN_SERVER_TYPES:
+                    logger.warning("Unknown server type '%s', using as is", server_type)
             else:
                 # Convert non-string type to string
                 server_type = str(server_type)
 
+            # Pass the model's declared fields along so data sources can use the contract's column types
+            server_config = dict(server)
+            server_config["model_fields"] = models[model_key].get("fields") or {}
+
             # Execute the query using the DataSourceRegistry
-            records = DataSourceRegistry.execute_query(server_type, model_key, query, server)
+            records = DataSourceRegistry.execute_query(server_type, model_key, query, server_config)
 
             # Return structured result as dictionary
             return {
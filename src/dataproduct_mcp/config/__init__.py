@@ -1,3 +1,11 @@
 """Configuration system for DataContract MCP using environment variables."""
 
-from .config import SourceType, get_config, get_enabled_sources, get_source_config, is_source_enabled
+from .config import (
+    SourceType,
+    get_assets_dir,
+    get_config,
+    get_duckdb_settings,
+    get_enabled_sources,
+    get_source_config,
+    is_source_enabled,
+)
@@ -2,7 +2,8 @@
 
 import logging
 import os
-from typing import Any, Dict, List, Literal
+import tempfile
+from typing import Any, Callable, Dict, List, Literal
 
 logger = logging.getLogger("dataproduct-mcp.config")
 
@@ -45,46 +46,68 @@ ADDITIONAL_ENV_VARS = {
 }
 
 
-def get_config() -> Dict[str, Any]:
+def get_assets_dir() -> str:
     """
-    Get configuration based on environment variables.
+    Get the directory containing local data assets.
 
     Returns:
-        Dictionary with configuration
+        Value of the DATAASSET_SOURCE environment variable, or an empty string if not set
     """
-    config = {}
+    return os.getenv(ASSET_SOURCE_ENV_VARS["local"], "")
 
-    # Asset source configurations
-    config["asset_sources"] = {}
 
-    # Local file source
-    local_dir = os.getenv(ASSET_SOURCE_ENV_VARS["local"])
-    config["asset_sources"]["local"] = {
+def get_duckdb_settings() -> Dict[str, str]:
+    """
+    Get the settings for the DuckDB databases that run queries.
+
+    DuckDB defaults to one thread per core and 80% of the system memory per database,
+    and in-memory databases spill to a '.tmp' directory under the working directory.
+
+    Returns:
+        DuckDB configuration options: the temporary directory, plus the thread count and
+        memory limit if DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT are set
+    """
+    settings = {"temp_directory": os.getenv("DUCKDB_TEMP_DIRECTORY") or tempfile.gettempdir()}
+    if threads := os.getenv("DUCKDB_THREADS"):
+        settings["threads"] = threads
+    if memory_limit := os.getenv("DUCKDB_MEMORY_LIMIT"):
+        settings["memory_limit"] = memory_limit
+    return settings
+
+
+def _local_asset_source_config() -> Dict[str, Any]:
+    """Configuration of the local file asset source."""
+    local_dir = get_assets_dir()
+    return {
         "enabled": bool(local_dir),
-        "assets_dir": local_dir or ""
+        "assets_dir": local_dir
     }
 
-    # Data Mesh Manager source
+
+def _datameshmanager_asset_source_config() -> Dict[str, Any]:
+    """Configuration of the Data Mesh Manager asset source."""
     dmm_api_key = os.getenv(ASSET_SOURCE_ENV_VARS["datameshmanager"])
-    config["asset_sources"]["datameshmanager"] = {
+    return {
         "enabled": bool(dmm_api_key),
         "api_key": dmm_api_key,
         "api_url": os.getenv("DATAMESH_MANAGER_HOST", ADDITIONAL_ENV_VARS["datameshmanager"]["DATAMESH_MANAGER_HOST"])
     }
 
-    # Data source configurations
-    config["data_sources"] = {}
 
-    # Local data source
-    config["data_sources"]["local"] = {
+def _local_data_source_config() -> Dict[str, Any]:
+    """Configuration of the local data source."""
+    return {
         "enabled": True,  # Always enabled if DuckDB is installed
         "connection_pooling": os.getenv("DATACONTRACT_LOCAL_CONNECTION_POOLING", "1") != "0",
-        "max_connections": int(os.getenv("DATACONTRACT_LOCAL_MAX_CONNECTIONS", "5")),
-        "idle_timeout": int(os.getenv("DATACONTRACT_LOCAL_IDLE_TIMEOUT", "300"))
+        "idle_timeout": int(os.getenv("DATACONTRACT_LOCAL_IDLE_TIMEOUT", "300")),
+        "max_tables": int(os.getenv("DATACONTRACT_LOCAL_MAX_TABLES", "16")),
+        "parquet_cache": os.getenv("DATACONTRACT_LOCAL_PARQUET_CACHE", "1") != "0"
     }
 
-    # S3 data source
-    config["data_sources"]["s3"] = {
+
+def _s3_data_source_config() -> Dict[str, Any]:
+    """Configuration of the S3 data source."""
+    return {
         "enabled": True,  # Will be checked based on DuckDB availability and AWS creds
         "region": os.getenv("AWS_REGION", os.getenv("AWS_DEFAULT_REGION", "us-east-1")),
         "allowed_buckets": [b.strip() for b in os.getenv("S3_ALLOWED_BUCKETS", "").split(",") if b.strip()],
@@ -97,9 +120,11 @@ def get_config() -> Dict[str, Any]:
         }
     }
 
-    # Databricks data source
+
+def _databricks_data_source_config() -> Dict[str, Any]:
+    """Configuration of the Databricks data source."""
     workspace_url = os.getenv("DATABRICKS_WORKSPACE_URL")
-    config["data_sources"]["databricks"] = {
+    return {
         "enabled": bool(workspace_url),
         "workspace_url": workspace_url,
         "catalog": os.getenv("DATABRICKS_CATALOG", ""),
@@ -112,7 +137,34 @@ def get_config() -> Dict[str, Any]:
         }
     }
 
-    return config
+
+# Functions building the configuration of each source from the environment, by source type.
+# A source's configuration is only read when it is asked for, so an invalid
+# setting of one source does not break the configuration of the others.
+SOURCE_CONFIG_BUILDERS: Dict[SourceType, Dict[str, Callable[[], Dict[str, Any]]]] = {
+    "asset": {
+        "local": _local_asset_source_config,
+        "datameshmanager": _datameshmanager_asset_source_config,
+    },
+    "data": {
+        "local": _local_data_source_config,
+        "s3": _s3_data_source_config,
+        "databricks": _databricks_data_source_config,
+    },
+}
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    Get configuration based on environment variables.
+
+    Returns:
+        Dictionary with configuration
+    """
+    return {
+        f"{source_type}_sources": {name: build() for name, build in builders.items()}
+        for source_type, builders in SOURCE_CONFIG_BUILDERS.items()
+    }
 
 
 def get_source_config(source_name: str, source_type: SourceType = "asset") -> Dict[str, Any]:
@@ -126,9 +178,8 @@ def get_source_config(source_name: str, source_type: SourceType = "asset") -> Di
     Returns:
         Dictionary of configuration for the source
     """
-    config = get_config()
-    source_category = f"{source_type}_sources"
-    return config.get(source_category, {}).get(source_name, {})
+    build = SOURCE_CONFIG_BUILDERS.get(source_type, {}).get(source_name)
+    return build() if build else {}
 
 
 def is_source_enabled(source_name: str, source_type: SourceType = "asset") -> bool:
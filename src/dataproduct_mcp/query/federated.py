@@ -1,17 +1,110 @@
 """Federated query engine for executing queries across multiple data products."""
 
+import asyncio
 import concurrent.futures
+import datetime
+import decimal
+import functools
 import logging
-from typing import Any, Dict, List
+import os
+import tempfile
+import threading
+import uuid
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional, Tuple, Union
 
+import pydantic_core
+
+from ..sources.data_plugins.local import create_duckdb_connection, fetch_columnar, iter_records, to_columnar
+from ..utils.sql_utils import quote_identifier, quote_literal
+from .pushdown import build_source_queries, referenced_tables, selected_columns
 from .types import QueryExecutor, QuerySource
 
 logger = logging.getLogger("dataproduct-mcp.query.federated")
 
+# Maximum number of sources loaded at the same time, across all federated queries
+MAX_SOURCE_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Maximum number of sources of a single federated query loaded at the same time, so that
+# one query cannot take up all workers
+MAX_PARALLEL_SOURCES_PER_QUERY = 4
+
+# Number of distinct federated queries whose analysis is kept, so that repeated queries
+# are not parsed again
+PLAN_CACHE_SIZE = 256
+
+# Workers loading source data, shared by all federated queries
+_SOURCE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_SOURCE_WORKERS,
+    thread_name_prefix="federated-source"
+)
+
+
+# DuckDB types of Python values as they are written to JSON, for values of a single type;
+# durations and binary values are written as seconds and hex, and converted back when read
+_JSON_VALUE_TYPES = {
+    bool: "BOOLEAN",
+    float: "DOUBLE",
+    str: "VARCHAR",
+    datetime.date: "DATE",
+    datetime.time: "TIME",
+    datetime.timedelta: "DOUBLE",
+    bytes: "VARCHAR",
+    uuid.UUID: "UUID",
+}
+
+# Range of values of a BIGINT column; integers outside of it are read as HUGEINT
+_BIGINT_RANGE = range(-2 ** 63, 2 ** 63)
+
+
+def _json_column_type(values: List[Any]) -> str:
+    """
+    Get the DuckDB type to read the JSON of a column's values as.
+
+    Args:
+        values: Values of the column, or of the elements or fields of a nested column
+
+    Returns:
+        DuckDB type name; VARCHAR for columns without values and for values of mixed types
+    """
+    present = [value for value in values if value is not None]
+    kinds = {type(value) for value in present}
+    if not kinds:
+        return "VARCHAR"
+
+    if kinds <= {int, decimal.Decimal} and decimal.Decimal in kinds:
+        # Decimals are written as strings, and their values may differ in scale
+        exponents = (value.as_tuple().exponent for value in present if isinstance(value, decimal.Decimal))
+        scale = max((-exponent for exponent in exponents if isinstance(exponent, int)), default=0)
+        return f"DECIMAL(38, {min(38, max(0, scale))})"
+    if kinds == {int}:
+        return "BIGINT" if all(value in _BIGINT_RANGE for value in present) else "HUGEINT"
+    if kinds <= {int, float}:
+        return "DOUBLE"
+    if kinds == {datetime.datetime}:
+        return "TIMESTAMPTZ" if present[0].tzinfo else "TIMESTAMP"
+    if kinds == {list}:
+        return f"{_json_column_type([element for value in present for element in value])}[]"
+    if kinds == {dict}:
+        keys = list(dict.fromkeys(key for value in present for key in value))
+        if keys:
+            fields = (f"{quote_identifier(str(key))} {_json_column_type([value.get(key) for value in present])}"
+                      for key in keys)
+            return f"STRUCT({', '.join(fields)})"
+    if len(kinds) == 1 and (kind := next(iter(kinds))) in _JSON_VALUE_TYPES:
+        return _JSON_VALUE_TYPES[kind]
+    # Nested values of mixed types or without fields keep their JSON, other values are read as text
+    return "JSON" if kinds & {list, dict} else "VARCHAR"
+
 
 class FederatedQueryEngine(QueryExecutor):
     """Engine for executing federated queries across multiple data sources."""
 
+    # In-memory DuckDB database shared by all engines, so that the database is only set up
+    # once. Every query runs on its own cursor, and sources registered on a cursor are only
+    # visible to that cursor.
+    _connection: ClassVar[Optional[Any]] = None
+    _connection_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, asset_manager):
         """
         Initialize the federated query engine.
@@ -21,7 +114,7 @@ class FederatedQueryEngine(QueryExecutor):
         """
         self.asset_manager = asset_manager
 
-    def execute_query(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, **kwargs) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Execute a query with the specified parameters.
 
@@ -29,105 +122,335 @@ class FederatedQueryEngine(QueryExecutor):
             query: SQL query to execute
             **kwargs: Additional parameters:
                 - sources: List of QuerySource objects
+                - columnar: Whether to return column names and value rows instead of records
 
         Returns:
-            Query results
+            Query results, as a dictionary with 'columns' and 'rows' if columnar
+        """
+        sources = kwargs.get("sources", [])
+        if not sources:
+            raise ValueError("At least one source must be provided via the 'sources' parameter")
+
+        return self._execute_federated_query(sources, query, kwargs.get("columnar", False))
+
+    async def execute_query_async(self, query: str, **kwargs) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Execute a query with the specified parameters without blocking the event loop.
+
+        Args:
+            query: SQL query to execute
+            **kwargs: Additional parameters:
+                - sources: List of QuerySource objects
+                - columnar: Whether to return column names and value rows instead of records
+
+        Returns:
+            Query results, as a dictionary with 'columns' and 'rows' if columnar
         """
         sources = kwargs.get("sources", [])
         if not sources:
             raise ValueError("At least one source must be provided via the 'sources' parameter")
 
-        return self._execute_federated_query(sources, query)
+        columnar = kwargs.get("columnar", False)
 
-    def _execute_federated_query(self, sources: List[QuerySource], query: str) -> List[Dict[str, Any]]:
+        sources, source_queries = await asyncio.to_thread(self._plan_federated_query, sources, query)
+        if source_queries is None:
+            records = await asyncio.to_thread(self._execute_single_source_query, sources[0], query)
+            return to_columnar(records) if columnar else records
+
+        with tempfile.TemporaryDirectory(prefix="dataproduct-mcp-") as spill_dir:
+            source_results = await self._aget_source_data_parallel(sources, source_queries, spill_dir)
+            return await asyncio.to_thread(self._execute_final_query, source_results, query, columnar, source_queries)
+
+    def _execute_federated_query(
+        self,
+        sources: List[QuerySource],
+        query: str,
+        columnar: bool = False
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Execute a query across multiple data products.
 
         Args:
             sources: List of data sources to query
             query: SQL query to execute
+            columnar: Whether to return column names and value rows instead of records
 
         Returns:
             Query results
         """
+        sources, source_queries = self._plan_federated_query(sources, query)
+        if source_queries is None:
+            records = self._execute_single_source_query(sources[0], query)
+            return to_columnar(records) if columnar else records
+
+        # Sources are written to JSON files as they are loaded, which are removed once the query is done
+        with tempfile.TemporaryDirectory(prefix="dataproduct-mcp-") as spill_dir:
+            # Get source data in parallel
+            source_results = self._get_source_data_parallel(sources, source_queries, spill_dir)
+
+            # Execute final query using DuckDB
+            return self._execute_final_query(source_results, query, columnar, source_queries)
+
+    def _plan_federated_query(
+        self,
+        sources: List[QuerySource],
+        query: str
+    ) -> Tuple[List[QuerySource], Optional[Dict[str, str]]]:
+        """
+        Decide which sources a query needs and what to query them with.
+
+        Args:
+            sources: List of data sources to query
+            query: SQL query to execute
+
+        Returns:
+            The sources to load and the query to run against each of them, or a single
+            source and None if the query can be sent to that source as is
+        """
         # Handle single source case using the existing path for efficiency
+        if len(sources) == 1:
+            logger.info("Single source query detected, using direct query path for %s", sources[0].product_id)
+            return sources, None
+
+        # Skip the sources the query does not read from
+        sources = self._referenced_sources(sources, query)
+        tables = self._resolve_tables(sources)
+
+        # A single remaining source that the query refers to by its table name can be queried directly
         if len(sources) == 1:
             source = sources[0]
-            logger.info(f"Single source query detected, using direct query path for {source.product_id}")
-            return self._execute_single_source_query(source, query)
+            source_name = source.name
+            if tables[source_name].lower() == source_name.lower():
+                logger.info("Query only reads from %s, using direct query path", source.product_id)
+                return sources, None
 
         # For multiple sources, use the federated query execution path
-        logger.info(f"Executing federated query across {len(sources)} sources")
-
-        # Get source data in parallel
-        source_results = self._get_source_data_parallel(sources)
+        logger.info("Executing federated query across %s sources", len(sources))
 
-        # Execute final query using DuckDB
-        return self._execute_final_query(source_results, query)
+        # Only read the columns and rows the query needs from each source
+        return sources, self._build_source_queries(tables, query)
 
     def _execute_single_source_query(self, source: QuerySource, query: str) -> List[Dict[str, Any]]:
         """Execute a query against a single data source."""
-        try:
-            # Dynamically import to avoid circular dependency
-            from ..asset_identifier import AssetIdentifier
+        # Dynamically import to avoid circular dependency
+        from ..asset_identifier import AssetIdentifier
+
+        identifier = AssetIdentifier.from_string(source.product_id)
+        if not identifier.is_product():
+            raise ValueError(f"Source identifier must be a data product: {source.product_id}")
+
+        # Use the existing DataAssetManager query mechanism
+        return self.asset_manager.query_product(
+            identifier=identifier,
+            query=query,
+            port_id=source.port_id,
+            server_key=source.server,
+            model_key=source.model
+        )
+
+    def _referenced_sources(self, sources: List[QuerySource], query: str) -> List[QuerySource]:
+        """
+        Get the sources a query reads from.
+
+        Args:
+            sources: List of data sources
+            query: Federated SQL query
+
+        Returns:
+            The sources whose name the query uses as a table, or all sources if that cannot be determined
+        """
+        tables = self._plan_referenced_tables(query)
+        if not tables:
+            return sources
+
+        referenced = [s for s in sources if s.name.lower() in tables]
+        if not referenced:
+            return sources
+        if len(referenced) < len(sources):
+            logger.info("Skipping %s sources the query does not read from", len(sources) - len(referenced))
+        return referenced
+
+    def _resolve_tables(self, sources: List[QuerySource]) -> Dict[str, str]:
+        """
+        Get the table name each source is queried with.
+
+        Args:
+            sources: List of data sources
+
+        Returns:
+            Dictionary mapping source names to the model keys of their data products
+        """
+        # Dynamically import to avoid circular dependency
+        from ..asset_identifier import AssetIdentifier
 
+        identifiers = []
+        for source in sources:
             identifier = AssetIdentifier.from_string(source.product_id)
             if not identifier.is_product():
                 raise ValueError(f"Source identifier must be a data product: {source.product_id}")
+            identifiers.append(identifier)
 
-            # Use the existing DataAssetManager query mechanism
-            return self.asset_manager.query_product(
-                identifier=identifier,
-                query=query,
-                port_id=source.port_id,
-                server_key=source.server,
-                model_key=source.model
-            )
-        except Exception as e:
-            logger.error(f"Error executing single source query: {str(e)}")
-            raise
+        def resolve(source: QuerySource, identifier: AssetIdentifier) -> str:
+            return self.asset_manager.get_model_key(identifier, source.port_id, source.model)
+
+        # Resolving a model key loads the data product and its data contract, which may be
+        # remote, so the sources are resolved at the same time instead of one after another
+        if len(sources) == 1:
+            model_keys = [resolve(sources[0], identifiers[0])]
+        else:
+            model_keys = list(_SOURCE_EXECUTOR.map(resolve, sources, identifiers))
+        return {source.name: model_key for source, model_key in zip(sources, model_keys)}
+
+    def _build_source_queries(self, tables: Dict[str, str], query: str) -> Dict[str, str]:
+        """
+        Build the query to run against each source.
+
+        Args:
+            tables: Dictionary mapping source names to the table names they are queried with
+            query: Federated SQL query
+
+        Returns:
+            Dictionary mapping source names to their queries
+        """
+        source_queries = dict(self._plan_source_queries(query, tuple(tables.items())))
+        for source_name, source_query in source_queries.items():
+            logger.debug("Query for source %s: %s", source_name, source_query)
+        return source_queries
 
-    def _get_source_data_parallel(self, sources: List[QuerySource]) -> Dict[str, List[Dict[str, Any]]]:
+    def _get_source_data_parallel(
+        self,
+        sources: List[QuerySource],
+        source_queries: Dict[str, str],
+        spill_dir: Optional[str] = None
+    ) -> Dict[str, Union[List[Dict[str, Any]], str]]:
         """
         Get data from all sources in parallel.
 
         Args:
             sources: List of data sources
+            source_queries: Dictionary mapping source names to the queries to run against them
+            spill_dir: Optional directory to write sources to instead of keeping their records
 
         Returns:
-            Dictionary mapping source aliases to their data
+            Dictionary mapping source aliases to their records, or to the query reading them from a JSON file
         """
+        # Use alias if provided, otherwise use qualified name
+        source_names = [source.name for source in sources]
+        pending = list(zip(source_names, sources))[::-1]
+        futures = {}
         source_results = {}
 
-        # Use concurrent.futures to execute queries in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as executor:
-            # Submit all queries - using SELECT * to get all data from each source
-            future_to_source = {
-                executor.submit(self._get_source_data, source): source
-                for source in sources
-            }
+        try:
+            while pending or futures:
+                # Keep at most a few sources of this query in flight on the shared pool
+                while pending and len(futures) < MAX_PARALLEL_SOURCES_PER_QUERY:
+                    source_name, source = pending.pop()
+                    future = _SOURCE_EXECUTOR.submit(self._load_source, source, source_queries[source_name], spill_dir)
+                    futures[future] = source_name
+
+                # Collect results as they complete
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    source_results[futures.pop(future)] = future.result()
+        finally:
+            # Do not leave work of a failed query queued on the shared pool
+            for future in futures:
+                future.cancel()
+
+        # Same order as the sources, however the loads completed
+        return {name: source_results[name] for name in source_names}
+
+    async def _aget_source_data_parallel(
+        self,
+        sources: List[QuerySource],
+        source_queries: Dict[str, str],
+        spill_dir: Optional[str] = None
+    ) -> Dict[str, Union[List[Dict[str, Any]], str]]:
+        """
+        Get data from all sources concurrently, without blocking the event loop.
+
+        Args:
+            sources: List of data sources
+            source_queries: Dictionary mapping source names to the queries to run against them
+            spill_dir: Optional directory to write sources to instead of keeping their records
+
+        Returns:
+            Dictionary mapping source aliases to their records, or to the query reading them from a JSON file
+        """
+        source_names = [source.name for source in sources]
+        # Keep at most a few sources of this query in flight on the shared pool
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_SOURCES_PER_QUERY)
+        tasks = [
+            asyncio.ensure_future(self._aload_source(source, source_queries[source_name], spill_dir, semaphore))
+            for source_name, source in zip(source_names, sources)
+        ]
+
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # Do not leave loads of a failed query running or queued on the shared pool
+            for task in tasks:
+                task.cancel()
+
+        return dict(zip(source_names, results))
+
+    async def _aload_source(
+        self,
+        source: QuerySource,
+        query: str,
+        spill_dir: Optional[str],
+        semaphore: asyncio.Semaphore
+    ) -> Union[List[Dict[str, Any]], str]:
+        """
+        Load the data of a single source on the shared pool, once the semaphore allows it.
+
+        Data source plugins only have blocking clients, so loads run on the source workers.
 
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_source):
-                source = future_to_source[future]
-                try:
-                    results = future.result()
-                    # Use alias if provided, otherwise use qualified name
-                    source_name = source.alias or self._get_qualified_name(source)
-                    source_results[source_name] = results
-                except Exception as e:
-                    logger.error(f"Error loading data for source {source.product_id}: {str(e)}")
-                    # In a production system, we might want to handle partial failures
-                    raise
+        Args:
+            source: Source configuration
+            query: Query to run against the source
+            spill_dir: Optional directory to write the source to
+            semaphore: Semaphore limiting the sources of the query loaded at the same time
+
+        Returns:
+            List of records from the source, or the query reading them from a JSON file
+        """
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_SOURCE_EXECUTOR, self._load_source, source, query, spill_dir)
+
+    def _load_source(
+        self,
+        source: QuerySource,
+        query: str,
+        spill_dir: Optional[str]
+    ) -> Union[List[Dict[str, Any]], str]:
+        """
+        Load the data of a single source, writing it to a JSON file if a directory is given.
+
+        Args:
+            source: Source configuration
+            query: Query to run against the source
+            spill_dir: Optional directory to write the source to
+
+        Returns:
+            List of records from the source, or the query reading them from a JSON file
+        """
+        records = self._get_source_data(source, query)
+        if spill_dir is None or not records:
+            return records
 
-        return source_results
+        scan = self._write_records(records, spill_dir)
+        logger.debug("Wrote %s records of source %s: %s", len(records), source.product_id, scan)
+        return scan
 
-    def _get_source_data(self, source: QuerySource) -> List[Dict[str, Any]]:
+    def _get_source_data(self, source: QuerySource, query: str) -> List[Dict[str, Any]]:
         """
-        Get all data from a single source.
+        Get the data a federated query needs from a single source.
 
         Args:
             source: Source configuration
+            query: Query to run against the source
 
         Returns:
             List of records from the source
@@ -140,62 +463,179 @@ class FederatedQueryEngine(QueryExecutor):
             if not identifier.is_product():
                 raise ValueError(f"Source identifier must be a data product: {source.product_id}")
 
-            # Use a SELECT * query to get all data
             return self.asset_manager.query_product(
                 identifier=identifier,
-                query="SELECT * FROM source_data",
+                query=query,
                 port_id=source.port_id,
                 server_key=source.server,
                 model_key=source.model
             )
         except Exception as e:
-            logger.error(f"Error getting source data: {str(e)}")
+            logger.error("Error loading data for source %s", source.product_id, exc_info=True)
+            # Keep the exception type for callers, but say which source failed
+            e.add_note(f"While loading data for source {source.product_id}")
             raise
 
     def _execute_final_query(
         self,
-        source_results: Dict[str, List[Dict[str, Any]]],
-        query: str
-    ) -> List[Dict[str, Any]]:
+        source_results: Dict[str, Union[List[Dict[str, Any]], str]],
+        query: str,
+        columnar: bool = False,
+        source_queries: Optional[Dict[str, str]] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Execute the final query against the combined data sources.
 
         Args:
-            source_results: Dictionary mapping source names to their data
+            source_results: Dictionary mapping source names to their records,
+                or to the query reading them from a JSON file
             query: Query to execute against the combined data
+            columnar: Whether to return column names and value rows instead of records
+            source_queries: Optional dictionary mapping source names to the queries their results come from,
+                used to find the columns of sources without results
 
         Returns:
             Query results
         """
+        with tempfile.TemporaryDirectory(prefix="dataproduct-mcp-") as tmp_dir:
+            con = self._cursor()
+            try:
+                # Expose each result set as a view
+                for source_name, results in source_results.items():
+                    if not results:
+                        self._register_empty_source(con, source_name, (source_queries or {}).get(source_name))
+                        continue
+
+                    scan = results if isinstance(results, str) else self._write_records(results, tmp_dir)
+                    # Temporary views only exist on this cursor and are dropped when it is closed.
+                    # DuckDB only reads the columns the query uses from the file.
+                    con.execute(f"CREATE TEMP VIEW {quote_identifier(source_name)} AS {scan}")
+                    logger.debug("Registered source %s as %s", source_name, scan)
+
+                result = con.execute(query)
+                if columnar:
+                    # Keep the rows as DuckDB returns them instead of building a dictionary per row
+                    return fetch_columnar(result)
+                # Convert rows to dictionaries batch by batch
+                return list(iter_records(result))
+            finally:
+                con.close()
+
+
+    @staticmethod
+    def _register_empty_source(con: Any, source_name: str, source_query: Optional[str]) -> None:
+        """
+        Expose a source without results as an empty view with the columns its query selects.
+
+        Without a view, every query on the source would fail because the table does not
+        exist. With one, DuckDB ends joins with the empty source early.
+
+        Args:
+            con: DuckDB cursor the final query runs on
+            source_name: Name of the source in the query
+            source_query: Query the source was loaded with, if known
+        """
+        columns = selected_columns(source_query, con) if source_query else None
+        if not columns:
+            # The columns of the source are unknown, so there is nothing to register
+            logger.warning("No results from source %s", source_name)
+            return
+
+        # The columns have no values to detect types from, so they are untyped nulls
+        select_list = ", ".join(f"NULL AS {quote_identifier(column)}" for column in columns)
+        con.execute(f"CREATE TEMP VIEW {quote_identifier(source_name)} AS SELECT {select_list} WHERE FALSE")
+        logger.debug("Registered source %s without results", source_name)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _plan_referenced_tables(query: str) -> Optional[FrozenSet[str]]:
+        """
+        Get the names of the tables a query reads from, cached by query.
+
+        Args:
+            query: Federated SQL query
+
+        Returns:
+            Lower-cased table names, or None if the query cannot be parsed
+        """
+        con = FederatedQueryEngine._cursor()
+        try:
+            tables = referenced_tables(query, con)
+        finally:
+            con.close()
+        return frozenset(tables) if tables is not None else None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+    def _plan_source_queries(query: str, tables: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Build the query to run against each source, cached by query and source tables.
+
+        Args:
+            query: Federated SQL query
+            tables: Pairs of source name and the table name the source is queried with
+
+        Returns:
+            Pairs of source name and the query to run against the source
+        """
+        con = FederatedQueryEngine._cursor()
         try:
-            # Use DuckDB to execute the query against the combined data
-            import duckdb
+            return tuple(build_source_queries(query, dict(tables), con).items())
+        finally:
+            con.close()
 
-            con = duckdb.connect(":memory:")
+    @classmethod
+    def _cursor(cls) -> Any:
+        """
+        Get a new cursor on the shared DuckDB database, creating the database on first use.
 
-            # Register each result set as a table
-            for source_name, results in source_results.items():
-                if not results:  # Skip empty results
-                    logger.warning(f"No results from source {source_name}")
-                    continue
+        Returns:
+            DuckDB cursor, to be closed by the caller
+        """
+        with cls._connection_lock:
+            if cls._connection is None:
+                cls._connection = create_duckdb_connection()
+            return cls._connection.cursor()
 
-                # Register as a view in DuckDB
-                con.register(source_name, results)
-                logger.debug(f"Registered source {source_name} with {len(results)} records")
+    @staticmethod
+    def _write_records(records: List[Dict[str, Any]], directory: str) -> str:
+        """
+        Write records to a new JSON file for DuckDB to read.
 
-            # Execute the query
-            final_results = con.execute(query).fetchall()
+        The file is read with the column types of the records' values. Durations and
+        binary values, which JSON has no representation for, are converted back when read.
 
-            # Convert to list of dictionaries
-            column_names = [desc[0] for desc in con.description]
-            return [
-                {column_names[i]: value for i, value in enumerate(row)}
-                for row in final_results
-            ]
+        Args:
+            records: Records of a source
+            directory: Directory to create the file in
 
-        except Exception as e:
-            logger.error(f"Error executing final query: {str(e)}")
-            raise
+        Returns:
+            Query reading the records from the JSON file
+        """
+        fd, path = tempfile.mkstemp(suffix=".json", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            # Durations are written as seconds and binary values as hex, so they can be converted back;
+            # other values without a JSON representation are written as strings, as in query responses
+            f.write(pydantic_core.to_json(records, timedelta_mode="float", bytes_mode="hex", fallback=str))
+
+        # Explicit column types, so DuckDB neither guesses them from a sample of the rows
+        # nor reads text that looks like a date or a number as one
+        columns = []
+        conversions = []
+        for name in records[0]:
+            values = [record.get(name) for record in records]
+            columns.append(f"{quote_literal(name)}: {quote_literal(_json_column_type(values))}")
+            value = next((value for value in values if value is not None), None)
+            column = quote_identifier(name)
+            if isinstance(value, datetime.timedelta):
+                conversions.append(f"to_microseconds(CAST(round({column} * 1000000) AS BIGINT)) AS {column}")
+            elif isinstance(value, bytes):
+                conversions.append(f"unhex({column}) AS {column}")
+
+        scan = f"read_json({quote_literal(path)}, format = 'array', columns = {{{', '.join(columns)}}})"
+        if conversions:
+            return f"SELECT * REPLACE ({', '.join(conversions)}) FROM {scan}"
+        return f"SELECT * FROM {scan}"
 
     def get_capabilities(self) -> Dict[str, Any]:
         """
@@ -213,11 +653,3 @@ class FederatedQueryEngine(QueryExecutor):
             "max_sources": 10,  # Reasonable limit for most use cases
             "streaming": False,  # Current implementation loads all data into memory
         }
-
-    @staticmethod
-    def _get_qualified_name(source: QuerySource) -> str:
-        """Get a qualified name for a source to use as a table name."""
-        base = source.product_id.replace(':', '_').replace('/', '_')
-        if source.port_id:
-            base += f"_{source.port_id}"
-        return base
@@ -0,0 +1,304 @@
+"""Derive the queries a federated query sends to each of its sources."""
+
+import copy
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from ..utils.sql_utils import quote_identifier
+
+logger = logging.getLogger("dataproduct-mcp.query.pushdown")
+
+# Join types after which a filter on one side may be applied before the join
+_FILTERABLE_JOIN_REF_TYPES = frozenset(("REGULAR", "CROSS"))
+
+# Functions whose result changes between calls, so they must not be evaluated twice
+_VOLATILE_FUNCTIONS = frozenset(("random", "gen_random_uuid", "uuid", "nextval", "setseed"))
+
+# Expression classes that cannot be evaluated against a single source
+_UNPUSHABLE_CLASSES = frozenset(("SUBQUERY", "WINDOW", "STAR", "PARAMETER"))
+
+# Statement whose WHERE clause is replaced to render pushed down filters
+_TEMPLATE_QUERY = "SELECT * FROM _table WHERE TRUE AND TRUE"
+_TEMPLATE_PREFIX = "SELECT * FROM _table WHERE "
+
+
+def build_source_queries(query: str, tables: Dict[str, str], conn) -> Dict[str, str]:
+    """
+    Build the query to run against each source of a federated query.
+
+    The federated query is parsed by DuckDB itself. Each source query selects only
+    the columns the federated query references through that source, and filters
+    on the WHERE conjuncts that only reference that source. The federated query is
+    still run as is on the combined results, so pushing work down only reduces the
+    data that is transferred. Whenever the query uses anything that cannot be
+    attributed to a single source, such as unqualified columns or SELECT *, the
+    source query falls back to reading all columns.
+
+    Args:
+        query: Federated SQL query
+        tables: Mapping of source names used in the query to the table names the sources are queried with
+        conn: DuckDB connection used to parse the query
+
+    Returns:
+        Mapping of source names to the queries to run against them
+    """
+    try:
+        statement = _parse(conn, query)
+    except Exception as e:
+        logger.debug("Not pushing down query parts, parsing failed: %s", e)
+        statement = None
+
+    if statement is None:
+        return {name: f"SELECT * FROM {quote_identifier(table)}" for name, table in tables.items()}
+
+    plan = _QueryPlan(statement, tables)
+    queries = {}
+    for name, table in tables.items():
+        try:
+            queries[name] = _render(conn, table, plan.columns.get(name), plan.predicates.get(name, []), plan.limits.get(name))
+        except Exception as e:
+            logger.debug("Not pushing down query parts for source %s: %s", name, e)
+            queries[name] = f"SELECT * FROM {quote_identifier(table)}"
+    return queries
+
+
+def referenced_tables(query: str, conn) -> Optional[Set[str]]:
+    """
+    Get the names of the tables a query reads from.
+
+    Args:
+        query: SQL query
+        conn: DuckDB connection used to parse the query
+
+    Returns:
+        Lower-cased names of all tables the query reads without a schema, or None if the query cannot be parsed
+    """
+    try:
+        statement = _parse(conn, query)
+    except Exception as e:
+        logger.debug("Could not parse query to find its tables: %s", e)
+        return None
+    if statement is None:
+        return None
+
+    return {
+        node["table_name"].lower()
+        for node in _iter_nodes(statement)
+        if node.get("type") == "BASE_TABLE" and not node.get("schema_name") and not node.get("catalog_name")
+    }
+
+
+def selected_columns(query: str, conn) -> Optional[List[str]]:
+    """
+    Get the names of the columns a query selects, if it only selects plain columns.
+
+    Args:
+        query: SQL query, such as a query built by build_source_queries
+        conn: DuckDB connection used to parse the query
+
+    Returns:
+        Column names in the order they are selected, or None if the query selects anything else
+    """
+    try:
+        statement = _parse(conn, query)
+    except Exception as e:
+        logger.debug("Could not parse query to find its columns: %s", e)
+        return None
+    if statement is None or statement.get("type") != "SELECT_NODE":
+        return None
+
+    columns = []
+    for node in statement.get("select_list", []):
+        if node.get("class") != "COLUMN_REF" or node.get("alias") or len(node["column_names"]) != 1:
+            return None
+        columns.append(node["column_names"][0])
+    return columns
+
+
+def _parse(conn, query: str) -> Optional[Dict[str, Any]]:
+    """Parse a single SELECT statement into its JSON syntax tree."""
+    parsed = json.loads(conn.execute("SELECT json_serialize_sql(?)", [query]).fetchone()[0])
+    if parsed.get("error") or len(parsed.get("statements", [])) != 1:
+        return None
+    return parsed["statements"][0]["node"]
+
+
+def _iter_nodes(value: Any) -> Iterator[Dict[str, Any]]:
+    """Yield all nodes of a syntax tree."""
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from _iter_nodes(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _iter_nodes(child)
+
+
+class _QueryPlan:
+    """The columns, filters and limits of a federated query, per source."""
+
+    def __init__(self, statement: Dict[str, Any], tables: Dict[str, str]):
+        self.columns: Dict[str, Optional[List[str]]] = {}
+        self.predicates: Dict[str, List[Dict[str, Any]]] = {}
+        self.limits: Dict[str, int] = {}
+
+        self._refs: Dict[str, str] = {}
+        self._ref_counts: Counter = Counter()
+
+        nodes = list(_iter_nodes(statement))
+        # CTEs may shadow source names, so leave queries with CTEs alone
+        if any(node.get("cte_map", {}).get("map") for node in nodes):
+            return
+
+        sources = {name.lower(): name for name in tables}
+        names: Set[str] = set()
+        for node in nodes:
+            # Table references are the nodes with a sample clause, apart from SELECT nodes and joins
+            if "sample" not in node or "modifiers" in node or node.get("type") == "JOIN":
+                continue
+            name = (node.get("alias") or node.get("table_name") or "").lower()
+            if not name:
+                continue
+            if name in names:
+                # The same name in different scopes may refer to different tables
+                return
+            names.add(name)
+            if node.get("type") == "BASE_TABLE" and not node.get("schema_name") and not node.get("catalog_name"):
+                source = sources.get(node["table_name"].lower())
+                if source:
+                    self._refs[name] = source
+                    self._ref_counts[source] += 1
+
+        joins = [node for node in nodes if node.get("type") == "JOIN"]
+        self._collect_columns(nodes, joins)
+        if statement.get("type") == "SELECT_NODE":
+            self._collect_predicates(statement, joins)
+            self._collect_limit(statement, joins)
+
+    def _source_of(self, column_names: List[str]) -> Optional[str]:
+        """Get the source a qualified column reference points to."""
+        if len(column_names) < 2:
+            return None
+        return self._refs.get(column_names[0].lower())
+
+    def _collect_columns(self, nodes: List[Dict[str, Any]], joins: List[Dict[str, Any]]) -> None:
+        """Collect the columns referenced through each source."""
+        for join in joins:
+            if join.get("using_columns") or join.get("ref_type") not in _FILTERABLE_JOIN_REF_TYPES:
+                return
+
+        columns: Dict[str, Dict[str, str]] = {source: {} for source in self._ref_counts}
+        for node in nodes:
+            node_class = node.get("class")
+            if node_class == "STAR":
+                return
+            if node_class == "COLUMN_REF":
+                source = self._source_of(node["column_names"])
+                if source is None:
+                    return
+                # DuckDB matches column names case-insensitively
+                column = node["column_names"][1]
+                columns[source].setdefault(column.lower(), column)
+
+        self.columns = {source: list(names.values()) for source, names in columns.items() if names}
+
+    def _collect_predicates(self, statement: Dict[str, Any], joins: List[Dict[str, Any]]) -> None:
+        """Collect the WHERE conjuncts that only reference a single source."""
+        where = statement.get("where_clause")
+        if not where:
+            return
+        # Filtering the null-supplying side of an outer join before the join changes the result
+        for join in joins:
+            if join.get("join_type") != "INNER" or join.get("ref_type") not in _FILTERABLE_JOIN_REF_TYPES:
+                return
+
+        conjuncts = where["children"] if where.get("type") == "CONJUNCTION_AND" else [where]
+        for conjunct in conjuncts:
+            source = self._pushable_source(conjunct)
+            if source is not None:
+                predicate = copy.deepcopy(conjunct)
+                for node in _iter_nodes(predicate):
+                    if node.get("class") == "COLUMN_REF":
+                        node["column_names"] = node["column_names"][1:]
+                self.predicates.setdefault(source, []).append(predicate)
+
+    def _pushable_source(self, conjunct: Dict[str, Any]) -> Optional[str]:
+        """Get the source a conjunct can be evaluated on, if there is exactly one."""
+        sources: Set[Optional[str]] = set()
+        for node in _iter_nodes(conjunct):
+            node_class = node.get("class")
+            if node_class in _UNPUSHABLE_CLASSES:
+                return None
+            if node_class == "FUNCTION" and node.get("function_name", "").lower() in _VOLATILE_FUNCTIONS:
+                return None
+            if node_class == "COLUMN_REF":
+                sources.add(self._source_of(node["column_names"]))
+
+        if len(sources) != 1:
+            return None
+        source = sources.pop()
+        # A filter on a source that is used more than once would apply to all of its uses
+        if source is None or self._ref_counts[source] != 1:
+            return None
+        return source
+
+    def _collect_limit(self, statement: Dict[str, Any], joins: List[Dict[str, Any]]) -> None:
+        """Collect a top-level LIMIT of a query that reads a single source without joins."""
+        from_table = statement.get("from_table") or {}
+        if joins or from_table.get("type") != "BASE_TABLE" or from_table.get("sample"):
+            return
+        source = self._refs.get((from_table.get("alias") or from_table.get("table_name", "")).lower())
+        if source is None:
+            return
+        if statement.get("where_clause") or statement.get("group_expressions") or statement.get("having"):
+            return
+        if statement.get("qualify") or statement.get("sample"):
+            return
+        # Aggregates and window functions need every row, plain column references do not
+        if any(node.get("class") != "COLUMN_REF" for node in statement.get("select_list", [])):
+            return
+
+        modifiers = statement.get("modifiers", [])
+        if len(modifiers) != 1 or modifiers[0].get("type") != "LIMIT_MODIFIER" or modifiers[0].get("offset"):
+            return
+        limit = modifiers[0].get("limit") or {}
+        value = limit.get("value", {})
+        if limit.get("class") == "CONSTANT" and not value.get("is_null") and isinstance(value.get("value"), int):
+            self.limits[source] = value["value"]
+
+
+def _render(
+        conn,
+        table: str,
+        columns: Optional[List[str]],
+        predicates: List[Dict[str, Any]],
+        limit: Optional[int]
+) -> str:
+    """Render the query for a single source."""
+    if columns:
+        projection = ", ".join(quote_identifier(column) for column in columns)
+    else:
+        projection = "*"
+    source_query = f"SELECT {projection} FROM {quote_identifier(table)}"
+
+    if predicates:
+        source_query += " WHERE " + _render_filter(conn, predicates)
+    if limit is not None:
+        source_query += f" LIMIT {limit}"
+    return source_query
+
+
+def _render_filter(conn, predicates: List[Dict[str, Any]]) -> str:
+    """Let DuckDB turn filter conjuncts back into SQL, so they are rendered exactly as parsed."""
+    template = _parse(conn, _TEMPLATE_QUERY)
+    where = template["where_clause"]
+    where["children"] = predicates
+    template["where_clause"] = where if len(predicates) > 1 else predicates[0]
+
+    statement = {"error": False, "statements": [{"node": template, "named_param_map": []}]}
+    rendered = conn.execute("SELECT json_deserialize_sql(?::JSON)", [json.dumps(statement)]).fetchone()[0]
+    if not rendered.startswith(_TEMPLATE_PREFIX):
+        raise ValueError(f"Unexpected rendering of filter: {rendered}")
+    return rendered[len(_TEMPLATE_PREFIX):]
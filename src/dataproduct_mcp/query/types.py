@@ -4,8 +4,11 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+# Characters of product identifiers that cannot appear in unquoted table names
+_NAME_TRANSLATION = str.maketrans({":": "_", "/": "_"})
 
-@dataclass
+
+@dataclass(slots=True)
 class QuerySource:
     """Represents a data source for federated queries."""
     product_id: str
@@ -14,6 +17,16 @@ class QuerySource:
     model: Optional[str] = None
     alias: Optional[str] = None
 
+    @property
+    def name(self) -> str:
+        """Name of the source as a table in federated queries: its alias, or a name derived from its identifier."""
+        if self.alias:
+            return self.alias
+        name = self.product_id.translate(_NAME_TRANSLATION)
+        if self.port_id:
+            name += f"_{self.port_id}"
+        return name
+
 
 class QueryExecutor(ABC):
     """Abstract base class for query executors."""
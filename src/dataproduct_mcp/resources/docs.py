@@ -3,14 +3,17 @@
 Documentation loaders and helpers for Data Contract.
 """
 
+import functools
 import logging
 from pathlib import Path
-from typing import Dict
 
 logger = logging.getLogger("dataproduct-mcp-server.resources.docs")
 
-# Cache for loaded documentation
-_docs_cache: Dict[str, str] = {}
+# Directory holding the resource files, in one subdirectory per file extension
+_RESOURCE_ROOT = Path(__file__).resolve().parent
+
+# Maximum number of resource file versions kept in memory
+DOCS_CACHE_SIZE = 32
 
 
 def get_datacontract_schema() -> str:
@@ -63,24 +66,34 @@ def _load_doc_resource(filename: str) -> str:
     Returns:
         File contents as string
     """
-    # Check cache first
-    if content := _docs_cache.get(filename):
-        return content
-
     try:
         resource_extension = Path(filename).suffix.lstrip('.')
-        resource_path = Path(__file__).parent / resource_extension / filename
+        resource_path = _RESOURCE_ROOT / resource_extension / filename
 
-        if not resource_path.exists():
-            raise FileNotFoundError(f"Documentation resource {filename} not found")
+        try:
+            mtime_ns = resource_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Documentation resource {filename} not found") from None
 
-        content = resource_path.read_text(encoding="utf-8")
-        
-        # Cache the content
-        _docs_cache[filename] = content
-        return content
+        # The modification time is part of the cache key, so a changed file is read again
+        return _read_doc_resource(resource_path, mtime_ns)
 
     except Exception as e:
-        logger.error(f"Error loading documentation resource {filename}: {str(e)}")
+        logger.error("Error loading documentation resource %s: %s", filename, e)
         # Return fallback if loading fails
         return ""
+
+
+@functools.lru_cache(maxsize=DOCS_CACHE_SIZE)
+def _read_doc_resource(resource_path: Path, mtime_ns: int) -> str:
+    """
+    Read a documentation resource file, cached by path and modification time.
+
+    Args:
+        resource_path: Path of the resource file
+        mtime_ns: Modification time of the file in nanoseconds
+
+    Returns:
+        File contents as string
+    """
+    return resource_path.read_text(encoding="utf-8")
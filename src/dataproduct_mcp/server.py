@@ -1,6 +1,9 @@
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
+import pydantic_core
 from dotenv import load_dotenv
 from mcp.server import FastMCP
 
@@ -16,6 +19,80 @@ logger = logging.getLogger("dataproduct-mcp")
 
 app = FastMCP("dataproduct-mcp")
 
+# Tool calls in progress by tool name and arguments; identical concurrent calls share one of them
+_in_flight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+
+async def _single_flight(key: Tuple[str, str], call: Callable[[], Awaitable[Any]]) -> Any:
+    """Run a call, or wait for the result of the identical call that is already in progress."""
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(call())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # A caller that is cancelled must not cancel the call the other callers are waiting for
+    return await asyncio.shield(task)
+
+
+# Calls to the same asset source that may run at the same time; calls to different sources do not wait for each other
+MAX_CALLS_PER_SOURCE = 4
+
+# Semaphores limiting the calls to each asset source, by source name
+_source_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+async def _call_source(source: Optional[str], func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking call to an asset source in a worker thread.
+
+    Args:
+        source: Name of the source the call goes to, or None if it may go to any source
+        func: Function to call
+        *args: Arguments for the function
+
+    Returns:
+        The result of the function
+    """
+    if source is None:
+        return await asyncio.to_thread(func, *args)
+
+    semaphore = _source_semaphores.get(source)
+    if semaphore is None:
+        semaphore = _source_semaphores[source] = asyncio.Semaphore(MAX_CALLS_PER_SOURCE)
+    async with semaphore:
+        return await asyncio.to_thread(func, *args)
+
+
+def _source_of(identifier: str) -> Optional[str]:
+    """Get the source an identifier refers to, or None for URNs and plain IDs, which are looked up in all sources."""
+    source, separator, rest = identifier.partition(":")
+    return source if separator and "/" in rest else None
+
+
+# Prefetches running in the background, referenced until they are done so they are not garbage collected
+_prefetches: Set["asyncio.Task[None]"] = set()
+
+
+async def _prefetch_contracts(asset_identifier: AssetIdentifier) -> None:
+    """Load the data contracts linked from a data product, so they are cached when they are requested."""
+    try:
+        contract_ids = await _call_source(
+            asset_identifier.source, DataAssetManager.get_contract_ids, asset_identifier
+        )
+        # Requests for a contract that arrive while it is loaded wait for this load
+        await asyncio.gather(*(
+            _single_flight(
+                ("dataproducts_get_output_schema", contract_id),
+                functools.partial(
+                    _call_source, _source_of(contract_id), DataAssetManager.get_contract_by_id, contract_id
+                )
+            )
+            for contract_id in contract_ids
+        ))
+    except Exception as e:
+        logger.debug("Could not prefetch the data contracts of %s: %s", asset_identifier, e)
+
+
 # Prompts
 @app.prompt(name="Initial Prompt")
 def initial_prompt() -> str:
@@ -114,7 +191,8 @@ async def datacontract_schema() -> str:
 @app.tool("dataproducts_list")
 async def dataproducts_list() -> List[Dict[str, str]]:
     """Lists all available Data Products."""
-    identifiers = DataAssetManager.list_assets(DataAssetType.DATA_PRODUCT)
+    # Asset sources read files and call remote APIs, which must not block the event loop
+    identifiers = await asyncio.to_thread(DataAssetManager.list_assets, DataAssetType.DATA_PRODUCT)
     return [{"id": str(identifier), "source": identifier.source} for identifier in identifiers]
 
 @app.tool("dataproducts_get")
@@ -130,7 +208,16 @@ async def dataproducts_get(identifier: str) -> str:
     if not asset_identifier.is_product():
         raise ValueError(f"Identifier does not refer to a product: {identifier}")
 
-    return DataAssetManager.get_asset_content(asset_identifier)
+    content = await _single_flight(
+        ("dataproducts_get", identifier),
+        lambda: _call_source(asset_identifier.source, DataAssetManager.get_asset_content, asset_identifier)
+    )
+
+    # The linked data contracts are usually requested next, so load them while the product is read
+    prefetch = asyncio.ensure_future(_prefetch_contracts(asset_identifier))
+    _prefetches.add(prefetch)
+    prefetch.add_done_callback(_prefetches.discard)
+    return content
 
 @app.tool("dataproducts_get_output_schema")
 async def dataproducts_get_output_port(identifier: str) -> str:
@@ -147,14 +234,18 @@ async def dataproducts_get_output_port(identifier: str) -> str:
     Returns:
         The complete data contract content
     """
-    return DataAssetManager.get_contract_by_id(identifier)
+    return await _single_flight(
+        ("dataproducts_get_output_schema", identifier),
+        lambda: _call_source(_source_of(identifier), DataAssetManager.get_contract_by_id, identifier)
+    )
 
 @app.tool("dataproducts_query")
 async def dataproducts_query(
     sources: List[Dict[str, Any]],
     query: str,
-    include_metadata: bool = False
-) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    include_metadata: bool = False,
+    columnar: bool = False
+) -> str:
     """
     Query data from one or more data products.
 
@@ -167,9 +258,11 @@ async def dataproducts_query(
                 - alias: Optional alias to use in the query (recommended for multi-source queries)
         query: SQL query to execute
         include_metadata: Whether to include metadata in the response
+        columnar: Whether to return records as {"columns": [...], "rows": [[...], ...]}
+                 instead of one object per record, which is more compact for large results
 
     Returns:
-        Query results from either a single source or multiple joined sources
+        Query results from either a single source or multiple joined sources, as JSON
 
     Notes:
         - Table names in the SQL query should match the data structure in each source
@@ -214,15 +307,23 @@ async def dataproducts_query(
         if not query:
             raise ValueError("Query cannot be empty")
 
-        # Create an asset manager and execute the query
-        asset_manager = DataAssetManager()
-        return asset_manager.execute_query(
-            sources=sources,
-            query=query,
-            include_metadata=include_metadata
-        )
+        async def run_query() -> str:
+            # Create an asset manager and execute the query; the sources are read in worker
+            # threads, so other requests are served while the query waits on them
+            asset_manager = DataAssetManager()
+            result = await asset_manager.execute_query_async(
+                sources=sources,
+                query=query,
+                include_metadata=include_metadata,
+                columnar=columnar
+            )
+            # Serialize the whole result once; a returned list would become one text content per record
+            return pydantic_core.to_json(result, fallback=str).decode()
+
+        arguments = pydantic_core.to_json([sources, query, include_metadata, columnar], fallback=str).decode()
+        return await _single_flight(("dataproducts_query", arguments), run_query)
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
+        logger.error("Error executing query: %s", e)
         raise
 
 def main():
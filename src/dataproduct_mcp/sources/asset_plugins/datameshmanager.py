@@ -1,15 +1,17 @@
 """DataMeshManager asset source plugin for data products and contracts."""
 
+import hashlib
 import logging
 import os
+import threading
 import time
-from typing import Any, ClassVar, Dict, List, Optional
-
-import yaml
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 from ...asset_identifier import AssetIdentifier
 from ...asset_manager import AssetLoadError
 from ...types import DataAssetType
+from ...utils.cache_utils import PersistentCache
+from ...utils.yaml_utils import dump_yaml
 from ..asset_source import AssetSourcePlugin
 from .datameshmanager_client import DataMeshManager
 
@@ -18,6 +20,8 @@ logger = logging.getLogger("dataproduct-mcp.sources.asset_plugins.datameshmanage
 class DataMeshManagerAssetIdentifier(AssetIdentifier):
     """Asset identifier for Data Mesh Manager API sources."""
 
+    __slots__ = ()
+
     def __init__(self, asset_id: str, asset_type: str):
         """
         Initialize a Data Mesh Manager asset identifier.
@@ -33,14 +37,14 @@ class DataMeshManagerAssetIdentifier(AssetIdentifier):
 class DataMeshManagerSource(AssetSourcePlugin):
     """Plugin for accessing data assets from the Data Mesh Manager API."""
 
-    # Class-level cache for DataMeshManager assets
-    _cache: ClassVar[Dict[str, Dict[str, Any]]] = {
+    # Class-level cache for DataMeshManager assets by asset type: key -> (expiry time, data)
+    _cache: ClassVar[Dict[str, Dict[str, Tuple[float, Dict[str, Any]]]]] = {
         "product": {},
         "contract": {}
     }
 
-    # Cache expiration (in seconds)
-    _cache_expiry: ClassVar[Dict[str, float]] = {}
+    # Cached listings by asset type: (expiry time, identifiers)
+    _list_cache: ClassVar[Dict[str, Tuple[float, List[AssetIdentifier]]]] = {}
 
     # Default cache TTL (5 minutes)
     _default_cache_ttl = 300
@@ -50,6 +54,11 @@ class DataMeshManagerSource(AssetSourcePlugin):
         self._api_token = os.getenv("DATAMESH_MANAGER_API_KEY")
         self._api_url = os.getenv("DATAMESH_MANAGER_HOST", "https://api.datamesh-manager.com")
         self._cache_ttl = int(os.getenv("DATAMESH_MANAGER_CACHE_TTL", str(self._default_cache_ttl)))
+        # Optional cache file, so that listings and assets outlive the process
+        self._persistent_cache = self._open_persistent_cache(os.getenv("DATAMESH_MANAGER_CACHE_FILE"))
+        # API client shared by all requests, so its connections are kept alive between them
+        self._client: Optional[DataMeshManager] = None
+        self._client_lock = threading.Lock()
 
     @property
     def source_name(self) -> str:
@@ -81,48 +90,79 @@ class DataMeshManagerSource(AssetSourcePlugin):
             logger.info("DataMeshManager API key not set, skipping DataMeshManager resources")
             return []
 
-        identifiers = []
-
         try:
-            dmm = DataMeshManager(base_url=self._api_url, api_key=self._api_token)
-
-            asset_type_str = asset_type.value
-
-            if asset_type == DataAssetType.DATA_PRODUCT:
-                # Get data products from the API
-                products = dmm.list_data_products()
-                # Handle different response formats
-                items = products.get('items', []) if isinstance(products, dict) else products
-                for product in items:
-                    if not isinstance(product, dict):
-                        continue
-                    product_id = product.get('id')
-                    if product_id:
-                        identifier = self.get_identifier(asset_type, product_id)
-                        identifiers.append(identifier)
-                        # Update cache
-                        self._update_cache(asset_type_str, str(identifier), product)
-
-            elif asset_type == DataAssetType.DATA_CONTRACT:
-                # Get data contracts from the API
-                contracts = dmm.list_data_contracts()
-                # Handle different response formats
-                items = contracts.get('items', []) if isinstance(contracts, dict) else contracts
-                for contract in items:
-                    if not isinstance(contract, dict):
-                        continue
-                    contract_id = contract.get('id')
-                    if contract_id:
-                        identifier = self.get_identifier(asset_type, contract_id)
-                        identifiers.append(identifier)
-                        # Update cache
-                        self._update_cache(asset_type_str, str(identifier), contract)
-
+            # The cached list is shared, callers get their own copy
+            return list(self._list_identifiers(asset_type))
         except ImportError:
             logger.warning("DataMeshManager module not available")
         except Exception as e:
-            logger.warning(f"Error listing assets from DataMeshManager: {str(e)}")
+            logger.warning("Error listing assets from DataMeshManager: %s", e)
+
+        return []
 
+    def _list_identifiers(self, asset_type: DataAssetType) -> List[AssetIdentifier]:
+        """Get the identifiers of all assets of a type, using a short-lived cache.
+
+        Listing is called on every resource listing, so the identifiers built from the
+        API response are kept for the cache TTL instead of being fetched and built again
+        each time. The listed assets are normalized and cached when the list is fetched.
+
+        Args:
+            asset_type: Type of asset (product or contract)
+
+        Returns:
+            List of DataMeshManagerAssetIdentifier objects
+        """
+        asset_type_str = asset_type.value
+        cached = self._list_cache.get(asset_type_str)
+        if cached and cached[0] > time.monotonic():
+            logger.debug("Using cached %s list", asset_type_str)
+            return cached[1]
+
+        list_key = self._persistent_key("list", asset_type_str)
+        persisted = self._persistent_cache.get(list_key) if self._persistent_cache else None
+        if persisted is not None:
+            # The listed assets themselves were cached separately when the list was fetched
+            item_ids, ttl = persisted
+            identifiers = [self.get_identifier(asset_type, item_id) for item_id in item_ids]
+            self._list_cache[asset_type_str] = (time.monotonic() + ttl, identifiers)
+            logger.debug("Using %s list from cache file", asset_type_str)
+            return identifiers
+
+        dmm = self._get_client()
+
+        if asset_type == DataAssetType.DATA_PRODUCT:
+            response = dmm.list_data_products()
+        elif asset_type == DataAssetType.DATA_CONTRACT:
+            response = dmm.list_data_contracts()
+        else:
+            return []
+
+        # Handle different response formats
+        items = response.get('items', []) if isinstance(response, dict) else response
+
+        identifiers = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id = item.get('id')
+            if item_id:
+                identifier = self.get_identifier(asset_type, item_id)
+                identifiers.append(identifier)
+                # Normalize before caching so that cache hits need no further processing
+                if asset_type == DataAssetType.DATA_PRODUCT:
+                    self._prefix_contract_ids(item)
+                # Update cache
+                self._update_cache(asset_type_str, str(identifier), item)
+
+        self._list_cache[asset_type_str] = (time.monotonic() + self._cache_ttl, identifiers)
+        if self._persistent_cache:
+            self._persistent_cache.set(list_key, [i.asset_id for i in identifiers], self._cache_ttl)
+
+        # Assets that were removed upstream are never read again, so drop expired entries here
+        self._evict_expired(asset_type_str)
+        if self._persistent_cache:
+            self._persistent_cache.evict_expired()
         return identifiers
 
     def load_asset_content(self, identifier: AssetIdentifier) -> str:
@@ -152,29 +192,12 @@ class DataMeshManagerSource(AssetSourcePlugin):
 
         cached_data = self._get_from_cache(asset_type, cache_key)
         if cached_data:
-            # Even for cached content, ensure dataContractId fields have source prefix
-            if identifier.is_product() and "outputPorts" in cached_data:
-                modified = False
-                for port in cached_data.get("outputPorts", []):
-                    if "dataContractId" in port and port["dataContractId"]:
-                        contract_id = port["dataContractId"]
-                        # Only add prefix if it doesn't already have one
-                        if ":" not in contract_id:
-                            logger.info(f"Adding source prefix to cached dataContractId: {contract_id} -> {self.source_name}:contract/{contract_id}")
-                            port["dataContractId"] = f"{self.source_name}:contract/{contract_id}"
-                            modified = True
-
-                # Update cache if modified
-                if modified:
-                    self._update_cache(asset_type, cache_key, cached_data)
-
-            # Return cached content as YAML
-            return yaml.dump(cached_data)
+            # Cached data is normalized before it is cached, so it can be returned as is
+            return dump_yaml(cached_data)
 
         # Not in cache, fetch from API
         try:
-            from .datameshmanager_client import DataMeshManager
-            dmm = DataMeshManager(base_url=self._api_url, api_key=self._api_token)
+            dmm = self._get_client()
 
             if identifier.is_product():
                 data = dmm.get_data_product(identifier.asset_id)
@@ -185,29 +208,13 @@ class DataMeshManagerSource(AssetSourcePlugin):
 
             # If this is a product, process dataContractId fields to add source prefix
             if identifier.is_product():
-                # Handle different structures - ensure outputPorts exists
-                if "outputPorts" not in data and isinstance(data, dict):
-                    # Try to detect if this is a data product without the expected structure
-                    if "id" in data and "info" in data:
-                        # Initialize empty outputPorts if it doesn't exist
-                        data["outputPorts"] = data.get("outputPorts", [])
-
-                # Now process dataContractId fields
-                for port in data.get("outputPorts", []):
-                    if "dataContractId" in port and port["dataContractId"]:
-                        contract_id = port["dataContractId"]
-                        # Only add prefix if it doesn't already have one
-                        if ":" not in contract_id:
-                            logger.info(f"Adding source prefix to dataContractId: {contract_id} -> {self.source_name}:contract/{contract_id}")
-                            port["dataContractId"] = f"{self.source_name}:contract/{contract_id}"
-                        else:
-                            logger.info(f"dataContractId already has prefix: {contract_id}")
+                self._prefix_contract_ids(data)
 
             # Cache the result
             self._update_cache(asset_type, cache_key, data)
 
             # Return as YAML
-            return yaml.dump(data)
+            return dump_yaml(data)
         except ImportError as e:
             raise AssetLoadError(f"Failed to import DataMeshManager: {str(e)}")
         except Exception as e:
@@ -231,6 +238,7 @@ class DataMeshManagerSource(AssetSourcePlugin):
             "api_url": self._api_url,
             "api_token_set": bool(self._api_token),
             "cache_ttl": self._cache_ttl,
+            "cache_file": self._persistent_cache.path if self._persistent_cache else None,
             "available": self.is_available()
         }
 
@@ -244,18 +252,81 @@ class DataMeshManagerSource(AssetSourcePlugin):
         - api_url: URL of the DataMeshManager API
         - api_token: API token for authentication
         - cache_ttl: Cache time-to-live in seconds
+        - cache_file: Path of a SQLite file to keep cached assets in across restarts, or None
         """
         if "api_url" in config:
             self._api_url = config["api_url"]
-            logger.info(f"Updated DataMeshManager API URL: {self._api_url}")
+            self._list_cache.clear()
+            self._close_client()
+            logger.info("Updated DataMeshManager API URL: %s", self._api_url)
 
         if "api_token" in config:
             self._api_token = config["api_token"]
+            self._list_cache.clear()
+            self._close_client()
             logger.info("Updated DataMeshManager API token")
 
         if "cache_ttl" in config:
             self._cache_ttl = int(config["cache_ttl"])
-            logger.info(f"Updated DataMeshManager cache TTL: {self._cache_ttl} seconds")
+            logger.info("Updated DataMeshManager cache TTL: %s seconds", self._cache_ttl)
+
+        if "cache_file" in config:
+            if self._persistent_cache:
+                self._persistent_cache.close()
+            self._persistent_cache = self._open_persistent_cache(config["cache_file"])
+            self._list_cache.clear()
+            logger.info("Updated DataMeshManager cache file: %s", config["cache_file"])
+
+    def _get_client(self) -> DataMeshManager:
+        """Get the API client for the configured URL and token, creating it if necessary.
+
+        Returns:
+            DataMeshManager client
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._client = DataMeshManager(base_url=self._api_url, api_key=self._api_token)
+            return self._client
+
+    def _close_client(self) -> None:
+        """Close the API client, so the next request creates one for the current configuration."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    @staticmethod
+    def _open_persistent_cache(path: Optional[str]) -> Optional[PersistentCache]:
+        """Open the cache file, if one is configured.
+
+        Args:
+            path: Path of the cache file, or None
+
+        Returns:
+            PersistentCache instance, or None if no file is configured or it cannot be opened
+        """
+        if not path:
+            return None
+        try:
+            return PersistentCache(os.path.expanduser(path))
+        except Exception as e:
+            logger.warning("Could not open DataMeshManager cache file %s: %s", path, e)
+            return None
+
+    def _persistent_key(self, *parts: str) -> str:
+        """Build a cache file key that is specific to the API URL and token.
+
+        Different tokens may see different assets, so the token is part of the key,
+        as a hash to keep it out of the file.
+
+        Args:
+            *parts: Parts identifying the cached value
+
+        Returns:
+            Cache file key
+        """
+        account = hashlib.sha256(f"{self._api_url}\0{self._api_token}".encode("utf-8")).hexdigest()[:16]
+        return ":".join((account, *parts))
 
     def _update_cache(self, asset_type: str, key: str, data: Dict[str, Any]) -> None:
         """Add or update data in the cache.
@@ -265,14 +336,17 @@ class DataMeshManagerSource(AssetSourcePlugin):
             key: Cache key
             data: Data to cache
         """
-        self._cache.setdefault(asset_type, {})
-        self._cache[asset_type][key] = data
-        self._cache_expiry[key] = time.time() + self._cache_ttl
-        logger.debug(f"Cached {asset_type} data for {key}")
+        self._cache.setdefault(asset_type, {})[key] = (time.monotonic() + self._cache_ttl, data)
+        if self._persistent_cache:
+            self._persistent_cache.set(self._persistent_key(asset_type, key), data, self._cache_ttl)
+        logger.debug("Cached %s data for %s", asset_type, key)
 
     def _get_from_cache(self, asset_type: str, key: str) -> Optional[Dict[str, Any]]:
         """Get data from the cache if not expired.
 
+        Expired entries are removed from the cache when they are read. Entries that are
+        not in memory are looked up in the cache file, if one is configured.
+
         Args:
             asset_type: Type of asset ("product" or "contract")
             key: Cache key
@@ -280,13 +354,38 @@ class DataMeshManagerSource(AssetSourcePlugin):
         Returns:
             Cached data if valid, None otherwise
         """
-        if asset_type not in self._cache or key not in self._cache[asset_type]:
+        type_cache = self._cache.get(asset_type)
+        entry = type_cache.get(key) if type_cache else None
+        if entry is None:
+            if not self._persistent_cache:
+                return None
+            persisted = self._persistent_cache.get(self._persistent_key(asset_type, key))
+            if persisted is None:
+                return None
+            data, ttl = persisted
+            self._cache.setdefault(asset_type, {})[key] = (time.monotonic() + ttl, data)
+            logger.debug("Using data for %s from cache file", key)
+            return data
+
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            logger.debug("Cache expired for %s", key)
+            type_cache.pop(key, None)
             return None
 
-        if key not in self._cache_expiry or self._cache_expiry[key] < time.time():
-            # Expired or no expiry set
-            logger.debug(f"Cache expired for {key}")
-            return None
+        logger.debug("Using cached data for %s", key)
+        return data
+
+    def _evict_expired(self, asset_type: str) -> None:
+        """Remove all expired entries of an asset type from the cache.
+
+        Args:
+            asset_type: Type of asset ("product" or "contract")
+        """
+        type_cache = self._cache.get(asset_type)
+        if not type_cache:
+            return
 
-        logger.debug(f"Using cached data for {key}")
-        return self._cache[asset_type][key]
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in type_cache.items() if expires_at <= now]:
+            del type_cache[key]
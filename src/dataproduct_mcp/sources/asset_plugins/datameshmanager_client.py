@@ -3,9 +3,17 @@ import logging
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to the API; the server loads up to 4 assets per source at once,
+# and prefetched data contracts add to that
+POOL_SIZE = 16
+
+# Seconds to wait for a connection to the API, and for the API to respond
+TIMEOUT = (2.0, 30.0)
+
 class DataMeshManager:
     """
     Client for the Data Mesh Manager API.
@@ -23,6 +31,9 @@ class DataMeshManager:
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         # Set default headers
         self.session.headers.update({
@@ -34,6 +45,10 @@ class DataMeshManager:
         if api_key:
             self.session.headers.update({"x-api-key": api_key})
 
+    def close(self) -> None:
+        """Close the connections of the client."""
+        self.session.close()
+
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response and potential errors."""
         try:
@@ -49,10 +64,10 @@ class DataMeshManager:
             logger.error(error_msg)
             raise
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request Exception: {e}")
+            logger.error("Request Exception: %s", e)
             raise
         except json.JSONDecodeError:
-            logger.error(f"JSON Decode Error: Unable to parse response as JSON: {response.text}")
+            logger.error("JSON Decode Error: Unable to parse response as JSON: %s", response.text)
             raise
 
     # Data Products Endpoints
@@ -81,7 +96,7 @@ class DataMeshManager:
         if filter_params:
             params.update(filter_params)
 
-        response = self.session.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=TIMEOUT)
         return self._handle_response(response)
 
     def get_data_product(self, data_product_id: str) -> Dict[str, Any]:
@@ -95,7 +110,7 @@ class DataMeshManager:
             Data product details
         """
         url = f"{self.base_url}/api/dataproducts/{data_product_id}"
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=TIMEOUT)
         return self._handle_response(response)
 
     # Data Contracts Endpoints
@@ -124,7 +139,7 @@ class DataMeshManager:
         if filter_params:
             params.update(filter_params)
 
-        response = self.session.get(url, params=params)
+        response = self.session.get(url, params=params, timeout=TIMEOUT)
         return self._handle_response(response)
 
     def get_data_contract(self, data_contract_id: str) -> Dict[str, Any]:
@@ -138,5 +153,5 @@ class DataMeshManager:
             Data contract details
         """
         url = f"{self.base_url}/api/datacontracts/{data_contract_id}"
-        response = self.session.get(url)
+        response = self.session.get(url, timeout=TIMEOUT)
         return self._handle_response(response)
\ No newline at end of file
@@ -3,20 +3,26 @@
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List
-
-import yaml
+from typing import Any, Dict, List, Tuple
 
 from ...asset_identifier import AssetIdentifier
 from ...asset_manager import AssetLoadError
+from ...config import get_assets_dir
 from ...types import DataAssetType
+from ...utils.yaml_utils import dump_yaml, load_yaml
 from ..asset_source import AssetSourcePlugin
 
 logger = logging.getLogger("dataproduct-mcp.sources.asset_plugins.local")
 
+# File extensions of local assets, all sharing the ".yaml" suffix
+_ASSET_EXTENSIONS = ('.dataproduct.yaml', '.datacontract.yaml')
+_YAML_SUFFIX = '.yaml'
+
 
 class LocalAssetIdentifier(AssetIdentifier):
     """Asset identifier for local file sources."""
+
+    __slots__ = ()
     
     def __init__(self, asset_id: str, asset_type: str):
         """
@@ -35,7 +41,13 @@ class LocalAssetSource(AssetSourcePlugin):
 
     def __init__(self):
         """Initialize the local asset source."""
-        self._assets_dir = os.getenv("DATAASSET_SOURCE", "")
+        self._assets_dir = get_assets_dir()
+        # Resolved once, so asset paths can be checked against it without resolving it again
+        self._assets_root = Path(self._assets_dir).resolve()
+        # Cached directory listings by extension: (directory mtime, file names)
+        self._listing_cache: Dict[str, Tuple[int, List[str]]] = {}
+        # Cached processed file contents by identifier: (file mtime, file size, content)
+        self._content_cache: Dict[str, Tuple[int, int, str]] = {}
 
     @property
     def source_name(self) -> str:
@@ -63,26 +75,69 @@ class LocalAssetSource(AssetSourcePlugin):
         Returns:
             List of LocalAssetIdentifier objects
         """
-        if not self.is_available():
+        if not self._assets_dir:
             logger.info("DATAASSET_SOURCE environment variable not set, skipping local resources")
             return []
 
         extension = '.dataproduct.yaml' if asset_type == DataAssetType.DATA_PRODUCT else '.datacontract.yaml'
         identifiers = []
 
-        if os.path.exists(self._assets_dir):
-            for fname in os.listdir(self._assets_dir):
-                file_path = os.path.join(self._assets_dir, fname)
-                if os.path.isfile(file_path) and fname.lower().endswith(extension):
-                    try:
-                        identifiers.append(self.get_identifier(asset_type, fname))
-                    except ValueError:
-                        logger.warning(f"Skipping file with invalid name format: {fname}")
-        else:
-            logger.warning(f"Assets directory {self._assets_dir} does not exist")
+        # A missing directory shows up when listing it, so it is not checked separately up front
+        try:
+            filenames = self._list_filenames(extension)
+        except FileNotFoundError:
+            logger.warning("Assets directory %s does not exist", self._assets_dir)
+            return []
+
+        for fname in filenames:
+            try:
+                identifiers.append(self.get_identifier(asset_type, fname))
+            except ValueError:
+                logger.warning("Skipping file with invalid name format: %s", fname)
 
         return identifiers
 
+    def _list_filenames(self, extension: str) -> List[str]:
+        """List the names of all files in the assets directory with a given extension.
+
+        A single directory scan collects the files for every asset extension at once,
+        and the result is reused as long as the modification time of the assets
+        directory is unchanged, so repeated listings only cost a single stat() call.
+
+        Args:
+            extension: One of the asset file extensions (e.g. '.dataproduct.yaml')
+
+        Returns:
+            List of matching file names
+        """
+        mtime = os.stat(self._assets_dir).st_mtime_ns
+        cached = self._listing_cache.get(extension)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        suffixes = [(ext, len(ext)) for ext in _ASSET_EXTENSIONS]
+        yaml_suffix_len = len(_YAML_SUFFIX)
+        listings: Dict[str, List[str]] = {ext: [] for ext in _ASSET_EXTENSIONS}
+
+        # scandir exposes the file type from the directory read itself, so
+        # checking the (cheap) extension first avoids a stat() per entry
+        with os.scandir(self._assets_dir) as entries:
+            for entry in entries:
+                fname = entry.name
+                # Reject non-YAML files with one check, and only lowercase a suffix
+                # slice (not the whole name) when the exact suffix does not match
+                if not (fname.endswith(_YAML_SUFFIX) or fname[-yaml_suffix_len:].lower() == _YAML_SUFFIX):
+                    continue
+                for ext, ext_len in suffixes:
+                    if fname.endswith(ext) or fname[-ext_len:].lower() == ext:
+                        if entry.is_file():
+                            listings[ext].append(fname)
+                        break
+
+        for ext, filenames in listings.items():
+            self._listing_cache[ext] = (mtime, filenames)
+        return listings[extension]
+
     def load_asset_content(self, identifier: AssetIdentifier) -> str:
         """Load the content of a local asset.
 
@@ -101,55 +156,45 @@ class LocalAssetSource(AssetSourcePlugin):
         if not isinstance(identifier, LocalAssetIdentifier):
             raise AssetLoadError(f"Invalid identifier type for local source: {type(identifier)}")
 
-        if not self.is_available():
+        if not self._assets_dir:
             logger.info("DATAASSET_SOURCE environment variable not set, local resources unavailable")
             raise AssetLoadError("Local resources unavailable - DATAASSET_SOURCE not set")
 
         filename = identifier.asset_id
-        resource_path = Path(f"{self._assets_dir}/{filename}")
+        resource_path = (self._assets_root / filename).resolve()
+        # Asset IDs come from clients, so absolute paths and '..' must not lead out of the assets directory
+        if not resource_path.is_relative_to(self._assets_root):
+            raise AssetLoadError(f"Asset {filename} is outside the assets directory")
 
-        if not resource_path.exists():
-            raise AssetLoadError(f"Asset file not found at {resource_path}")
+        cache_key = str(identifier)
 
         try:
-            with open(resource_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # If this is a product, process dataContractId fields to add source prefix
-            if identifier.is_product():
-                try:
-                    data = yaml.safe_load(content)
-                    if data:
-                        # Handle different structures - ensure outputPorts exists
-                        if "outputPorts" not in data and isinstance(data, dict):
-                            # Try to detect if this is a data product without the expected structure
-                            if "id" in data and "info" in data:
-                                # Initialize empty outputPorts if it doesn't exist
-                                data["outputPorts"] = data.get("outputPorts", [])
-
-                        modified = False
-                        for port in data.get("outputPorts", []):
-                            if "dataContractId" in port and port["dataContractId"]:
-                                contract_id = port["dataContractId"]
-                                # Only add prefix if it doesn't already have one
-                                if ":" not in contract_id:
-                                    logger.info(f"Adding source prefix to local dataContractId: {contract_id} -> {self.source_name}:contract/{contract_id}")
-                                    port["dataContractId"] = f"{self.source_name}:contract/{contract_id}"
-                                    modified = True
-                                else:
-                                    logger.info(f"Local dataContractId already has prefix: {contract_id}")
-
-                        # If modifications were made, convert back to YAML
-                        if modified:
-                            content = yaml.dump(data)
-                except Exception as e:
-                    # If YAML processing fails, just return the original content
-                    logger.warning(f"Error processing dataContractId in {filename}: {str(e)}")
-
-            return content
+            # Unchanged files are served from the cache without reading or processing them again
+            stat = os.stat(resource_path)
+            cached = self._content_cache.get(cache_key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+
+            content = resource_path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise AssetLoadError(f"Asset file not found at {resource_path}")
         except Exception as e:
             raise AssetLoadError(f"Error reading local asset file {filename}: {str(e)}")
 
+        # If this is a product, process dataContractId fields to add source prefix
+        if identifier.is_product():
+            try:
+                data = load_yaml(content)
+                # If modifications were made, convert back to YAML
+                if data and self._prefix_contract_ids(data):
+                    content = dump_yaml(data)
+            except Exception as e:
+                # If YAML processing fails, just return the original content
+                logger.warning("Error processing dataContractId in %s: %s", filename, e)
+
+        self._content_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, content)
+        return content
+
     def is_available(self) -> bool:
         """Check if local assets are available.
 
@@ -183,4 +228,7 @@ class LocalAssetSource(AssetSourcePlugin):
         """
         if "assets_dir" in config:
             self._assets_dir = config["assets_dir"]
-            logger.info(f"Updated local assets directory: {self._assets_dir}")
+            self._assets_root = Path(self._assets_dir).resolve()
+            self._listing_cache.clear()
+            self._content_cache.clear()
+            logger.info("Updated local assets directory: %s", self._assets_dir)
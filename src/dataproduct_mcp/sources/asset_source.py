@@ -4,6 +4,7 @@ import importlib
 import logging
 import pkgutil
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, ClassVar, Dict, ForwardRef, List, Optional, Type
 
 from ..config import get_enabled_sources, get_source_config
@@ -17,6 +18,12 @@ else:
 
 logger = logging.getLogger("dataproduct-mcp.sources.asset_source")
 
+# Maximum number of asset sources listed at the same time, across all listings
+MAX_LISTING_WORKERS = 8
+
+# Workers listing asset sources, shared by all listings so that listing does not start threads per call
+_LISTING_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_LISTING_WORKERS, thread_name_prefix="asset-listing")
+
 
 class AssetSourcePlugin(ABC):
     """Base interface for data asset source plugins.
@@ -107,6 +114,38 @@ class AssetSourcePlugin(ABC):
         """
         pass
 
+    def _prefix_contract_ids(self, data: Dict[str, Any]) -> bool:
+        """Add this source's prefix to the dataContractId fields of a data product in place.
+
+        References that already carry a source prefix are left unchanged.
+
+        Args:
+            data: Parsed data product
+
+        Returns:
+            True if any dataContractId was modified, False otherwise
+        """
+        # Handle different structures - ensure outputPorts exists
+        if "outputPorts" not in data and isinstance(data, dict):
+            # Try to detect if this is a data product without the expected structure
+            if "id" in data and "info" in data:
+                # Initialize empty outputPorts if it doesn't exist
+                data["outputPorts"] = data.get("outputPorts", [])
+
+        modified = False
+        for port in data.get("outputPorts", []):
+            if "dataContractId" in port and port["dataContractId"]:
+                contract_id = port["dataContractId"]
+                # Only add prefix if it doesn't already have one
+                if ":" not in contract_id:
+                    logger.info("Adding source prefix to dataContractId: %s -> %s:contract/%s", contract_id, self.source_name, contract_id)
+                    port["dataContractId"] = f"{self.source_name}:contract/{contract_id}"
+                    modified = True
+                else:
+                    logger.info("dataContractId already has prefix: %s", contract_id)
+
+        return modified
+
     @classmethod
     def register(cls, plugin_class: Type['AssetSourcePlugin']) -> Type['AssetSourcePlugin']:
         """Register a plugin class.
@@ -124,7 +163,7 @@ class AssetSourcePlugin(ABC):
         # Check if already registered to avoid duplicate messages
         if source_name not in cls._registry:
             cls._registry[source_name] = plugin_class
-            logger.debug(f"Registered asset source plugin: {source_name}")
+            logger.debug("Registered asset source plugin: %s", source_name)
         
         return plugin_class
 
@@ -182,7 +221,7 @@ class AssetSourceRegistry:
                 # If we have plugins registered after importing the package, we're done
                 if AssetSourcePlugin.get_registered_sources():
                     cls._plugins_discovered = True
-                    logger.debug(f"Asset plugins already registered: {', '.join(AssetSourcePlugin.get_registered_sources())}")
+                    logger.debug("Asset plugins already registered: %s", ", ".join(AssetSourcePlugin.get_registered_sources()))
                     return
                     
             except ImportError:
@@ -194,13 +233,13 @@ class AssetSourceRegistry:
                 if not is_pkg:
                     try:
                         importlib.import_module(name)
-                        logger.debug(f"Loaded asset source plugin module: {name}")
+                        logger.debug("Loaded asset source plugin module: %s", name)
                     except Exception as e:
-                        logger.warning(f"Error loading asset source plugin module {name}: {str(e)}")
+                        logger.warning("Error loading asset source plugin module %s: %s", name, e)
 
             cls._plugins_discovered = True
         except Exception as e:
-            logger.warning(f"Error during asset source plugin discovery: {str(e)}")
+            logger.warning("Error during asset source plugin discovery: %s", e)
 
     @classmethod
     def register_source(cls, source_name: str, plugin_class: Type[AssetSourcePlugin]) -> None:
@@ -212,11 +251,11 @@ class AssetSourceRegistry:
                 return
             else:
                 # Log a warning if trying to register a different class for the same source
-                logger.warning(f"Replacing existing asset source plugin for {source_name}")
+                logger.warning("Replacing existing asset source plugin for %s", source_name)
         
         # Register the plugin
         AssetSourcePlugin._registry[source_name] = plugin_class
-        logger.debug(f"Registered asset source plugin: {source_name}")
+        logger.debug("Registered asset source plugin: %s", source_name)
 
         # Clear instance if it exists to ensure fresh instantiation with the new class
         if source_name in cls._instances:
@@ -245,12 +284,12 @@ class AssetSourceRegistry:
             source_config = get_source_config(source_name)
             if source_config:
                 instance.configure(source_config)
-                logger.debug(f"Applied configuration to asset source: {source_name}")
+                logger.debug("Applied configuration to asset source: %s", source_name)
 
             cls._instances[source_name] = instance
             return instance
         except Exception as e:
-            logger.error(f"Error creating asset source plugin instance for source {source_name}: {str(e)}")
+            logger.error("Error creating asset source plugin instance for source %s: %s", source_name, e)
             return None
 
     @classmethod
@@ -321,7 +360,7 @@ class AssetSourceRegistry:
             return source.get_identifier(asset_type, asset_id)
 
         except Exception as e:
-            logger.error(f"Error parsing identifier '{identifier_str}': {str(e)}")
+            logger.error("Error parsing identifier '%s': %s", identifier_str, e)
             return None
 
     @classmethod
@@ -335,20 +374,43 @@ class AssetSourceRegistry:
 
     @classmethod
     def list_assets(cls, asset_type: DataAssetType) -> List[AssetIdentifier]:
-        """List all available assets of a specific type across all sources."""
-        all_assets = []
+        """List all available assets of a specific type across all sources.
 
+        Sources are listed concurrently, so a slow remote source (e.g. an HTTP API)
+        does not add its latency on top of the local directory scan. Results are
+        returned in source order.
+        """
+        sources = []
         for source_name in cls.get_available_sources():
             source = cls.get_source(source_name)
             if source:
-                try:
-                    source_assets = source.list_assets(asset_type)
-                    all_assets.extend(source_assets)
-                except Exception as e:
-                    logger.warning(f"Error listing assets from source {source_name}: {str(e)}")
+                sources.append((source_name, source))
+
+        def list_source(item):
+            return cls._list_source_assets(item[0], item[1], asset_type)
+
+        if len(sources) <= 1:
+            # Nothing to overlap, so skip the thread pool
+            results = [list_source(item) for item in sources]
+        else:
+            results = list(_LISTING_EXECUTOR.map(list_source, sources))
+
+        all_assets = []
+        for source_assets in results:
+            all_assets.extend(source_assets)
 
         return all_assets
 
+    @staticmethod
+    def _list_source_assets(source_name: str, source: AssetSourcePlugin,
+                            asset_type: DataAssetType) -> List[AssetIdentifier]:
+        """List the assets of a single source, logging and swallowing errors."""
+        try:
+            return source.list_assets(asset_type)
+        except Exception as e:
+            logger.warning("Error listing assets from source %s: %s", source_name, e)
+            return []
+
     @classmethod
     def load_content(cls, identifier: AssetIdentifier) -> str:
         """Load the content of an asset."""
@@ -372,5 +434,5 @@ class AssetSourceRegistry:
             source.configure(config)
             return True
         except Exception as e:
-            logger.error(f"Error configuring source {source_name}: {str(e)}")
+            logger.error("Error configuring source %s: %s", source_name, e)
             return False
@@ -117,20 +117,16 @@ class DatabricksDataSource(DataSourcePlugin):
                     columns = [field.name for field in statement.result.schema]
                 
                 # Convert rows to dictionaries
-                for row in statement.result.data_array:
-                    record = {}
-                    for i, column in enumerate(columns):
-                        record[column] = row[i]
-                    records.append(record)
+                records = [dict(zip(columns, row)) for row in statement.result.data_array]
                     
             return records
             
         except ImportError as e:
-            logger.error(f"Error importing Databricks SDK: {e}")
+            logger.error("Error importing Databricks SDK: %s", e)
             raise ImportError("Databricks SDK is required for Databricks data querying. "
                             "Install with: pip install databricks-sdk")
         except Exception as e:
-            logger.error(f"Error executing Databricks query: {e}")
+            logger.error("Error executing Databricks query: %s", e)
             raise
 
     def is_available(self) -> bool:
@@ -1,111 +1,226 @@
 """Local data source plugin for querying files via DuckDB."""
 
+import csv
+import hashlib
+import json
 import logging
 import os
-from typing import Any, Dict, List
-
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from ...config import get_assets_dir, get_duckdb_settings
+from ...utils.sql_utils import quote_identifier, quote_literal
 from ..data_source import DataSourcePlugin, ServerType
 
 logger = logging.getLogger("dataproduct-mcp.sources.data_plugins.local")
 
-# Global DuckDB connection pool
-_duckdb_connections = {}
-_last_used_time = {}
+# DuckDB column types for data contract field types. Date and time types are left to
+# DuckDB's sniffer because their textual formats vary too much between files. Integer and
+# floating point fields get the widest types, as type detection would give them, since
+# contracts rarely declare the width of their numbers.
+CONTRACT_TYPE_TO_DUCKDB_TYPE = {
+    "string": "VARCHAR",
+    "text": "VARCHAR",
+    "varchar": "VARCHAR",
+    "int": "BIGINT",
+    "integer": "BIGINT",
+    "long": "BIGINT",
+    "bigint": "BIGINT",
+    "float": "DOUBLE",
+    "double": "DOUBLE",
+    "number": "DOUBLE",
+    "numeric": "DOUBLE",
+    "decimal": "DOUBLE",
+    "boolean": "BOOLEAN",
+}
+
+# File formats by file extension, used when a server does not declare its format
+EXTENSION_TO_FORMAT = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".tsv": "csv",
+    ".parquet": "parquet",
+    ".json": "json",
+    ".jsonl": "json",
+    ".avro": "avro",
+    ".orc": "orc",
+}
+
+# DuckDB table functions reading each file format, with placeholders for the path and,
+# for JSON, the layout of the file
+FORMAT_READERS = {
+    "csv": "read_csv({path}, auto_detect=TRUE)",
+    "parquet": "read_parquet({path})",
+    "json": "read_json({path}, auto_detect=TRUE, format='{json_format}')",
+    "avro": "read_avro({path})",
+    "orc": "read_orc({path})",
+    "delta": "delta_scan({path})",
+}
+
+# Formats that are always queried through a view instead of being loaded into a table,
+# because DuckDB only reads the columns and row groups a query needs from them; Delta
+# tables are Parquet files, which DuckDB also skips by their partition values and statistics
+VIEW_ONLY_FORMATS = frozenset(("parquet", "delta"))
+
+# read_json layouts by the delimiter data contract servers declare for JSON files; without
+# a declared delimiter, DuckDB detects the layout
+JSON_FORMATS = {
+    "new_line": "newline_delimited",
+    "array": "array",
+}
+
+# Text formats whose repeatedly queried files are kept as Parquet copies, because parsing
+# them again costs far more than reading Parquet
+PARQUET_COPY_FORMATS = frozenset(("csv", "json"))
+
+# DuckDB column types that NumPy arrays hold without changing their values; other types,
+# such as DECIMAL, HUGEINT and dates, are converted to floats or NumPy types by fetchnumpy()
+NUMPY_RESULT_TYPES = frozenset((
+    "BOOLEAN", "TINYINT", "SMALLINT", "INTEGER", "BIGINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "FLOAT", "DOUBLE", "VARCHAR",
+))
+
+# Number of rows fetched from DuckDB at a time when converting results to records
+FETCH_BATCH_SIZE = 8192
+
+# Table reference types a query may contain to run on the shared connection; anything else,
+# such as table functions like query() or duckdb_tables(), or SHOW and DESCRIBE, may read
+# more than the queried model
+_SHARED_TABLE_REF_TYPES = frozenset(("BASE_TABLE", "JOIN", "SUBQUERY", "EMPTY", "EXPRESSION_LIST"))
 
 
 def create_duckdb_connection() -> Any:
-    """Create a new DuckDB connection.
+    """Create a new in-memory DuckDB connection with the configured settings.
 
     Returns:
         DuckDB connection object
     """
     try:
         import duckdb
-        return duckdb.connect(database=":memory:")
+        return duckdb.connect(database=":memory:", config=get_duckdb_settings())
     except ImportError as e:
-        logger.error(f"Error importing duckdb: {e}")
+        logger.error("Error importing duckdb: %s", e)
         raise ImportError("DuckDB is required for local data querying. "
                           "Install with: pip install duckdb")
 
 
-def get_duckdb_pool(max_connections: int = 5, idle_timeout: int = 300) -> Dict[str, Any]:
-    """Get or create a DuckDB connection pool.
+def iter_records(result: Any, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """Iterate over the records of a DuckDB result, fetching rows in batches.
+
+    Only one batch of raw rows is held at a time, so callers that consume
+    the records incrementally never hold the whole result twice. Results that
+    only have numeric, boolean and text columns are fetched as NumPy arrays
+    instead, which hold the values compactly and convert to Python values
+    much faster than row by row.
+
+    Args:
+        result: DuckDB result of an executed query
+        batch_size: Number of rows to fetch from DuckDB at a time
+
+    Yields:
+        Records as dictionaries
+    """
+    column_names = [col[0] for col in result.description]
+    # Arrays are fetched by column name, so duplicate names would lose columns
+    if len(set(column_names)) == len(column_names) and all(
+            str(col[1]) in NUMPY_RESULT_TYPES for col in result.description):
+        arrays = result.fetchnumpy()
+        columns = [arrays[name] for name in column_names]
+        row_count = len(columns[0]) if columns else 0
+        for start in range(0, row_count, batch_size):
+            # tolist() turns masked values, i.e. NULLs, into None
+            values = [column[start:start + batch_size].tolist() for column in columns]
+            yield from (dict(zip(column_names, row)) for row in zip(*values))
+        return
+
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            return
+        # Build each record in one C-level call instead of assigning cell by cell
+        yield from (dict(zip(column_names, row)) for row in rows)
+
+
+def fetch_columnar(result: Any) -> Dict[str, Any]:
+    """Fetch a DuckDB result as column names and rows of values.
+
+    The rows are the tuples DuckDB returns, so no dictionary is built per row.
 
     Args:
-        max_connections: Maximum number of connections in the pool
-        idle_timeout: Timeout in seconds for idle connections
+        result: DuckDB result of an executed query
 
     Returns:
-        Dictionary with connection pool management functions
+        Dictionary with the column names under 'columns' and the value tuples under 'rows'
     """
-    global _duckdb_connections, _last_used_time
-
-    # Function to create a new connection
-    def get_connection():
-        import time
-
-        # Check for available connections
-        if len(_duckdb_connections) >= max_connections:
-            # Find the oldest connection
-            oldest_time = min(_last_used_time.values())
-            oldest_conn = next(k for k, v in _last_used_time.items() if v == oldest_time)
-
-            # Check if it's expired
-            if time.time() - oldest_time > idle_timeout:
-                logger.debug("Closing idle connection")
-                conn = _duckdb_connections.pop(oldest_conn)
-                del _last_used_time[oldest_conn]
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            else:
-                # All connections in use and not expired, wait for one to become available
-                logger.warning("Connection pool exhausted, consider increasing max_connections")
+    return {
+        "columns": [col[0] for col in result.description],
+        "rows": result.fetchall()
+    }
 
-        # Create a new connection
-        conn = create_duckdb_connection()
-        conn_id = id(conn)
-        _duckdb_connections[conn_id] = conn
-        _last_used_time[conn_id] = time.time()
-        return conn, conn_id
-
-    # Function to release a connection back to the pool
-    def release_connection(conn_id: int):
-        import time
-        if conn_id in _duckdb_connections:
-            _last_used_time[conn_id] = time.time()
-
-    # Function to cleanup the pool
-    def cleanup():
-        import time
-        current_time = time.time()
-        expired = []
-
-        # Find expired connections
-        for conn_id, last_used in _last_used_time.items():
-            if current_time - last_used > idle_timeout:
-                expired.append(conn_id)
-
-        # Close and remove expired connections
-        for conn_id in expired:
-            try:
-                _duckdb_connections[conn_id].close()
-            except Exception:
-                pass
-            del _duckdb_connections[conn_id]
-            del _last_used_time[conn_id]
 
-        logger.debug(f"Cleaned up {len(expired)} expired connections, {len(_duckdb_connections)} remaining")
+def to_columnar(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert records into column names and rows of values.
+
+    Column names are only listed once instead of being repeated in every record.
 
+    Args:
+        records: Query results as dictionaries that share the same keys
+
+    Returns:
+        Dictionary with the column names under 'columns' and the value tuples under 'rows'
+    """
+    if not records:
+        return {"columns": [], "rows": []}
     return {
-        "get_connection": get_connection,
-        "release_connection": release_connection,
-        "cleanup": cleanup,
-        "size": lambda: len(_duckdb_connections)
+        "columns": list(records[0]),
+        "rows": [tuple(record.values()) for record in records]
     }
 
 
+def _reads_only_table(conn: Any, query: str, table: str) -> bool:
+    """Check whether a query is a single SELECT statement that reads no table but the given one.
+
+    Args:
+        conn: DuckDB connection used to parse the query
+        query: SQL query
+        table: Name of the table the query may read
+
+    Returns:
+        True if the query can only read the table, False if it may read or change anything else
+    """
+    try:
+        parsed = json.loads(conn.execute("SELECT json_serialize_sql(?)", [query]).fetchone()[0])
+    except Exception as e:
+        logger.debug("Could not parse query: %s", e)
+        return False
+    # Only single SELECT statements can be serialized, everything else is reported as an error
+    if parsed.get("error") or len(parsed.get("statements", [])) != 1:
+        return False
+
+    pending: List[Any] = [parsed["statements"][0]["node"]]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, list):
+            pending.extend(value)
+            continue
+        if not isinstance(value, dict):
+            continue
+        # Table references are the nodes with a sample clause, apart from SELECT nodes
+        if "sample" in value and "modifiers" not in value:
+            ref_type = value.get("type")
+            if ref_type not in _SHARED_TABLE_REF_TYPES:
+                return False
+            if ref_type == "BASE_TABLE" and (
+                    value.get("schema_name") or value.get("catalog_name")
+                    or value.get("table_name", "").lower() != table.lower()):
+                return False
+        pending.extend(value.values())
+    return True
+
+
 @DataSourcePlugin.register(ServerType.LOCAL)
 @DataSourcePlugin.register(ServerType.FILE)  # Register FILE as an alias for LOCAL
 class LocalDataSource(DataSourcePlugin):
@@ -113,11 +228,34 @@ class LocalDataSource(DataSourcePlugin):
 
     def __init__(self):
         """Initialize the local data source plugin."""
-        self._pool = None
         self._connection_pooling_enabled = True
-        self._max_connections = 5
         self._idle_timeout = 300  # 5 minutes
 
+        # Shared connection, reused across queries while connection pooling is enabled
+        self._connection: Optional[Any] = None
+        self._last_used_time = 0.0
+        # Guards the shared connection and the bookkeeping of loaded tables below
+        self._lock = threading.Lock()
+        # Per model key locks, so a file is loaded by one thread while queries on other models run concurrently
+        self._model_locks: Dict[str, threading.Lock] = {}
+        self._active_queries = 0
+
+        # Tables loaded into the shared connection by model key, with the
+        # (file_path, file_format, mtime_ns, size, column_types) they were loaded from,
+        # in least recently used order
+        self._tables: OrderedDict[str, Tuple[str, str, int, int, Tuple[Tuple[str, str], ...]]] = OrderedDict()
+        self._max_tables = 16
+        # Model keys of self._tables that are views over their file rather than loaded tables
+        self._views: Set[str] = set()
+
+        # Parquet copies of repeatedly queried CSV and JSON files by the signature they were written for,
+        # in least recently used order. None marks a file that was queried once so far.
+        self._parquet_cache_enabled = True
+        self._parquet_files: OrderedDict[Tuple[str, str, int, int, Tuple[Tuple[str, str], ...]], Optional[str]] = \
+            OrderedDict()
+        self._max_parquet_files = 32
+        self._parquet_dir: Optional[tempfile.TemporaryDirectory] = None
+
     @property
     def server_type(self) -> str:
         """The server type this plugin supports."""
@@ -144,34 +282,78 @@ class LocalDataSource(DataSourcePlugin):
         if not file_path:
             raise ValueError("No file path provided in server configuration")
 
-        # Resolve the file path
+        # Reject model keys that cannot name a table before touching any file
+        quote_identifier(model_key)
+
+        # Resolve the file path, keeping the stat result of the file that was found
+        stat = None
         if not os.path.isabs(file_path):
             # If DATAASSET_SOURCE is set, try looking for the file in that directory first
-            dataasset_source = os.environ.get("DATAASSET_SOURCE")
+            dataasset_source = get_assets_dir()
             if dataasset_source:
                 # Build the absolute path using DATAASSET_SOURCE
                 data_source_path = os.path.join(dataasset_source, file_path)
                 # If the file exists in DATAASSET_SOURCE directory, use that path
-                if os.path.exists(data_source_path):
-                    logger.info(f"Using file from DATAASSET_SOURCE: {data_source_path}")
+                stat = self._stat(data_source_path)
+                if stat is not None:
+                    logger.debug("Using file from DATAASSET_SOURCE: %s", data_source_path)
                     file_path = data_source_path
-                else:
-                    # If not found in DATAASSET_SOURCE, use the current directory
-                    base_dir = server_config.get("base_directory") or os.getcwd()
-                    file_path = os.path.join(base_dir, file_path)
-            else:
-                # If DATAASSET_SOURCE is not set, use the current directory
+
+            if stat is None:
+                # If not found in (or without) DATAASSET_SOURCE, use the current directory
                 base_dir = server_config.get("base_directory") or os.getcwd()
                 file_path = os.path.join(base_dir, file_path)
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        if stat is None:
+            stat = self._stat(file_path)
+            if stat is None:
+                raise FileNotFoundError(f"File not found: {file_path}")
 
         # Determine file format
         file_format = self._determine_file_format(file_path, server_config)
 
+        # Column types declared by the data contract, if any
+        column_types = self._column_types(server_config) if file_format == 'csv' else {}
+
         # Execute the query using DuckDB
-        return self._execute_duckdb_query(file_path, file_format, model_key, query)
+        return self._execute_duckdb_query(file_path, file_format, model_key, query, column_types, stat)
+
+    @staticmethod
+    def _stat(file_path: str) -> Optional[os.stat_result]:
+        """Get the stat result of a file.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Stat result, or None if the file does not exist
+        """
+        try:
+            return os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    @staticmethod
+    def _column_types(server_config: Dict[str, Any]) -> Dict[str, str]:
+        """Map the model fields declared by a data contract to DuckDB column types.
+
+        Args:
+            server_config: Server configuration, with the contract's model fields under 'model_fields'
+
+        Returns:
+            Dictionary of column name to DuckDB type for all fields with a known type
+        """
+        fields = server_config.get("model_fields")
+        if not isinstance(fields, dict):
+            return {}
+
+        column_types = {}
+        for name, field in fields.items():
+            if isinstance(field, dict) and isinstance(field.get("type"), str):
+                duckdb_type = CONTRACT_TYPE_TO_DUCKDB_TYPE.get(field["type"].lower())
+                if duckdb_type:
+                    column_types[name] = duckdb_type
+        return column_types
 
     def _determine_file_format(self, file_path: str, server_config: Dict[str, Any]) -> str:
         """Determine the format of a file based on its extension or configuration.
@@ -185,27 +367,20 @@ class LocalDataSource(DataSourcePlugin):
         """
         # Check if format is explicitly specified in the config
         if format_str := server_config.get("format"):
-            return format_str.lower()
+            return format_str.strip().lower()
 
         # Otherwise, infer from file extension
         extension = os.path.splitext(file_path)[1].lower()
-
-        if extension in ['.csv', '.txt', '.tsv']:
-            return 'csv'
-        elif extension == '.parquet':
-            return 'parquet'
-        elif extension in ['.json', '.jsonl']:
-            return 'json'
-        elif extension == '.avro':
-            return 'avro'
-        elif extension == '.orc':
-            return 'orc'
-        else:
+        file_format = EXTENSION_TO_FORMAT.get(extension)
+        if file_format is None:
             # Default to CSV if unknown
-            logger.warning(f"Unknown file extension: {extension}, defaulting to CSV")
+            logger.warning("Unknown file extension: %s, defaulting to CSV", extension)
             return 'csv'
+        return file_format
 
-    def _execute_duckdb_query(self, file_path: str, file_format: str, model_key: str, query: str) -> List[Dict[str, Any]]:
+    def _execute_duckdb_query(self, file_path: str, file_format: str, model_key: str, query: str,
+                              column_types: Optional[Dict[str, str]] = None,
+                              stat: Optional[os.stat_result] = None) -> List[Dict[str, Any]]:
         """Execute a query using DuckDB.
 
         Args:
@@ -213,83 +388,444 @@ class LocalDataSource(DataSourcePlugin):
             file_format: Format of the file
             model_key: Name to use for the table
             query: SQL query to execute
+            column_types: Optional DuckDB column types to use instead of type detection
+            stat: Stat result of the file, if already known
 
         Returns:
             List of records as dictionaries
         """
         try:
-            conn = None
-            conn_id = None
+            if not self._connection_pooling_enabled:
+                return self._execute_on_own_connection(file_path, file_format, model_key, query, column_types, stat)
 
+            with self._lock:
+                conn = self._get_shared_connection()
+                model_lock = self._model_locks.setdefault(model_key, threading.Lock())
+                self._active_queries += 1
             try:
-                # Get a connection from the pool if enabled
-                if self._connection_pooling_enabled and self._pool:
-                    conn, conn_id = self._pool["get_connection"]()
-                else:
-                    # Otherwise, create a new connection
-                    conn = create_duckdb_connection()
-
-                # Create a table from the file
-                table_query = self._create_table_query(file_path, file_format, model_key)
-                conn.execute(table_query)
-
-                # Execute the query
-                result = conn.execute(query)
-
-                # Convert to list of dictionaries
-                column_names = [col[0] for col in result.description]
-                records = []
-
-                for row in result.fetchall():
-                    record = {}
-                    for i, column in enumerate(column_names):
-                        record[column] = row[i]
-                    records.append(record)
-
-                return records
+                # Each query runs on its own cursor, so queries on different models do not block each other
+                cursor = conn.cursor()
+                try:
+                    # The tables of the shared connection are kept for later queries and other models,
+                    # so queries that could change them or read other tables run on their own connection
+                    if not _reads_only_table(cursor, query, model_key):
+                        logger.debug("Running query on %s on its own connection", model_key)
+                        return self._execute_on_own_connection(
+                            file_path, file_format, model_key, query, column_types, stat
+                        )
+                    with model_lock:
+                        view = self._ensure_table(cursor, file_path, file_format, model_key, column_types, stat)
+                        return self._run_query(cursor, query, file_path, file_format, model_key, column_types, view)
+                finally:
+                    cursor.close()
             finally:
-                # Release the connection back to the pool if we got it from there
-                if self._connection_pooling_enabled and self._pool and conn_id:
-                    self._pool["release_connection"](conn_id)
-                elif conn and not self._connection_pooling_enabled:
-                    # Close the connection if not using pooling
-                    conn.close()
+                with self._lock:
+                    self._active_queries -= 1
         except ImportError as e:
-            logger.error(f"Error importing duckdb: {e}")
+            logger.error("Error importing duckdb: %s", e)
             raise ImportError("DuckDB is required for local data querying. "
                             "Install with: pip install duckdb")
         except Exception as e:
-            logger.error(f"Error executing DuckDB query: {e}")
+            logger.error("Error executing DuckDB query: %s", e)
             raise
 
-    def _create_table_query(self, file_path: str, file_format: str, model_key: str) -> str:
-        """Create a SQL query to load data from a file into a table.
+    def _execute_on_own_connection(self, file_path: str, file_format: str, model_key: str, query: str,
+                                   column_types: Optional[Dict[str, str]] = None,
+                                   stat: Optional[os.stat_result] = None) -> List[Dict[str, Any]]:
+        """Execute a query on a new DuckDB connection that is closed afterwards.
+
+        Args:
+            file_path: Path to the file
+            file_format: Format of the file
+            model_key: Name to use for the table
+            query: SQL query to execute
+            column_types: Optional DuckDB column types to use instead of type detection
+            stat: Stat result of the file, if already known
+
+        Returns:
+            List of records as dictionaries
+        """
+        conn = create_duckdb_connection()
+        try:
+            # The file is only read by this one query, so a view lets DuckDB push the
+            # query's projections and filters into the file scan
+            signature = self._signature(file_path, file_format, column_types, stat)
+            parquet_path, queried_before = self._get_parquet_copy(signature)
+            if parquet_path:
+                self._create_table(conn, parquet_path, 'parquet', model_key, view=True)
+                return self._run_query(conn, query, file_path, file_format, model_key, None, True)
+
+            self._load_table(conn, file_path, file_format, model_key, column_types, view=True)
+            if queried_before:
+                self._save_parquet_copy(conn, signature, model_key)
+            return self._run_query(conn, query, file_path, file_format, model_key, column_types, True)
+        finally:
+            conn.close()
+
+    def _get_shared_connection(self) -> Any:
+        """Get the shared DuckDB connection, creating it if necessary.
+
+        The connection (and every table loaded into it) is dropped once it has
+        been idle for longer than the idle timeout and no query is running on it.
+        Must be called with the lock held.
+
+        Returns:
+            DuckDB connection object
+        """
+        now = time.monotonic()
+        if (self._connection is not None and not self._active_queries
+                and now - self._last_used_time > self._idle_timeout):
+            logger.debug("Closing idle DuckDB connection")
+            self._close_shared_connection()
+
+        if self._connection is None:
+            self._connection = create_duckdb_connection()
+            # Keep the footers of Parquet files and copies across queries: their row group
+            # statistics and Bloom filters let DuckDB skip the row groups a filter rules out
+            # without reading the footer again
+            self._connection.execute("SET parquet_metadata_cache = true")
+
+        self._last_used_time = now
+        return self._connection
+
+    def _close_shared_connection(self) -> None:
+        """Close the shared DuckDB connection and forget all loaded tables."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+        self._tables.clear()
+        self._views.clear()
+
+    def _run_query(self, conn: Any, query: str, file_path: str, file_format: str, model_key: str,
+                   column_types: Optional[Dict[str, str]], view: bool) -> List[Dict[str, Any]]:
+        """Run a query, retrying with detected types if a view's declared types do not fit.
+
+        A view converts the file's values only when it is queried, so values that do not
+        match the contract's column types surface here instead of when the view is created.
 
         Args:
+            conn: DuckDB connection
+            query: SQL query to execute
+            file_path: Path to the file
+            file_format: Format of the file
+            model_key: Name of the table or view
+            column_types: DuckDB column types the table or view was created with, if any
+            view: Whether the model is a view over the file
+
+        Returns:
+            List of records as dictionaries
+        """
+        import duckdb
+
+        try:
+            return self._fetch_records(conn.execute(query))
+        except (duckdb.ConversionException, duckdb.InvalidInputException) as e:
+            if not (view and column_types):
+                raise
+            logger.warning("Could not read %s with the declared column types, detecting types instead: %s",
+                           file_path, e)
+            self._load_table(conn, file_path, file_format, model_key, view=True)
+            return self._fetch_records(conn.execute(query))
+
+    def _ensure_table(self, conn: Any, file_path: str, file_format: str, model_key: str,
+                      column_types: Optional[Dict[str, str]] = None,
+                      stat: Optional[os.stat_result] = None) -> bool:
+        """Make a file queryable under the model key of the shared connection.
+
+        A file is first exposed as a view, so a one-off query only reads the columns
+        and rows it needs. When the unchanged file is queried again, the view is
+        replaced by a loaded table that later queries reuse without parsing the file.
+        Parquet files stay views, since DuckDB prunes their columns and row groups.
+        Both are recreated if the file, its format, its modification time, its size or
+        the declared column types changed. Must be called with the model key's lock held.
+
+        Args:
+            conn: Cursor of the shared DuckDB connection
             file_path: Path to the file
             file_format: Format of the file
             model_key: Name to use for the table
+            column_types: Optional DuckDB column types to use instead of type detection
+            stat: Stat result of the file, if already known
+
+        Returns:
+            True if the model is a view over the file, False if it is a loaded table
+        """
+        signature = self._signature(file_path, file_format, column_types, stat)
+        keep_view = file_format in VIEW_ONLY_FORMATS
+        with self._lock:
+            loaded = self._tables.get(model_key)
+            was_view = model_key in self._views
+            reuse = loaded == signature and (keep_view or not was_view)
+            if reuse:
+                self._tables.move_to_end(model_key)
+            else:
+                # Forget the model while it is replaced, so it is not evicted concurrently
+                self._tables.pop(model_key, None)
+                self._views.discard(model_key)
+
+        if reuse:
+            logger.debug("Reusing %s %s for %s", "view" if was_view else "loaded table", model_key, file_path)
+            return was_view
+
+        if loaded is not None:
+            self._drop_table(conn, model_key, was_view)
+
+        # An unchanged file that is queried again through its view is loaded into a table
+        view = loaded != signature or keep_view
+        if not view:
+            logger.debug("Loading table %s for repeatedly queried %s", model_key, file_path)
+        parquet_path, _ = self._get_parquet_copy(signature)
+        if parquet_path:
+            logger.debug("Reading %s from its Parquet copy", file_path)
+            self._create_table(conn, parquet_path, 'parquet', model_key, view=view)
+        else:
+            self._load_table(conn, file_path, file_format, model_key, column_types, view=view)
+            if not view:
+                self._save_parquet_copy(conn, signature, model_key)
+
+        with self._lock:
+            self._tables[model_key] = signature
+            if view:
+                self._views.add(model_key)
+            self._evict_tables(conn)
+        return view
+
+    @staticmethod
+    def _signature(file_path: str, file_format: str, column_types: Optional[Dict[str, str]],
+                   stat: Optional[os.stat_result]) -> Tuple[str, str, int, int, Tuple[Tuple[str, str], ...]]:
+        """Get the signature of a file's contents as loaded with the given format and column types.
+
+        Args:
+            file_path: Path to the file
+            file_format: Format of the file
+            column_types: Optional DuckDB column types to use instead of type detection
+            stat: Stat result of the file, if already known
 
         Returns:
-            SQL query to create the table
+            Tuple of (file_path, file_format, mtime_ns, size, column_types)
+        """
+        stat = stat or os.stat(file_path)
+        types_key = tuple(sorted(column_types.items())) if column_types else ()
+        return file_path, file_format, stat.st_mtime_ns, stat.st_size, types_key
+
+    def _get_parquet_copy(self, signature: Tuple[str, str, int, int, Tuple[Tuple[str, str], ...]]
+                          ) -> Tuple[Optional[str], bool]:
+        """Look up the Parquet copy of a CSV or JSON file, noting that the file is queried.
+
+        Args:
+            signature: Signature of the file contents, see _signature
+
+        Returns:
+            Tuple of (path of the Parquet copy or None, whether the file was queried before)
+        """
+        if signature[1] not in PARQUET_COPY_FORMATS or not self._parquet_cache_enabled:
+            return None, False
+
+        with self._lock:
+            queried_before = signature in self._parquet_files
+            if queried_before:
+                self._parquet_files.move_to_end(signature)
+            else:
+                self._parquet_files[signature] = None
+                self._evict_parquet_files()
+            return self._parquet_files.get(signature), queried_before
+
+    def _save_parquet_copy(self, conn: Any, signature: Tuple[str, str, int, int, Tuple[Tuple[str, str], ...]],
+                           model_key: str) -> None:
+        """Write the table or view of a CSV or JSON file to a Parquet copy.
+
+        Parquet is read column by column without parsing text, so later loads of the
+        unchanged file, e.g. after its table was evicted or on a new connection, are
+        much cheaper than parsing the file again.
+
+        Args:
+            conn: DuckDB connection
+            signature: Signature of the file contents, see _signature
+            model_key: Name of the table or view holding the file's contents
+        """
+        if signature[1] not in PARQUET_COPY_FORMATS or not self._parquet_cache_enabled:
+            return
+
+        with self._lock:
+            if self._parquet_dir is None:
+                self._parquet_dir = tempfile.TemporaryDirectory(prefix="dataproduct-mcp-")
+            digest = hashlib.sha256(repr(signature).encode('utf-8')).hexdigest()
+            parquet_path = os.path.join(self._parquet_dir.name, f"{digest}.parquet")
+
+        try:
+            conn.execute(f'COPY {quote_identifier(model_key)} TO ? (FORMAT parquet);', [parquet_path])
+        except Exception as e:
+            # The declared column types may not fit the file, the query falls back without a copy
+            logger.debug("Could not write Parquet copy of %s: %s", signature[0], e)
+            return
+
+        with self._lock:
+            self._parquet_files[signature] = parquet_path
+            self._parquet_files.move_to_end(signature)
+            self._evict_parquet_files()
+
+    def _evict_parquet_files(self) -> None:
+        """Delete the least recently used Parquet copies while more than the maximum are kept.
+
+        Must be called with the lock held.
+        """
+        while len(self._parquet_files) > self._max_parquet_files:
+            _, parquet_path = self._parquet_files.popitem(last=False)
+            if parquet_path:
+                try:
+                    os.remove(parquet_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _drop_table(conn: Any, model_key: str, view: bool) -> None:
+        """Drop the table or view of a model key.
+
+        Args:
+            conn: DuckDB connection
+            model_key: Name of the table or view
+            view: Whether the model is a view rather than a table
+        """
+        kind = 'VIEW' if view else 'TABLE'
+        conn.execute(f'DROP {kind} IF EXISTS {quote_identifier(model_key)}')
+
+    def _evict_tables(self, conn: Any) -> None:
+        """Drop the least recently used tables while more than the maximum are loaded.
+
+        Every loaded table holds a full copy of its file in memory, so the number
+        of tables kept in the shared connection is bounded. Tables that are in use
+        by a running query are skipped. Must be called with the lock held.
+
+        Args:
+            conn: DuckDB connection
+        """
+        for model_key in list(self._tables):
+            if len(self._tables) <= self._max_tables:
+                break
+
+            model_lock = self._model_locks.get(model_key)
+            if model_lock is not None and not model_lock.acquire(blocking=False):
+                continue
+            try:
+                self._tables.pop(model_key)
+                was_view = model_key in self._views
+                self._views.discard(model_key)
+                logger.debug("Dropping least recently used table %s", model_key)
+                self._drop_table(conn, model_key, was_view)
+            finally:
+                if model_lock is not None:
+                    model_lock.release()
+
+    def _load_table(self, conn: Any, file_path: str, file_format: str, model_key: str,
+                    column_types: Optional[Dict[str, str]] = None, view: bool = False) -> None:
+        """Load a file into a table, falling back to type detection if the declared types do not fit.
+
+        Args:
+            conn: DuckDB connection
+            file_path: Path to the file
+            file_format: Format of the file
+            model_key: Name to use for the table
+            column_types: Optional DuckDB column types to use instead of type detection
+            view: Whether to create a view over the file instead of loading it
         """
-        # Escape the model key to avoid SQL injection
-        safe_model_key = model_key.replace('"', '""')
-
-        if file_format == 'csv':
-            # Use auto_type_candidates to handle different data types
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_csv(\'{file_path}\', auto_type_candidates=[\'BIGINT\',\'VARCHAR\',\'BOOLEAN\',\'DOUBLE\']);'
-        elif file_format == 'parquet':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_parquet(\'{file_path}\');'
-        elif file_format == 'json':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_json(\'{file_path}\', auto_detect=TRUE);'
-        elif file_format == 'avro':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_avro(\'{file_path}\');'
-        elif file_format == 'orc':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_orc(\'{file_path}\');'
+        if column_types:
+            # When the contract declares every column of the file, in file order, the
+            # schema is fully known and DuckDB can skip sniffing the file altogether
+            explicit = file_format == 'csv' and self._read_csv_header(file_path) == list(column_types)
+            try:
+                self._create_table(conn, file_path, file_format, model_key, column_types, explicit, view)
+                return
+            except Exception as e:
+                # The contract may not match the file (e.g. missing columns or unparsable values)
+                logger.warning("Could not load %s with the declared column types, detecting types instead: %s",
+                               file_path, e)
+
+        self._create_table(conn, file_path, file_format, model_key, view=view)
+
+    def _create_table(self, conn: Any, file_path: str, file_format: str, model_key: str,
+                      column_types: Optional[Dict[str, str]] = None, explicit_columns: bool = False,
+                      view: bool = False) -> None:
+        """Create the table or view for a file.
+
+        Args:
+            conn: DuckDB connection
+            file_path: Path to the file
+            file_format: Format of the file
+            model_key: Name to use for the table
+            column_types: Optional DuckDB column types for CSV files, by column name
+            explicit_columns: Whether column_types is the complete schema of the CSV file
+            view: Whether to create a view over the file instead of loading it
+        """
+        table = quote_identifier(model_key)
+        if view:
+            # Views cannot hold bound parameters, so the path is embedded as an escaped literal
+            scan = self._scan_query(file_format, quote_literal(file_path), column_types, explicit_columns)
+            conn.execute(f'CREATE OR REPLACE VIEW {table} AS {scan};')
         else:
-            # Default to CSV with auto_type_candidates 
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_csv(\'{file_path}\', auto_type_candidates=[\'BIGINT\',\'VARCHAR\',\'BOOLEAN\',\'DOUBLE\']);'
+            scan = self._scan_query(file_format, '?', column_types, explicit_columns)
+            conn.execute(f'CREATE OR REPLACE TABLE {table} AS {scan};', [file_path])
+
+    @staticmethod
+    def _read_csv_header(file_path: str) -> Optional[List[str]]:
+        """Read the column names from the header line of a CSV file.
+
+        Args:
+            file_path: Path to the CSV file
+
+        Returns:
+            List of column names, or None if the header could not be read
+        """
+        try:
+            with open(file_path, newline='', encoding='utf-8') as f:
+                return next(csv.reader(f), None)
+        except (OSError, UnicodeDecodeError, csv.Error):
+            return None
+
+    @staticmethod
+    def _fetch_records(result: Any) -> List[Dict[str, Any]]:
+        """Convert a DuckDB result into a list of records.
+
+        Args:
+            result: DuckDB result of an executed query
+
+        Returns:
+            List of records as dictionaries
+        """
+        return list(iter_records(result))
+
+    @staticmethod
+    def _scan_query(file_format: str, path_sql: str, column_types: Optional[Dict[str, str]] = None,
+                    explicit_columns: bool = False) -> str:
+        """Create a SQL query that reads all rows of a file.
+
+        Args:
+            file_format: Format of the file
+            path_sql: SQL expression for the file path, a parameter placeholder or a string literal
+            column_types: Optional DuckDB column types for CSV files, by column name
+            explicit_columns: Whether column_types is the complete schema of the CSV file,
+                in which case type and dialect detection are skipped
+
+        Returns:
+            SQL query selecting the contents of the file
+        """
+        # Declared column types let DuckDB skip type detection for those columns
+        csv_types = ""
+        if column_types:
+            entries = []
+            for name, duckdb_type in column_types.items():
+                entries.append(f"{quote_literal(name)}: '{duckdb_type}'")
+            csv_types = f", types={{{', '.join(entries)}}}"
+            if explicit_columns:
+                return f'SELECT * FROM read_csv({path_sql}, header=true, columns={{{", ".join(entries)}}})'
+
+        if file_format in FORMAT_READERS and file_format != 'csv':
+            scan = FORMAT_READERS[file_format].format(path=path_sql, json_format='auto')
+            return f"SELECT * FROM {scan}"
+        # Default to CSV, with auto_type_candidates to handle different data types
+        return f"SELECT * FROM read_csv({path_sql}, auto_type_candidates=['BIGINT','VARCHAR','BOOLEAN','DOUBLE']{csv_types})"
 
     def is_available(self) -> bool:
         """Check if this data source is properly configured and available."""
@@ -304,8 +840,9 @@ class LocalDataSource(DataSourcePlugin):
         """Get the current configuration for this data source."""
         return {
             "connection_pooling": self._connection_pooling_enabled,
-            "max_connections": self._max_connections,
             "idle_timeout": self._idle_timeout,
+            "max_tables": self._max_tables,
+            "parquet_cache": self._parquet_cache_enabled,
         }
 
     def configure(self, config: Dict[str, Any]) -> None:
@@ -313,17 +850,16 @@ class LocalDataSource(DataSourcePlugin):
         if "connection_pooling" in config:
             self._connection_pooling_enabled = bool(config["connection_pooling"])
 
-        if "max_connections" in config:
-            self._max_connections = int(config["max_connections"])
-
         if "idle_timeout" in config:
             self._idle_timeout = int(config["idle_timeout"])
 
-        # Setup connection pool if enabled
-        if self._connection_pooling_enabled:
-            self._pool = get_duckdb_pool(
-                max_connections=self._max_connections,
-                idle_timeout=self._idle_timeout
-            )
-        else:
-            self._pool = None
+        if "max_tables" in config:
+            self._max_tables = max(1, int(config["max_tables"]))
+
+        if "parquet_cache" in config:
+            self._parquet_cache_enabled = bool(config["parquet_cache"])
+
+        # Drop the shared connection if pooling was disabled
+        if not self._connection_pooling_enabled:
+            with self._lock:
+                self._close_shared_connection()
@@ -2,41 +2,25 @@
 
 import logging
 import os
-from typing import Any, Dict, List, Set
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional
+from urllib.parse import urlsplit
 
+from ...utils.sql_utils import quote_identifier, quote_literal
 from ..data_source import DataSourcePlugin, ServerType
+from .local import EXTENSION_TO_FORMAT, FORMAT_READERS, JSON_FORMATS, create_duckdb_connection, iter_records
 
 logger = logging.getLogger("dataproduct-mcp.sources.data_plugins.s3")
 
+# Maximum number of DuckDB connections kept for S3 queries, one per set of credentials
+MAX_S3_CONNECTIONS = 8
 
-def _get_env_region() -> str:
-    """Get AWS region from environment variables."""
-    return os.getenv("AWS_REGION", os.getenv("AWS_DEFAULT_REGION", "us-east-1"))
-
-
-def _get_env_buckets() -> Set[str]:
-    """Get allowed bucket names from environment variables."""
-    buckets_str = os.getenv("S3_ALLOWED_BUCKETS", "")
-    if not buckets_str:
-        return set()
-    return {bucket.strip() for bucket in buckets_str.split(",")}
-
-
-def _get_env_max_buckets() -> int:
-    """Get maximum number of buckets from environment variables."""
-    try:
-        return int(os.getenv("S3_MAX_BUCKETS", "10"))
-    except ValueError:
-        return 10
-
-
-def _get_env_credentials() -> Dict[str, Any]:
-    """Get AWS credentials from environment variables."""
-    return {
-        "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
-        "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
-        "aws_session_token": os.getenv("AWS_SESSION_TOKEN"),
-    }
+# File extension of the files read under a location that is a prefix ending in '/', by
+# file format; the first extension listed for a format in EXTENSION_TO_FORMAT is used
+PREFIX_FILE_EXTENSIONS = {
+    file_format: extension for extension, file_format in reversed(EXTENSION_TO_FORMAT.items())
+}
 
 
 @DataSourcePlugin.register(ServerType.S3)
@@ -45,11 +29,15 @@ class S3DataSource(DataSourcePlugin):
 
     def __init__(self):
         """Initialize the S3 data source plugin."""
-        self._region = _get_env_region()
-        self._allowed_buckets = _get_env_buckets()
-        self._max_buckets = _get_env_max_buckets()
-        self._credentials = _get_env_credentials()
-        self._endpoint_url = os.getenv("AWS_ENDPOINT_URL")
+        # Defaults, until the registry applies the configuration from the environment
+        self._region = "us-east-1"
+        self._allowed_buckets: FrozenSet[str] = frozenset()
+        self._max_buckets = 10
+        self._credentials: Dict[str, Optional[str]] = {}
+        self._endpoint_url: Optional[str] = None
+        self._lock = threading.Lock()
+        self._connections: OrderedDict[str, Any] = OrderedDict()
+        self._max_connections = MAX_S3_CONNECTIONS
 
     @property
     def server_type(self) -> str:
@@ -91,6 +79,11 @@ class S3DataSource(DataSourcePlugin):
         # Determine file format
         file_format = self._determine_file_format(path, server_config)
 
+        # A prefix is read as a glob over its files, DuckDB lists the matching keys itself;
+        # formats without a file extension, such as Delta tables, are read from the prefix
+        if path.endswith("/") and file_format in PREFIX_FILE_EXTENSIONS:
+            s3_uri += f"*{PREFIX_FILE_EXTENSIONS[file_format]}"
+
         # Execute the query using DuckDB with S3 integration
         return self._execute_duckdb_s3_query(s3_uri, file_format, model_key, query, server_config)
 
@@ -106,25 +99,20 @@ class S3DataSource(DataSourcePlugin):
         """
         # Check if format is explicitly specified in the config
         if format_str := server_config.get("format"):
-            return format_str.lower()
+            return format_str.strip().lower()
+
+        # Files under a prefix are read as Parquet unless the server declares a format
+        if path.endswith("/"):
+            return 'parquet'
 
         # Otherwise, infer from file extension
         extension = os.path.splitext(path)[1].lower()
-
-        if extension in ['.csv', '.txt', '.tsv']:
-            return 'csv'
-        elif extension == '.parquet':
-            return 'parquet'
-        elif extension in ['.json', '.jsonl']:
-            return 'json'
-        elif extension == '.avro':
-            return 'avro'
-        elif extension == '.orc':
-            return 'orc'
-        else:
+        file_format = EXTENSION_TO_FORMAT.get(extension)
+        if file_format is None:
             # Default to Parquet if unknown
-            logger.warning(f"Unknown file extension: {extension}, defaulting to Parquet")
+            logger.warning("Unknown file extension: %s, defaulting to Parquet", extension)
             return 'parquet'
+        return file_format
 
     def _execute_duckdb_s3_query(self, s3_uri: str, file_format: str, model_key: str, query: str,
                                 server_config: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -141,106 +129,146 @@ class S3DataSource(DataSourcePlugin):
             List of records as dictionaries
         """
         try:
-            import duckdb
-
-            # Create a new connection
-            conn = duckdb.connect(database=":memory:")
-
+            conn = self._get_connection(server_config)
             try:
-                # Install httpfs extension if needed
-                conn.install_extension("httpfs")
-                conn.load_extension("httpfs")
-
-                # Set AWS credentials
-                self._set_s3_credentials(conn, server_config)
-
-                # Create a table from the S3 file
-                table_query = self._create_table_query(s3_uri, file_format, model_key)
-                conn.execute(table_query)
+                # Expose the S3 file as a view; it is only visible to this cursor, and loading
+                # the whole file into a table first would only add work
+                conn.execute(self._create_view_query(file_format, model_key, s3_uri, server_config.get("delimiter")))
 
                 # Execute the query
                 result = conn.execute(query)
 
-                # Convert to list of dictionaries
-                column_names = [col[0] for col in result.description]
-                records = []
-
-                for row in result.fetchall():
-                    record = {}
-                    for i, column in enumerate(column_names):
-                        record[column] = row[i]
-                    records.append(record)
-
-                return records
+                # Convert to list of dictionaries, fetching rows in batches
+                return list(iter_records(result))
             finally:
-                # Close the connection
+                # Close the cursor, which drops its view
                 conn.close()
         except ImportError as e:
-            logger.error(f"Error importing duckdb: {e}")
+            logger.error("Error importing duckdb: %s", e)
             raise ImportError("DuckDB is required for S3 data querying. "
                             "Install with: pip install duckdb")
         except Exception as e:
-            logger.error(f"Error executing S3 query: {e}")
+            logger.error("Error executing S3 query: %s", e)
             raise
 
-    def _set_s3_credentials(self, conn: Any, server_config: Dict[str, Any]) -> None:
-        """Set AWS credentials for DuckDB connection.
+    def _get_connection(self, server_config: Dict[str, Any]) -> Any:
+        """Get a new cursor on a DuckDB connection set up for the server's credentials.
+
+        Connections are kept per set of credentials, so that httpfs is only loaded and
+        the credentials are only resolved once, instead of for every query. DuckDB also
+        keeps the remote file data it read in memory per connection, so repeated queries
+        on the same files read less from S3.
+
+        Args:
+            server_config: Server configuration
+
+        Returns:
+            DuckDB cursor, to be closed by the caller
+        """
+        secret_query = self._create_secret_query(server_config)
+        with self._lock:
+            conn = self._connections.get(secret_query)
+            if conn is not None:
+                self._connections.move_to_end(secret_query)
+                return conn.cursor()
+
+        conn = create_duckdb_connection()
+        try:
+            self._load_httpfs(conn)
+            conn.execute(secret_query)
+            # Keep the footers of Parquet files across queries, so that repeated queries on
+            # the same files skip those requests; DuckDB checks the cached footers against
+            # the files' modification times
+            conn.execute("SET parquet_metadata_cache = true")
+        except Exception:
+            conn.close()
+            raise
+
+        with self._lock:
+            # Another query may have set up a connection for the same credentials meanwhile
+            conn = self._connections.setdefault(secret_query, conn)
+            self._connections.move_to_end(secret_query)
+            while len(self._connections) > self._max_connections:
+                # Not closed, so that queries still running on the connection can finish;
+                # DuckDB closes it once its last cursor is closed
+                self._connections.popitem(last=False)
+            return conn.cursor()
+
+    @staticmethod
+    def _load_httpfs(conn: Any) -> None:
+        """Load DuckDB's httpfs extension, installing it only if it is not installed yet.
 
         Args:
             conn: DuckDB connection
+        """
+        try:
+            conn.load_extension("httpfs")
+        except Exception:
+            conn.install_extension("httpfs")
+            conn.load_extension("httpfs")
+
+    def _create_secret_query(self, server_config: Dict[str, Any]) -> str:
+        """Create a SQL query that sets the AWS credentials DuckDB reads S3 files with.
+
+        Args:
             server_config: Server configuration
+
+        Returns:
+            SQL query to create a temporary S3 secret for the connection
         """
         # Use credentials from server config if available, otherwise use default credentials
-        credentials = server_config.get("credentials", self._credentials)
+        credentials = server_config.get("credentials", self._credentials) or {}
         region = server_config.get("region", self._region)
         endpoint_url = server_config.get("endpoint_url", self._endpoint_url)
 
-        # Set AWS region
+        options = ["TYPE S3"]
         if region:
-            conn.execute(f"SET s3_region='{region}'")
+            options.append(f"REGION {quote_literal(region)}")
 
-        # Set S3 endpoint URL if specified
-        if endpoint_url:
-            conn.execute(f"SET s3_endpoint='{endpoint_url}'")
+        if access_key := credentials.get("aws_access_key_id"):
+            options.append(f"KEY_ID {quote_literal(access_key)}")
+        if secret_key := credentials.get("aws_secret_access_key"):
+            options.append(f"SECRET {quote_literal(secret_key)}")
+        if session_token := credentials.get("aws_session_token"):
+            options.append(f"SESSION_TOKEN {quote_literal(session_token)}")
 
-        # Set AWS credentials if provided
-        if credentials:
-            if access_key := credentials.get("aws_access_key_id"):
-                conn.execute(f"SET s3_access_key_id='{access_key}'")
+        if endpoint_url:
+            # DuckDB takes the endpoint without its scheme, e.g. localhost:9000 for http://localhost:9000
+            endpoint = urlsplit(endpoint_url if "://" in endpoint_url else f"https://{endpoint_url}")
+            options.append(f"ENDPOINT {quote_literal(endpoint.netloc + endpoint.path.rstrip('/'))}")
+            options.append(f"USE_SSL {'false' if endpoint.scheme == 'http' else 'true'}")
+            # S3-compatible stores behind a custom endpoint usually do not serve bucket subdomains
+            options.append("URL_STYLE 'path'")
 
-            if secret_key := credentials.get("aws_secret_access_key"):
-                conn.execute(f"SET s3_secret_access_key='{secret_key}'")
+        return f"CREATE OR REPLACE TEMPORARY SECRET s3_source ({', '.join(options)})"
 
-            if session_token := credentials.get("aws_session_token"):
-                conn.execute(f"SET s3_session_token='{session_token}'")
+    def _create_view_query(self, file_format: str, model_key: str, s3_uri: str,
+                           delimiter: Optional[str] = None) -> str:
+        """Create a SQL query that exposes an S3 file as a temporary view.
 
-    def _create_table_query(self, s3_uri: str, file_format: str, model_key: str) -> str:
-        """Create a SQL query to load data from S3 into a table.
+        A view only reads the file when it is queried, so DuckDB can push the query's
+        projections and filters into the scan, e.g. to skip Parquet row groups and
+        columns. Views cannot hold bound parameters, so the URI is embedded as an
+        escaped literal.
 
         Args:
-            s3_uri: S3 URI of the file
             file_format: Format of the file
-            model_key: Name to use for the table
+            model_key: Name to use for the view
+            s3_uri: S3 URI of the file
+            delimiter: Optional delimiter of JSON records declared by the server, 'new_line' or 'array'
 
         Returns:
-            SQL query to create the table
+            SQL query to create the view
         """
-        # Escape the model key to avoid SQL injection
-        safe_model_key = model_key.replace('"', '""')
-
-        if file_format == 'csv':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_csv(\'{s3_uri}\', auto_detect=TRUE);'
-        elif file_format == 'parquet':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_parquet(\'{s3_uri}\');'
-        elif file_format == 'json':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_json(\'{s3_uri}\', auto_detect=TRUE);'
-        elif file_format == 'avro':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_avro(\'{s3_uri}\');'
-        elif file_format == 'orc':
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_orc(\'{s3_uri}\');'
-        else:
-            # Default to Parquet
-            return f'CREATE OR REPLACE TABLE "{safe_model_key}" AS SELECT * FROM read_parquet(\'{s3_uri}\');'
+        # Escape the model key and the URI to avoid SQL injection
+        table = quote_identifier(model_key)
+        uri = quote_literal(s3_uri)
+
+        # Default to Parquet
+        reader = FORMAT_READERS.get(file_format, FORMAT_READERS['parquet'])
+        # A declared JSON layout saves DuckDB from sampling the file to detect it
+        scan = reader.format(path=uri, json_format=JSON_FORMATS.get(delimiter, 'auto'))
+        return f'CREATE OR REPLACE TEMP VIEW {table} AS SELECT * FROM {scan};'
 
     def is_available(self) -> bool:
         """Check if this data source is properly configured and available."""
@@ -271,15 +299,21 @@ class S3DataSource(DataSourcePlugin):
         }
 
     def configure(self, config: Dict[str, Any]) -> None:
-        """Configure this data source with specific values."""
-        if "region" in config:
-            self._region = config["region"]
+        """Configure this data source with specific values.
 
-        if "allowed_buckets" in config:
-            self._allowed_buckets = set(config["allowed_buckets"])
+        Raises:
+            ValueError: If more buckets are allowed than the maximum number of buckets
+        """
+        allowed_buckets = frozenset(config.get("allowed_buckets", self._allowed_buckets))
+        max_buckets = int(config.get("max_buckets", self._max_buckets))
+        # Checked once here, so that queries only need to look up their bucket
+        if len(allowed_buckets) > max_buckets:
+            raise ValueError(f"{len(allowed_buckets)} allowed buckets exceed the maximum of {max_buckets}")
+        self._allowed_buckets = allowed_buckets
+        self._max_buckets = max_buckets
 
-        if "max_buckets" in config:
-            self._max_buckets = int(config["max_buckets"])
+        if "region" in config:
+            self._region = config["region"]
 
         if "credentials" in config:
             self._credentials.update(config["credentials"])
@@ -4,6 +4,7 @@ import importlib
 import logging
 import pkgutil
 from abc import ABC, abstractmethod
+from enum import StrEnum
 from typing import Any, ClassVar, Dict, List, Optional, Type
 
 from ..config import get_source_config
@@ -11,7 +12,17 @@ from ..config import get_source_config
 logger = logging.getLogger("dataproduct-mcp.sources.data_source")
 
 
-class ServerType:
+class _CaseInsensitiveStrEnum(StrEnum):
+    """String enumeration whose members can also be looked up in any letter case."""
+
+    @classmethod
+    def _missing_(cls, value: object) -> Optional['_CaseInsensitiveStrEnum']:
+        if isinstance(value, str):
+            return cls._value2member_map_.get(value.lower())
+        return None
+
+
+class ServerType(_CaseInsensitiveStrEnum):
     """Enumeration of supported server types for data sources."""
     LOCAL = "local"
     S3 = "s3"
@@ -23,7 +34,11 @@ class ServerType:
     DATABRICKS = "databricks"
 
 
-class DataFormat:
+# All known server type values, as plain strings for fast membership checks
+KNOWN_SERVER_TYPES = frozenset(member.value for member in ServerType)
+
+
+class DataFormat(_CaseInsensitiveStrEnum):
     """Enumeration of supported data formats."""
     CSV = "csv"
     PARQUET = "parquet"
@@ -112,7 +127,7 @@ class DataSourcePlugin(ABC):
             # Check if already registered to avoid duplicate messages
             if server_type not in cls._registry:
                 cls._registry[server_type] = plugin_class
-                logger.debug(f"Registered data source plugin for server type: {server_type}")
+                logger.debug("Registered data source plugin for server type: %s", server_type)
             return plugin_class
         return decorator
 
@@ -152,6 +167,9 @@ class DataSourceRegistry:
     # Dictionary of plugin instances by server type
     _instances: Dict[str, DataSourcePlugin] = {}
 
+    # Why the plugin instance of a server type could not be created, by server type
+    _instance_errors: Dict[str, str] = {}
+
     # Flag to track if plugins have been discovered
     _plugins_discovered = False
 
@@ -174,7 +192,8 @@ class DataSourceRegistry:
                 # If we have plugins registered after importing the package, we're done
                 if DataSourcePlugin.get_registered_types():
                     cls._plugins_discovered = True
-                    logger.debug(f"Data plugins already registered: {', '.join(DataSourcePlugin.get_registered_types())}")
+                    logger.debug("Data plugins already registered: %s",
+                                 ', '.join(DataSourcePlugin.get_registered_types()))
                     return
                     
             except ImportError:
@@ -186,13 +205,13 @@ class DataSourceRegistry:
                 if not is_pkg:
                     try:
                         importlib.import_module(name)
-                        logger.debug(f"Loaded data source plugin module: {name}")
+                        logger.debug("Loaded data source plugin module: %s", name)
                     except Exception as e:
-                        logger.warning(f"Error loading data source plugin module {name}: {str(e)}")
+                        logger.warning("Error loading data source plugin module %s: %s", name, e)
 
             cls._plugins_discovered = True
         except Exception as e:
-            logger.warning(f"Error during data source plugin discovery: {str(e)}")
+            logger.warning("Error during data source plugin discovery: %s", e)
 
     @classmethod
     def register_source(cls, server_type: str, plugin_class: Type[DataSourcePlugin]) -> None:
@@ -204,24 +223,22 @@ class DataSourceRegistry:
                 return
             else:
                 # Log a warning if trying to register a different class for the same source
-                logger.warning(f"Replacing existing data source plugin for {server_type}")
+                logger.warning("Replacing existing data source plugin for %s", server_type)
         
         # Register the plugin
         DataSourcePlugin._registry[server_type] = plugin_class
-        logger.debug(f"Registered data source plugin for server type: {server_type}")
+        logger.debug("Registered data source plugin for server type: %s", server_type)
 
         # Clear instance if it exists to ensure fresh instantiation with the new class
         if server_type in cls._instances:
             del cls._instances[server_type]
+        # FILE may share the LOCAL instance
+        if server_type == ServerType.LOCAL:
+            cls._instances.pop(ServerType.FILE, None)
 
     @classmethod
     def get_source(cls, server_type: str) -> Optional[DataSourcePlugin]:
         """Get a data source plugin instance by server type."""
-        # Handle special case for FILE (alias for LOCAL)
-        if server_type == ServerType.FILE and server_type not in DataSourcePlugin._registry:
-            if ServerType.LOCAL in DataSourcePlugin._registry:
-                server_type = ServerType.LOCAL
-
         # Return cached instance if available
         if server_type in cls._instances:
             return cls._instances[server_type]
@@ -229,6 +246,16 @@ class DataSourceRegistry:
         # Discover plugins if not already done
         cls.discover_plugins()
 
+        # FILE is an alias for LOCAL: share the LOCAL instance (and with it its
+        # connection and loaded tables) unless FILE has a plugin of its own
+        if server_type == ServerType.FILE:
+            local_class = DataSourcePlugin._registry.get(ServerType.LOCAL)
+            if local_class and DataSourcePlugin._registry.get(ServerType.FILE, local_class) is local_class:
+                instance = cls.get_source(ServerType.LOCAL)
+                if instance:
+                    cls._instances[server_type] = instance
+                return instance
+
         # Get the plugin class
         plugin_class = DataSourcePlugin.get_plugin_class(server_type)
         if not plugin_class:
@@ -240,17 +267,19 @@ class DataSourceRegistry:
 
             # Apply configuration from environment variables
             try:
-                source_config = get_source_config(server_type)
+                source_config = get_source_config(server_type, "data")
                 if source_config:
                     instance.configure(source_config)
-                    logger.debug(f"Applied configuration to data source: {server_type}")
+                    logger.debug("Applied configuration to data source: %s", server_type)
             except ImportError:
                 logger.debug("Config module not available")
 
             cls._instances[server_type] = instance
+            cls._instance_errors.pop(server_type, None)
             return instance
         except Exception as e:
-            logger.error(f"Error creating data source plugin instance for server type {server_type}: {str(e)}")
+            logger.error("Error creating data source plugin instance for server type %s: %s", server_type, e)
+            cls._instance_errors[server_type] = str(e)
             return None
 
     @classmethod
@@ -292,6 +321,9 @@ class DataSourceRegistry:
 
         if not source:
             from ..asset_manager import AssetQueryError
+            # A plugin that exists but could not be set up, e.g. because it is misconfigured
+            if error := cls._instance_errors.get(server_type):
+                raise AssetQueryError(f"Data source for server type {server_type} is unavailable: {error}")
             supported_types = ", ".join(cls.get_available_sources())
             raise AssetQueryError(
                 f"Unsupported server type: {server_type}. Available types: {supported_types}"
@@ -322,5 +354,5 @@ class DataSourceRegistry:
             source.configure(config)
             return True
         except Exception as e:
-            logger.error(f"Error configuring data source {server_type}: {str(e)}")
+            logger.error("Error configuring data source %s: %s", server_type, e)
             return False
@@ -0,0 +1,100 @@
+"""Persistent cache utilities for dataproduct-mcp."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+logger = logging.getLogger("dataproduct-mcp.utils.cache_utils")
+
+
+class PersistentCache:
+    """
+    Cache of JSON values with an expiry time, kept in a SQLite file.
+
+    Values outlive the process, so a server started for a new session reuses what an
+    earlier one fetched. Several processes may share the file. Errors reading or
+    writing the file are logged and treated as cache misses.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the cache file, creating it and its directory if necessary.
+
+        Args:
+            path: Path of the SQLite file
+
+        Raises:
+            OSError: If the directory cannot be created
+            sqlite3.Error: If the file cannot be opened as a SQLite database
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        # Write-ahead logging lets other processes read while one of them writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Get a value if it has not expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The value and the number of seconds until it expires, or None
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Could not read %s from cache file %s: %s", key, self.path, e)
+            return None
+
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON serializable value
+            ttl: Number of seconds until the value expires
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl),
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Could not write %s to cache file %s: %s", key, self.path, e)
+
+    def evict_expired(self) -> None:
+        """Remove all expired values."""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning("Could not evict expired values from cache file %s: %s", self.path, e)
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,41 @@
+"""SQL utilities for dataproduct-mcp."""
+
+import re
+from typing import Any
+
+# Characters that cannot appear in a table name: NUL is rejected by DuckDB, and other
+# control characters only ever show up in names that were crafted or mangled
+_INVALID_IDENTIFIER_CHARS = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a name for use as an SQL identifier, escaping embedded double quotes.
+
+    Args:
+        name: Table or column name
+
+    Returns:
+        The quoted identifier
+
+    Raises:
+        ValueError: If the name is empty or contains control characters
+    """
+    if not name or _INVALID_IDENTIFIER_CHARS.search(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value: Any) -> str:
+    """
+    Quote a value as an SQL string literal, escaping embedded single quotes.
+
+    Only for statements that cannot take bound parameters, such as views and SET.
+
+    Args:
+        value: Value to quote, converted with str()
+
+    Returns:
+        The quoted literal
+    """
+    return "'" + str(value).replace("'", "''") + "'"
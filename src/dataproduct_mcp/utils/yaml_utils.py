@@ -2,18 +2,52 @@
 
 import hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 
 logger = logging.getLogger("dataproduct-mcp.utils.yaml_utils")
 
+# Use the libyaml based loader when it is available, it parses several times faster
+# than the pure Python SafeLoader with the same semantics
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 class AssetParseError(Exception):
     """Error raised when parsing an asset file fails."""
     pass
 
 
+def load_yaml(content: str | bytes) -> Any:
+    """
+    Safely load a YAML document, using libyaml when available.
+
+    Args:
+        content: YAML content (string or bytes)
+
+    Returns:
+        The loaded Python object
+
+    Raises:
+        yaml.YAMLError: If the YAML is invalid
+    """
+    return yaml.load(content, Loader=_YamlLoader)
+
+
+def dump_yaml(data: Any) -> str:
+    """
+    Safely dump an object as a YAML document, using libyaml when available.
+
+    Args:
+        data: Object made of plain Python types
+
+    Returns:
+        YAML content as a string
+    """
+    return yaml.dump(data, Dumper=_YamlDumper)
+
+
 def parse_yaml(content: str | bytes) -> Dict[str, Any]:
     """
     Parse a YAML string or bytes into a dictionary.
@@ -29,7 +63,7 @@ def parse_yaml(content: str | bytes) -> Dict[str, Any]:
     """
     try:
         # Parse with PyYAML to get the raw dictionary
-        asset_dict = yaml.safe_load(content)
+        asset_dict = load_yaml(content)
 
         if not isinstance(asset_dict, dict):
             raise AssetParseError("YAML content does not represent a dictionary")
@@ -38,9 +72,8 @@ def parse_yaml(content: str | bytes) -> Dict[str, Any]:
         if "id" not in asset_dict:
             logger.warning("Missing 'id' field in asset")
             # Use a default ID based on content hash if missing
-            # Convert content to string first, then encode to bytes
-            content_str = content.decode('utf-8') if isinstance(content, bytes) else content
-            asset_dict["id"] = f"default_{hashlib.md5(str(content_str).encode('utf-8')).hexdigest()[:8]}"
+            content_bytes = content if isinstance(content, bytes) else content.encode('utf-8')
+            asset_dict["id"] = f"default_{hashlib.blake2b(content_bytes, digest_size=4).hexdigest()}"
 
         # Ensure we have an info section with at least a title
         if "info" not in asset_dict or not isinstance(asset_dict["info"], dict):
@@ -59,6 +92,60 @@ def parse_yaml(content: str | bytes) -> Dict[str, Any]:
     except AssetParseError:
         raise
     except Exception as e:
-        logger.warning(f"Error in parse_yaml: {str(e)}")
+        logger.warning("Error in parse_yaml: %s", e)
         # Try to return a basic dict that won't break functionality
         return {"id": "default", "info": {"title": "Default"}}
+
+
+def peek_yaml_id(content: str | bytes) -> Optional[str]:
+    """
+    Read the top-level 'id' of a YAML document without fully parsing it.
+
+    The document is walked as a stream of parser events, which stops as soon as
+    the id is found and never constructs any Python objects for the rest of the
+    document. This makes it cheap to rule out assets when looking one up by id.
+
+    Args:
+        content: YAML content (string or bytes)
+
+    Returns:
+        The raw scalar value of the top-level 'id' field, or None if the document
+        is not a mapping, has no scalar 'id' field, or cannot be parsed
+    """
+    depth = 0
+    is_key = True
+    id_is_next = False
+
+    try:
+        for event in yaml.parse(content, Loader=_YamlLoader):
+            if isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+                continue
+            if isinstance(event, (yaml.StreamEndEvent, yaml.DocumentEndEvent)):
+                return None
+
+            if depth == 0:
+                if not isinstance(event, yaml.MappingStartEvent):
+                    return None
+                depth = 1
+                continue
+
+            if depth == 1:
+                if isinstance(event, yaml.MappingEndEvent):
+                    return None
+                if is_key:
+                    id_is_next = isinstance(event, yaml.ScalarEvent) and event.value == "id"
+                elif id_is_next:
+                    return event.value if isinstance(event, yaml.ScalarEvent) else None
+
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+                continue
+            if isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+            if depth == 1:
+                # A complete key or value node at the top level has been read
+                is_key = not is_key
+    except yaml.YAMLError:
+        return None
+
+    return None
@@ -0,0 +1,102 @@
+"""Tests for the data asset manager."""
+
+import unittest
+from unittest.mock import patch
+
+from dataproduct_mcp.asset_manager import DataAssetManager, _is_identifier_of_type
+from dataproduct_mcp.sources.asset_plugins.local import LocalAssetIdentifier
+from dataproduct_mcp.types import DataAssetType
+
+
+class TestFindAssetById(unittest.TestCase):
+    """Test looking up assets by their id."""
+
+    def setUp(self):
+        """Set up two contracts served from memory."""
+        self.orders = LocalAssetIdentifier("orders.datacontract.yaml", "contract")
+        self.customers = LocalAssetIdentifier("customers.datacontract.yaml", "contract")
+        self.contents = {
+            self.orders: "id: orders\n",
+            self.customers: "id: customers\n",
+        }
+        self.list_patcher = patch.object(
+            DataAssetManager, "list_assets", return_value=[self.orders, self.customers]
+        )
+        self.content_patcher = patch.object(
+            DataAssetManager, "get_asset_content", side_effect=lambda identifier: self.contents[identifier]
+        )
+        self.mock_list = self.list_patcher.start()
+        self.content_patcher.start()
+
+    def tearDown(self):
+        """Stop patching and forget the found identifiers."""
+        self.list_patcher.stop()
+        self.content_patcher.stop()
+        DataAssetManager._identifier_hints.clear()
+
+    def test_repeated_lookup_skips_scan(self):
+        """Test that an asset found once is looked up directly afterwards."""
+        first = DataAssetManager._find_asset_by_type_and_id(DataAssetType.DATA_CONTRACT, "customers")
+        second = DataAssetManager._find_asset_by_type_and_id(DataAssetType.DATA_CONTRACT, "customers")
+
+        self.assertEqual(self.customers, first[0])
+        self.assertEqual(first, second)
+        self.mock_list.assert_called_once()
+
+    def test_lookup_scans_again_when_asset_changed(self):
+        """Test that a changed asset id is not served from the previous lookup."""
+        DataAssetManager._find_asset_by_type_and_id(DataAssetType.DATA_CONTRACT, "customers")
+        self.contents[self.customers] = "id: clients\n"
+        self.contents[self.orders] = "id: customers\n"
+
+        identifier, content, asset = DataAssetManager._find_asset_by_type_and_id(
+            DataAssetType.DATA_CONTRACT, "customers"
+        )
+
+        self.assertEqual(self.orders, identifier)
+        self.assertEqual("customers", asset["id"])
+        self.assertEqual(2, self.mock_list.call_count)
+
+    def test_lookup_missing_asset(self):
+        """Test that a missing asset is reported as not found."""
+        result = DataAssetManager._find_asset_by_type_and_id(DataAssetType.DATA_CONTRACT, "missing")
+
+        self.assertEqual((None, None, None), result)
+        self.assertEqual({}, DataAssetManager._identifier_hints)
+
+
+
+class TestGetContractIds(unittest.TestCase):
+    """Test finding the data contracts linked from a data product."""
+
+    def test_get_contract_ids(self):
+        """Test that linked contracts are listed once each, in output port order."""
+        product = {"outputPorts": [
+            {"id": "a", "dataContractId": "local:contract/orders.datacontract.yaml"},
+            {"id": "b"},
+            {"id": "c", "dataContractId": "local:contract/items.datacontract.yaml"},
+            {"id": "d", "dataContractId": "local:contract/orders.datacontract.yaml"},
+        ]}
+        identifier = LocalAssetIdentifier("orders.dataproduct.yaml", "product")
+
+        with patch.object(DataAssetManager, "_load_and_parse_asset", return_value=product):
+            contract_ids = DataAssetManager.get_contract_ids(identifier)
+
+        self.assertEqual(
+            ["local:contract/orders.datacontract.yaml", "local:contract/items.datacontract.yaml"], contract_ids
+        )
+
+class TestIsIdentifierOfType(unittest.TestCase):
+    """Test recognizing asset identifiers of a type."""
+
+    def test_is_identifier_of_type(self):
+        """Test that only the type between the source and the first slash after it is matched."""
+        self.assertTrue(_is_identifier_of_type("local:contract/orders.datacontract.yaml", "contract"))
+        self.assertTrue(_is_identifier_of_type("datameshmanager:contract/a/b", "contract"))
+        self.assertFalse(_is_identifier_of_type("local:product/orders.dataproduct.yaml", "contract"))
+        self.assertFalse(_is_identifier_of_type("urn:datacontract:checkout:orders-latest", "contract"))
+        self.assertFalse(_is_identifier_of_type("contract/orders", "contract"))
+        self.assertFalse(_is_identifier_of_type("orders-latest", "contract"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Tests for the persistent cache utilities."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from dataproduct_mcp.utils.cache_utils import PersistentCache
+
+
+class TestPersistentCache(unittest.TestCase):
+    """Test caching values in a SQLite file."""
+
+    def setUp(self):
+        """Set up a cache in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache", "cache.sqlite")
+        self.cache = PersistentCache(self.path)
+
+    def tearDown(self):
+        """Close the cache and remove the temporary directory."""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_values_outlive_the_cache_instance(self):
+        """Test that a value stored by one instance is read by another one on the same file."""
+        self.cache.set("product:orders", {"id": "orders", "tags": ["a"]}, 60)
+
+        other = PersistentCache(self.path)
+        try:
+            value, ttl = other.get("product:orders")
+        finally:
+            other.close()
+
+        self.assertEqual({"id": "orders", "tags": ["a"]}, value)
+        self.assertTrue(0 < ttl <= 60)
+        self.assertIsNone(self.cache.get("product:customers"))
+
+    def test_expired_values_are_not_returned(self):
+        """Test that expired values are misses and are removed by evict_expired."""
+        self.cache.set("product:orders", {"id": "orders"}, 60)
+
+        with patch("dataproduct_mcp.utils.cache_utils.time.time", return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get("product:orders"))
+            self.cache.evict_expired()
+
+        self.assertIsNone(self.cache.get("product:orders"))
+
+    def test_unserializable_values_are_skipped(self):
+        """Test that a value that is not JSON serializable is not stored and raises no error."""
+        self.cache.set("product:orders", {"id": object()}, 60)
+
+        self.assertIsNone(self.cache.get("product:orders"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Tests for the environment based configuration."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dataproduct_mcp.config import get_config, get_duckdb_settings, get_source_config
+from dataproduct_mcp.sources.data_plugins.local import create_duckdb_connection
+
+
+class TestSourceConfig(unittest.TestCase):
+    """Test reading source configurations from the environment."""
+
+    def test_get_source_config_reads_only_requested_source(self):
+        """Test that an invalid setting of one source does not affect the others."""
+        with patch.dict(os.environ, {"DATABRICKS_TIMEOUT": "soon", "DATACONTRACT_LOCAL_MAX_TABLES": "4"}):
+            self.assertEqual(4, get_source_config("local", "data")["max_tables"])
+
+            with self.assertRaises(ValueError):
+                get_source_config("databricks", "data")
+
+    def test_get_source_config_unknown_source(self):
+        """Test that unknown sources have an empty configuration."""
+        self.assertEqual({}, get_source_config("unknown", "data"))
+        self.assertEqual({}, get_source_config("s3", "asset"))
+
+    def test_get_config_contains_all_sources(self):
+        """Test that the full configuration lists every source by type."""
+        config = get_config()
+
+        self.assertEqual(["local", "datameshmanager"], list(config["asset_sources"]))
+        self.assertEqual(["local", "s3", "databricks"], list(config["data_sources"]))
+
+
+class TestDuckDBSettings(unittest.TestCase):
+    """Test the settings of DuckDB connections."""
+
+    def test_defaults_only_set_temp_directory(self):
+        """Test that DuckDB spills to the system temporary directory and keeps its other defaults."""
+        env = {k: v for k, v in os.environ.items() if not k.startswith("DUCKDB_")}
+        with patch.dict(os.environ, env, clear=True):
+            self.assertEqual({"temp_directory": tempfile.gettempdir()}, get_duckdb_settings())
+
+    def test_connections_use_configured_settings(self):
+        """Test that new connections are created with the configured threads and memory limit."""
+        with patch.dict(os.environ, {"DUCKDB_THREADS": "2", "DUCKDB_MEMORY_LIMIT": "1GB"}):
+            conn = create_duckdb_connection()
+        try:
+            threads, memory_limit = conn.execute(
+                "SELECT current_setting('threads'), current_setting('memory_limit')"
+            ).fetchone()
+        finally:
+            conn.close()
+
+        self.assertEqual(2, threads)
+        self.assertEqual("953.6 MiB", memory_limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
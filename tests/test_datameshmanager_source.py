@@ -0,0 +1,168 @@
+"""Tests for the DataMeshManager asset source plugin."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dataproduct_mcp.sources.asset_plugins import datameshmanager_client
+from dataproduct_mcp.sources.asset_plugins.datameshmanager import DataMeshManagerSource
+from dataproduct_mcp.types import DataAssetType
+
+
+class TestDataMeshManagerSource(unittest.TestCase):
+    """Test listing assets from the DataMeshManager API."""
+
+    def setUp(self):
+        """Set up a configured source with empty caches."""
+        self.source = DataMeshManagerSource()
+        self.source.configure({"api_token": "test-token", "cache_ttl": 60})
+        self.client_patcher = patch(
+            "dataproduct_mcp.sources.asset_plugins.datameshmanager.DataMeshManager"
+        )
+        self.mock_client_class = self.client_patcher.start()
+        self.mock_client = self.mock_client_class.return_value
+
+    def tearDown(self):
+        """Stop patching and clear the class-level caches."""
+        self.client_patcher.stop()
+        DataMeshManagerSource._list_cache.clear()
+        for cache in DataMeshManagerSource._cache.values():
+            cache.clear()
+
+    def test_list_assets_caches_list_response(self):
+        """Test that repeated listings reuse the cached API response."""
+        self.mock_client.list_data_products.return_value = [{"id": "orders"}, {"id": "customers"}]
+
+        first = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+        second = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+
+        expected = ["datameshmanager:product/orders", "datameshmanager:product/customers"]
+        self.assertEqual(expected, [str(i) for i in first])
+        self.assertEqual(expected, [str(i) for i in second])
+        self.mock_client.list_data_products.assert_called_once()
+
+    def test_list_assets_from_cache_does_not_refresh_contents(self):
+        """Test that listed assets are only normalized and cached when the list is fetched."""
+        self.mock_client.list_data_products.return_value = [
+            {"id": "orders", "outputPorts": [{"id": "port", "dataContractId": "orders-contract"}]}
+        ]
+
+        with patch.object(self.source, "_update_cache", wraps=self.source._update_cache) as update_cache:
+            self.source.list_assets(DataAssetType.DATA_PRODUCT)
+            listed = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+            listed.clear()
+            again = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+
+        self.assertEqual(["datameshmanager:product/orders"], [str(i) for i in again])
+        self.assertEqual(1, update_cache.call_count)
+        cached = self.source._get_from_cache("product", "datameshmanager:product/orders")
+        self.assertEqual("datameshmanager:contract/orders-contract", cached["outputPorts"][0]["dataContractId"])
+
+    def test_list_assets_refreshes_after_ttl(self):
+        """Test that the list response is fetched again once the TTL has passed."""
+        self.mock_client.list_data_contracts.return_value = {"items": [{"id": "orders"}]}
+
+        self.source.list_assets(DataAssetType.DATA_CONTRACT)
+        with patch("dataproduct_mcp.sources.asset_plugins.datameshmanager.time.monotonic", return_value=time.monotonic() + 61):
+            self.source.list_assets(DataAssetType.DATA_CONTRACT)
+
+        self.assertEqual(2, self.mock_client.list_data_contracts.call_count)
+
+    def test_cache_file_is_used_after_restart(self):
+        """Test that listings and assets cached in the cache file are not fetched again by a new process."""
+        self.mock_client.list_data_contracts.return_value = [{"id": "orders", "info": {"title": "Orders"}}]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, "cache.sqlite")
+            self.source.configure({"cache_file": cache_file})
+            self.source.list_assets(DataAssetType.DATA_CONTRACT)
+
+            # A new process starts with empty in-memory caches
+            DataMeshManagerSource._list_cache.clear()
+            DataMeshManagerSource._cache["contract"].clear()
+            restarted = DataMeshManagerSource()
+            restarted.configure({"api_token": "test-token", "cache_ttl": 60, "cache_file": cache_file})
+            try:
+                identifiers = restarted.list_assets(DataAssetType.DATA_CONTRACT)
+                content = yaml.safe_load(restarted.load_asset_content(identifiers[0]))
+
+                # Another token may see other assets, so it does not share the cached listing
+                restarted.configure({"api_token": "other-token"})
+                restarted.list_assets(DataAssetType.DATA_CONTRACT)
+            finally:
+                restarted.configure({"cache_file": None})
+                self.source.configure({"cache_file": None})
+
+        self.assertEqual(["datameshmanager:contract/orders"], [str(i) for i in identifiers])
+        self.assertEqual("Orders", content["info"]["title"])
+        self.mock_client.get_data_contract.assert_not_called()
+        self.assertEqual(2, self.mock_client.list_data_contracts.call_count)
+
+    def test_client_is_reused_until_reconfigured(self):
+        """Test that requests share one API client, and a new token gets a new client."""
+        self.mock_client.list_data_products.return_value = [{"id": "orders"}]
+        self.mock_client.get_data_contract.return_value = {"id": "orders"}
+
+        self.source.list_assets(DataAssetType.DATA_PRODUCT)
+        self.source.load_asset_content(self.source.get_identifier(DataAssetType.DATA_CONTRACT, "orders"))
+        self.mock_client_class.assert_called_once_with(base_url=self.source._api_url, api_key="test-token")
+
+        self.source.configure({"api_token": "other-token"})
+        self.mock_client.close.assert_called_once()
+        self.source.list_assets(DataAssetType.DATA_PRODUCT)
+        self.assertEqual("other-token", self.mock_client_class.call_args.kwargs["api_key"])
+        self.assertEqual(2, self.mock_client_class.call_count)
+
+    def test_load_asset_content_prefixes_contract_ids_once(self):
+        """Test that fetched products are normalized before they are cached."""
+        self.mock_client.get_data_product.return_value = {
+            "id": "orders",
+            "info": {"title": "Orders"},
+            "outputPorts": [{"id": "port", "dataContractId": "orders-contract"}],
+        }
+        identifier = self.source.get_identifier(DataAssetType.DATA_PRODUCT, "orders")
+
+        first = yaml.safe_load(self.source.load_asset_content(identifier))
+        second = yaml.safe_load(self.source.load_asset_content(identifier))
+
+        expected = "datameshmanager:contract/orders-contract"
+        self.assertEqual(expected, first["outputPorts"][0]["dataContractId"])
+        self.assertEqual(expected, second["outputPorts"][0]["dataContractId"])
+        self.mock_client.get_data_product.assert_called_once()
+
+    def test_expired_cache_entries_are_evicted(self):
+        """Test that expired entries are removed instead of accumulating."""
+        self.mock_client.get_data_contract.return_value = {"id": "orders"}
+        identifier = self.source.get_identifier(DataAssetType.DATA_CONTRACT, "orders")
+        self.source.load_asset_content(identifier)
+
+        with patch("dataproduct_mcp.sources.asset_plugins.datameshmanager.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(self.source._get_from_cache("contract", str(identifier)))
+
+        self.assertNotIn(str(identifier), DataMeshManagerSource._cache["contract"])
+
+
+class TestDataMeshManagerClient(unittest.TestCase):
+    """Test the Data Mesh Manager API client."""
+
+    def test_requests_share_pooled_connections_and_time_out(self):
+        """Test that the session keeps a connection pool for parallel loads and requests have a timeout."""
+        client = datameshmanager_client.DataMeshManager(base_url="https://dmm.example.com/", api_key="key")
+        adapter = client.session.get_adapter("https://dmm.example.com/api/dataproducts")
+        self.assertEqual(datameshmanager_client.POOL_SIZE, adapter._pool_maxsize)
+
+        with patch.object(client.session, "get") as get:
+            get.return_value.json.return_value = {"id": "orders"}
+            self.assertEqual({"id": "orders"}, client.get_data_product("orders"))
+        get.assert_called_once_with(
+            "https://dmm.example.com/api/dataproducts/orders", timeout=datameshmanager_client.TIMEOUT
+        )
+        client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for the documentation resources."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from dataproduct_mcp.resources import docs
+
+
+class TestLoadDocResource(unittest.TestCase):
+    """Test loading documentation resource files."""
+
+    def setUp(self):
+        """Set up a temporary resource directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        (self.root / "yaml").mkdir()
+        self.root_patcher = patch.object(docs, "_RESOURCE_ROOT", self.root)
+        self.root_patcher.start()
+
+    def tearDown(self):
+        """Stop patching and clean up the resource directory."""
+        self.root_patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_load_doc_resource_rereads_changed_file(self):
+        """Test that a resource is read from the cache until its file changes."""
+        path = self.root / "yaml" / "example.yaml"
+        path.write_text("id: first\n", encoding="utf-8")
+
+        self.assertEqual("id: first\n", docs._load_doc_resource("example.yaml"))
+        with patch.object(Path, "read_text") as read_text:
+            self.assertEqual("id: first\n", docs._load_doc_resource("example.yaml"))
+        read_text.assert_not_called()
+
+        path.write_text("id: second\n", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual("id: second\n", docs._load_doc_resource("example.yaml"))
+
+    def test_load_doc_resource_missing_file(self):
+        """Test that a missing resource is returned as an empty string."""
+        self.assertEqual("", docs._load_doc_resource("missing.yaml"))
+
+
+class TestBundledDocs(unittest.TestCase):
+    """Test the resources shipped with the package."""
+
+    def test_schemas_and_examples_are_bundled(self):
+        """Test that all schemas and examples can be loaded."""
+        for content in (
+            docs.get_datacontract_schema(),
+            docs.get_dataproduct_schema(),
+            docs.get_datacontract_example(),
+            docs.get_dataproduct_example(),
+        ):
+            self.assertTrue(content)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 """Tests for the federated query functionality."""
 
+import re
 import unittest
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -122,5 +123,470 @@ class TestFederatedQuery(unittest.TestCase):
         self.assertIn("max_sources", capabilities)
 
 
+class TestFederatedFinalQuery(unittest.TestCase):
+    """Test joining source results with DuckDB."""
+
+    def test_execute_final_query_joins_sources(self):
+        """Test that source records are registered as tables and joined."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+
+        engine = FederatedQueryEngine(MagicMock())
+        source_results = {
+            "orders": [
+                {"id": 1, "customer_id": 101, "items": [1, 2]},
+                {"id": 2, "customer_id": 102, "items": [3, 4]},
+            ],
+            "customers": [{"id": 101, "name": "Test Customer"}, {"id": 102, "name": None}],
+        }
+        query = (
+            "SELECT o.id, c.name, len(o.items) AS item_count "
+            "FROM orders o JOIN customers c ON o.customer_id = c.id ORDER BY o.id"
+        )
+
+        results = engine._execute_final_query(source_results, query)
+
+        self.assertEqual(
+            [{"id": 1, "name": "Test Customer", "item_count": 2}, {"id": 2, "name": None, "item_count": 2}],
+            results
+        )
+
+    def test_execute_final_query_columnar(self):
+        """Test that columnar results keep the rows as returned by DuckDB."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+
+        engine = FederatedQueryEngine(MagicMock())
+        source_results = {"orders": [{"id": 1, "amount": 10}, {"id": 2, "amount": 20}], "customers": [{"id": 1}]}
+        query = "SELECT o.id, o.amount FROM orders o JOIN customers c ON o.id >= c.id ORDER BY o.id"
+
+        results = engine._execute_final_query(source_results, query, columnar=True)
+
+        self.assertEqual({"columns": ["id", "amount"], "rows": [(1, 10), (2, 20)]}, results)
+
+    def test_execute_final_query_keeps_types_of_late_values(self):
+        """Test that column types do not depend on the rows DuckDB samples, and text is not read as dates."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+
+        engine = FederatedQueryEngine(MagicMock())
+        # More leading rows without a note than DuckDB samples to detect types
+        text = {"ordered_on": "2024-01-01", "ordered_at": "12:00:00"}
+        rows = [{"id": i, "note": None, "amount": 1, **text} for i in range(25000)]
+        rows.append({"id": 25000, "note": "late", "amount": 1.5, **text})
+        query = (
+            "SELECT note, amount, ordered_on, ordered_at, "
+            "(SELECT count(*) FROM orders WHERE note IS NULL) AS nulls FROM orders WHERE id = 25000"
+        )
+
+        results = engine._execute_final_query({"orders": rows}, query)
+
+        self.assertEqual([{"note": "late", "amount": 1.5, **text, "nulls": 25000}], results)
+
+    def test_execute_final_query_isolates_concurrent_queries(self):
+        """Test that sources with the same name in concurrent queries do not interfere."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+
+        engine = FederatedQueryEngine(MagicMock())
+
+        def count(size):
+            source_results = {"orders": [{"id": i} for i in range(size)], "customers": [{"id": 0}]}
+            query = "SELECT COUNT(*) AS n FROM orders o JOIN customers c ON o.id >= c.id"
+            return engine._execute_final_query(source_results, query)[0]["n"]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(count, range(1, 21)))
+
+        self.assertEqual(list(range(1, 21)), results)
+
+    def test_execute_final_query_detects_types_beyond_first_rows(self):
+        """Test that columns which start with many nulls and hold dates or nested values are typed correctly."""
+        import datetime
+
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+
+        engine = FederatedQueryEngine(MagicMock())
+        orders = [{"id": i, "shipped": None, "tags": None} for i in range(5000)]
+        orders.append({"id": 5000, "shipped": datetime.date(2024, 1, 31), "tags": ["a", "b"]})
+        query = "SELECT id, shipped + 1 AS next_day, tags[2] AS tag FROM orders WHERE shipped IS NOT NULL"
+
+        results = engine._execute_final_query({"orders": orders, "customers": []}, query)
+
+        self.assertEqual([{"id": 5000, "next_day": datetime.date(2024, 2, 1), "tag": "b"}], results)
+
+    def test_get_source_data_parallel_limits_sources_in_flight(self):
+        """Test that all sources are loaded, but only a few of them at the same time."""
+        import threading
+        import time
+
+        from dataproduct_mcp.query import federated
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def get_source_data(source, query):
+            with lock:
+                in_flight.append(source)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(source)
+            return [{"query": query}]
+
+        engine = federated.FederatedQueryEngine(MagicMock())
+        engine._get_source_data = get_source_data
+        sources = [EngineQuerySource(product_id=f"local:product/{i}.dataproduct.yaml", alias=f"s{i}") for i in range(10)]
+
+        results = engine._get_source_data_parallel(sources, {f"s{i}": f"q{i}" for i in range(10)})
+
+        self.assertEqual({f"s{i}": [{"query": f"q{i}"}] for i in range(10)}, results)
+        self.assertEqual([f"s{i}" for i in range(10)], list(results))
+        self.assertLessEqual(max(max_in_flight), federated.MAX_PARALLEL_SOURCES_PER_QUERY)
+
+    def test_get_source_data_names_failing_source(self):
+        """Test that errors keep their type and mention the source that failed."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        asset_manager = MagicMock()
+        asset_manager.query_product.side_effect = FileNotFoundError("orders.csv")
+        engine = FederatedQueryEngine(asset_manager)
+        source = EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o")
+
+        with self.assertRaises(FileNotFoundError) as context:
+            engine._get_source_data_parallel([source], {"o": "SELECT 1"})
+
+        self.assertIn("local:product/orders.dataproduct.yaml", context.exception.__notes__[0])
+
+    def test_execute_query_writes_sources_to_files(self):
+        """Test that sources are queried from JSON files that are removed afterwards."""
+        import os
+        from unittest.mock import patch
+
+        from dataproduct_mcp.query import federated
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.side_effect = lambda identifier, query, **kwargs: (
+            [{"id": i, "customer_id": 100 + i % 2} for i in range(5)] if "orders" in query else [{"id": 101, "name": "A"}]
+        )
+        engine = federated.FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        loaded = []
+        load_source = engine._load_source
+
+        def record_load(*args):
+            loaded.append(load_source(*args))
+            return loaded[-1]
+
+        with patch.object(engine, "_load_source", record_load):
+            results = engine.execute_query(
+                "SELECT c.name, COUNT(o.id) AS n FROM o JOIN c ON o.customer_id = c.id GROUP BY c.name",
+                sources=sources
+            )
+
+        self.assertEqual([{"name": "A", "n": 2}], results)
+        self.assertEqual(2, len(loaded))
+        for scan in loaded:
+            path = re.search(r"read_json\('([^']*)'", scan).group(1)
+            self.assertFalse(os.path.exists(path))
+
+    def test_execute_query_keeps_column_types(self):
+        """Test that values JSON has no type for keep their type across sources, so decimals can be summed."""
+        import datetime
+        import uuid
+        from decimal import Decimal
+
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        order_id = uuid.uuid4()
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.side_effect = lambda identifier, query, **kwargs: (
+            [
+                {"customer_id": 1, "total": Decimal("10.5"), "order_id": order_id,
+                 "duration": datetime.timedelta(hours=1), "signature": b"\xff\x00"},
+                {"customer_id": 1, "total": Decimal("2.25"), "order_id": uuid.uuid4(),
+                 "duration": datetime.timedelta(minutes=30), "signature": b"\x01"},
+            ] if "orders" in query else [{"id": 1, "name": "A"}]
+        )
+        engine = FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        results = engine.execute_query(
+            "SELECT c.name, sum(o.total) AS total, max(o.duration) AS duration, min(o.signature) AS signature, "
+            f"bool_or(o.order_id = '{order_id}'::UUID) AS found FROM o JOIN c ON o.customer_id = c.id GROUP BY c.name",
+            sources=sources
+        )
+
+        self.assertEqual(
+            [{"name": "A", "total": Decimal("12.75"), "duration": datetime.timedelta(hours=1),
+              "signature": b"\x01", "found": True}],
+            results
+        )
+
+    def test_execute_query_with_empty_source(self):
+        """Test that a source without results can still be joined with."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.side_effect = lambda identifier, query, **kwargs: (
+            [{"id": 1, "customer_id": 101}] if "orders" in query else []
+        )
+        engine = FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        left = engine.execute_query(
+            "SELECT o.id, c.name FROM o LEFT JOIN c ON o.customer_id = c.id", sources=sources
+        )
+        inner = engine.execute_query(
+            "SELECT o.id, c.name FROM o JOIN c ON o.customer_id = c.id", sources=sources
+        )
+
+        self.assertEqual([{"id": 1, "name": None}], left)
+        self.assertEqual([], inner)
+
+    def test_execute_query_async(self):
+        """Test that the async variant loads the sources a few at a time and joins them."""
+        import asyncio
+        import threading
+        import time
+
+        from dataproduct_mcp.query import federated
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def query_product(identifier, query, **kwargs):
+            with lock:
+                in_flight.append(identifier)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(identifier)
+            return [{"id": 1}]
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.side_effect = query_product
+        engine = federated.FederatedQueryEngine(asset_manager)
+        sources = [EngineQuerySource(product_id=f"local:product/p{i}.dataproduct.yaml", alias=f"s{i}") for i in range(8)]
+        query = " UNION ALL ".join(f"SELECT s{i}.id FROM s{i}" for i in range(8))
+
+        results = asyncio.run(engine.execute_query_async(query, sources=sources))
+
+        self.assertEqual([{"id": 1}] * 8, results)
+        self.assertEqual(8, asset_manager.query_product.call_count)
+        self.assertLessEqual(max(max_in_flight), federated.MAX_PARALLEL_SOURCES_PER_QUERY)
+
+    def test_source_queries_are_planned_once_per_query(self):
+        """Test that repeated federated queries reuse their analysis."""
+        from unittest.mock import patch
+
+        from dataproduct_mcp.query import federated
+
+        engine = federated.FederatedQueryEngine(MagicMock())
+        tables = {"o": "orders", "c": "customers"}
+        query = "SELECT o.id, c.name FROM o JOIN c ON o.customer_id = c.id -- planned once"
+
+        with patch.object(federated, "build_source_queries", wraps=federated.build_source_queries) as build:
+            first = engine._build_source_queries(tables, query)
+            second = engine._build_source_queries(tables, query)
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, build.call_count)
+
+    def test_execute_query_pushes_work_down_to_sources(self):
+        """Test that each source is only asked for the columns and rows the query needs."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.side_effect = lambda identifier, query, **kwargs: (
+            [{"id": 1, "customer_id": 101}] if "orders" in query else [{"id": 101, "name": "Test Customer"}]
+        )
+        engine = FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        results = engine.execute_query(
+            "SELECT o.id, c.name FROM o JOIN c ON o.customer_id = c.id WHERE c.name <> 'x'",
+            sources=sources
+        )
+
+        self.assertEqual([{"id": 1, "name": "Test Customer"}], results)
+        queries = sorted(call.kwargs["query"] for call in asset_manager.query_product.call_args_list)
+        self.assertEqual(
+            ['SELECT "id", "customer_id" FROM "orders"', 'SELECT "name", "id" FROM "customers" WHERE ("name" != \'x\')'],
+            queries
+        )
+
+    def test_resolve_tables_concurrently(self):
+        """Test that the products of all sources are resolved at the same time, in source order."""
+        import threading
+
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        # Every resolution waits for the other one, so resolving one after another would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_model_key(identifier, port_id, model):
+            barrier.wait()
+            return identifier.asset_id.split(".")[0]
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = get_model_key
+        engine = FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="o"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        self.assertEqual({"o": "orders", "c": "customers"}, engine._resolve_tables(sources))
+        self.assertEqual(["o", "c"], list(engine._resolve_tables(sources)))
+
+    def test_execute_query_skips_sources_not_read(self):
+        """Test that sources the query does not use are not loaded."""
+        from dataproduct_mcp.query.federated import FederatedQueryEngine
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        asset_manager = MagicMock()
+        asset_manager.get_model_key.side_effect = lambda identifier, port_id, model: identifier.asset_id.split(".")[0]
+        asset_manager.query_product.return_value = [{"id": 1}]
+        engine = FederatedQueryEngine(asset_manager)
+        sources = [
+            EngineQuerySource(product_id="local:product/orders.dataproduct.yaml", alias="orders"),
+            EngineQuerySource(product_id="local:product/customers.dataproduct.yaml", alias="c"),
+        ]
+
+        results = engine.execute_query("SELECT id FROM orders", sources=sources)
+
+        self.assertEqual([{"id": 1}], results)
+        # The only source left is named like its table, so the query is passed through unchanged
+        asset_manager.query_product.assert_called_once()
+        self.assertEqual("SELECT id FROM orders", asset_manager.query_product.call_args.kwargs["query"])
+        self.assertEqual("orders.dataproduct.yaml", asset_manager.query_product.call_args.kwargs["identifier"].asset_id)
+
+
+class TestQuerySourceName(unittest.TestCase):
+    """Test the table names of federated query sources."""
+
+    def test_name(self):
+        """Test that the alias is used if given, otherwise a name derived from the product and port."""
+        from dataproduct_mcp.query.types import QuerySource as EngineQuerySource
+
+        self.assertEqual("o", EngineQuerySource(product_id="local:product/orders.yaml", alias="o").name)
+        self.assertEqual("local_product_orders.yaml", EngineQuerySource(product_id="local:product/orders.yaml").name)
+        self.assertEqual(
+            "local_product_orders.yaml_port1",
+            EngineQuerySource(product_id="local:product/orders.yaml", port_id="port1").name
+        )
+
+
+class TestBuildSourceQueries(unittest.TestCase):
+    """Test deriving the queries sent to each source."""
+
+    def setUp(self):
+        """Set up a DuckDB connection to parse queries with."""
+        import duckdb
+
+        self.con = duckdb.connect(":memory:")
+        self.tables = {"orders": "orders_model", "customers": "customers_model"}
+
+    def tearDown(self):
+        """Close the connection."""
+        self.con.close()
+
+    def _build(self, query: str) -> Dict[str, str]:
+        from dataproduct_mcp.query.pushdown import build_source_queries
+
+        return build_source_queries(query, self.tables, self.con)
+
+    def test_pushes_down_columns_and_single_source_filters(self):
+        """Test that only referenced columns and filters on a single source are pushed down."""
+        queries = self._build(
+            "SELECT o.id, c.name FROM orders o JOIN customers c ON o.customer_id = c.id "
+            "WHERE c.country = 'DE' AND o.amount > 10 AND o.amount > c.credit LIMIT 100"
+        )
+
+        self.assertEqual(
+            'SELECT "id", "customer_id", "amount" FROM "orders_model" WHERE (amount > 10)',
+            queries["orders"]
+        )
+        self.assertEqual(
+            'SELECT "name", "id", "country", "credit" FROM "customers_model" WHERE (country = \'DE\')',
+            queries["customers"]
+        )
+
+    def test_does_not_filter_outer_joined_sources(self):
+        """Test that filters are kept out of the source queries when an outer join is used."""
+        queries = self._build(
+            "SELECT o.id FROM orders o LEFT JOIN customers c ON o.customer_id = c.id WHERE c.name IS NULL"
+        )
+
+        self.assertEqual('SELECT "id", "name" FROM "customers_model"', queries["customers"])
+
+    def test_pushes_down_limit_without_joins(self):
+        """Test that the limit of a plain query on a single source is pushed down."""
+        self.assertEqual(
+            'SELECT "id" FROM "orders_model" LIMIT 5',
+            self._build("SELECT orders.id FROM orders LIMIT 5")["orders"]
+        )
+        self.assertEqual(
+            'SELECT "id" FROM "orders_model"',
+            self._build("SELECT count(orders.id) FROM orders LIMIT 5")["orders"]
+        )
+
+    def test_referenced_tables(self):
+        """Test that tables are found in joins and subqueries, and None is returned for invalid queries."""
+        from dataproduct_mcp.query.pushdown import referenced_tables
+
+        self.assertEqual(
+            {"orders", "customers"},
+            referenced_tables("SELECT * FROM Orders WHERE id IN (SELECT id FROM customers)", self.con)
+        )
+        self.assertEqual(set(), referenced_tables("SELECT 1", self.con))
+        self.assertIsNone(referenced_tables("SELECT FROM", self.con))
+
+    def test_selected_columns(self):
+        """Test that the columns of source queries are found, and None is returned for other queries."""
+        from dataproduct_mcp.query.pushdown import selected_columns
+
+        source_query = self._build("SELECT o.id, o.name FROM orders o WHERE o.total > 10")["orders"]
+
+        self.assertEqual(["id", "name", "total"], selected_columns(source_query, self.con))
+        self.assertIsNone(selected_columns('SELECT * FROM "orders_model"', self.con))
+        self.assertIsNone(selected_columns('SELECT id + 1 FROM "orders_model"', self.con))
+
+    def test_falls_back_to_all_columns(self):
+        """Test that sources are read in full when the query cannot be attributed to them."""
+        expected = {"orders": 'SELECT * FROM "orders_model"', "customers": 'SELECT * FROM "customers_model"'}
+
+        self.assertEqual(expected, self._build("SELECT * FROM orders o JOIN customers c ON o.customer_id = c.id"))
+        self.assertEqual(expected, self._build("SELECT id FROM orders o JOIN customers c ON o.customer_id = c.id"))
+        self.assertEqual(expected, self._build("SELECT FROM"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,157 @@
+"""Tests for the local asset source plugin."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dataproduct_mcp.asset_manager import AssetLoadError
+from dataproduct_mcp.sources.asset_source import AssetSourceRegistry
+from dataproduct_mcp.sources.asset_plugins.local import LocalAssetSource
+from dataproduct_mcp.types import DataAssetType
+
+
+class TestLocalAssetSource(unittest.TestCase):
+    """Test listing assets from a local directory."""
+
+    def setUp(self):
+        """Set up a temporary assets directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.assets_dir = self.tmp_dir.name
+        self.source = LocalAssetSource()
+        self.source.configure({"assets_dir": self.assets_dir})
+
+    def tearDown(self):
+        """Clean up the temporary assets directory."""
+        self.tmp_dir.cleanup()
+
+    def _touch(self, name: str) -> None:
+        with open(os.path.join(self.assets_dir, name), "w", encoding="utf-8") as f:
+            f.write("id: test\n")
+
+    def test_list_assets_filters_by_extension(self):
+        """Test that only files with the matching extension are listed."""
+        self._touch("orders.dataproduct.yaml")
+        self._touch("orders.datacontract.yaml")
+        self._touch("notes.txt")
+        os.mkdir(os.path.join(self.assets_dir, "nested.dataproduct.yaml"))
+
+        products = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+        contracts = self.source.list_assets(DataAssetType.DATA_CONTRACT)
+
+        self.assertEqual(["local:product/orders.dataproduct.yaml"], [str(i) for i in products])
+        self.assertEqual(["local:contract/orders.datacontract.yaml"], [str(i) for i in contracts])
+
+    def test_list_assets_matches_mixed_case_extension(self):
+        """Test that the extension check is case-insensitive."""
+        self._touch("Orders.DataProduct.YAML")
+
+        products = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+
+        self.assertEqual(["Orders.DataProduct.YAML"], [i.asset_id for i in products])
+
+    def test_list_assets_scans_directory_once_for_all_types(self):
+        """Test that products and contracts are collected in a single directory scan."""
+        self._touch("orders.dataproduct.yaml")
+        self._touch("orders.datacontract.yaml")
+
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            self.source.list_assets(DataAssetType.DATA_PRODUCT)
+            contracts = self.source.list_assets(DataAssetType.DATA_CONTRACT)
+
+        self.assertEqual(1, scandir.call_count)
+        self.assertEqual(["orders.datacontract.yaml"], [i.asset_id for i in contracts])
+
+    def test_list_assets_picks_up_new_files(self):
+        """Test that the listing cache is invalidated when the directory changes."""
+        self._touch("orders.dataproduct.yaml")
+        self.assertEqual(1, len(self.source.list_assets(DataAssetType.DATA_PRODUCT)))
+
+        self._touch("customers.dataproduct.yaml")
+        # Make sure the directory mtime changes even on coarse-grained file systems
+        stat = os.stat(self.assets_dir)
+        os.utime(self.assets_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        products = self.source.list_assets(DataAssetType.DATA_PRODUCT)
+        self.assertEqual(
+            ["customers.dataproduct.yaml", "orders.dataproduct.yaml"],
+            sorted(i.asset_id for i in products)
+        )
+
+    def test_load_asset_content_prefixes_contract_ids(self):
+        """Test that local dataContractId references get the local source prefix."""
+        with open(os.path.join(self.assets_dir, "orders.dataproduct.yaml"), "w", encoding="utf-8") as f:
+            f.write("id: orders\ninfo:\n  title: Orders\noutputPorts:\n  - id: port\n    dataContractId: orders.datacontract.yaml\n")
+        identifier = self.source.get_identifier(DataAssetType.DATA_PRODUCT, "orders.dataproduct.yaml")
+
+        content = yaml.safe_load(self.source.load_asset_content(identifier))
+
+        self.assertEqual("local:contract/orders.datacontract.yaml", content["outputPorts"][0]["dataContractId"])
+
+    def test_load_asset_content_picks_up_changed_file(self):
+        """Test that cached content is replaced when the file changes."""
+        path = os.path.join(self.assets_dir, "orders.datacontract.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("id: orders\n")
+        identifier = self.source.get_identifier(DataAssetType.DATA_CONTRACT, "orders.datacontract.yaml")
+        self.assertEqual("id: orders\n", self.source.load_asset_content(identifier))
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("id: orders-v2\n")
+
+        self.assertEqual("id: orders-v2\n", self.source.load_asset_content(identifier))
+
+    def test_load_asset_content_missing_file(self):
+        """Test that loading a missing file raises an AssetLoadError."""
+        identifier = self.source.get_identifier(DataAssetType.DATA_CONTRACT, "missing.datacontract.yaml")
+
+        with self.assertRaises(AssetLoadError):
+            self.source.load_asset_content(identifier)
+
+    def test_load_asset_content_stays_in_assets_directory(self):
+        """Test that absolute and relative paths leading out of the assets directory are rejected."""
+        with tempfile.TemporaryDirectory() as other_dir:
+            outside = os.path.join(other_dir, "secret.datacontract.yaml")
+            with open(outside, "w", encoding="utf-8") as f:
+                f.write("id: secret\n")
+            relative = os.path.relpath(outside, self.assets_dir)
+
+            for asset_id in (outside, relative):
+                identifier = self.source.get_identifier(DataAssetType.DATA_CONTRACT, asset_id)
+                with self.assertRaises(AssetLoadError):
+                    self.source.load_asset_content(identifier)
+
+
+class TestAssetSourceRegistryListing(unittest.TestCase):
+    """Test listing assets across sources."""
+
+    def test_list_assets_lists_sources_on_shared_workers(self):
+        """Test that sources are listed on the shared listing workers, with results in source order."""
+        threads = set()
+
+        class Source:
+            def __init__(self, name):
+                self.name = name
+
+            def list_assets(self, asset_type):
+                threads.add(threading.current_thread().name)
+                return [f"{self.name}:{asset_type.value}"]
+
+        sources = {"a": Source("a"), "b": Source("b")}
+        with (
+            patch.object(AssetSourceRegistry, "get_available_sources", return_value=["a", "b"]),
+            patch.object(AssetSourceRegistry, "get_source", side_effect=sources.get),
+        ):
+            for _ in range(3):
+                assets = AssetSourceRegistry.list_assets(DataAssetType.DATA_PRODUCT)
+                self.assertEqual(["a:product", "b:product"], assets)
+
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("asset-listing") for name in threads))
+
+
+if __name__ == "__main__":
+    unittest.main()
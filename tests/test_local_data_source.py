@@ -0,0 +1,346 @@
+"""Tests for the local data source plugin."""
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from dataproduct_mcp.sources.data_plugins.local import LocalDataSource, create_duckdb_connection, iter_records
+from dataproduct_mcp.sources.data_source import DataSourceRegistry, ServerType
+
+
+class TestLocalDataSource(unittest.TestCase):
+    """Test querying local files via DuckDB."""
+
+    def setUp(self):
+        """Set up a temporary data directory and a fresh source."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source = LocalDataSource()
+
+    def tearDown(self):
+        """Close the shared connection and clean up the data directory."""
+        self.source.configure({"connection_pooling": False})
+        self.tmp_dir.cleanup()
+
+    def _write_csv(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_execute_with_quote_in_path(self):
+        """Test that file paths containing quotes are passed to DuckDB safely."""
+        path = self._write_csv("o'brien.csv", "id,amount\n1,10\n2,20\n")
+
+        records = self.source.execute("orders", "SELECT SUM(amount) AS total FROM orders", {"path": path})
+
+        self.assertEqual([{"total": 30}], records)
+
+    def test_execute_resolves_relative_path(self):
+        """Test that relative paths are resolved against the base directory, and missing files are reported."""
+        self._write_csv("orders.csv", "id\n1\n")
+        server_config = {"path": "orders.csv", "base_directory": self.tmp_dir.name}
+
+        records = self.source.execute("orders", "SELECT COUNT(*) AS n FROM orders", server_config)
+
+        self.assertEqual([{"n": 1}], records)
+        with self.assertRaises(FileNotFoundError):
+            self.source.execute("orders", "SELECT 1", {"path": "missing.csv", "base_directory": self.tmp_dir.name})
+
+    def test_execute_reloads_changed_file(self):
+        """Test that the loaded table is reused until the file changes."""
+        path = self._write_csv("orders.csv", "id,amount\n1,10\n")
+        query = "SELECT COUNT(*) AS n FROM orders"
+
+        self.assertEqual([{"n": 1}], self.source.execute("orders", query, {"path": path}))
+        self.assertEqual([{"n": 1}], self.source.execute("orders", query, {"path": path}))
+
+        self._write_csv("orders.csv", "id,amount\n1,10\n2,20\n3,30\n")
+        self.assertEqual([{"n": 3}], self.source.execute("orders", query, {"path": path}))
+
+    def test_execute_loads_table_when_queried_again(self):
+        """Test that a file is queried through a view first and loaded into a table on reuse."""
+        path = self._write_csv("orders.csv", "id,amount\n1,10\n2,20\n")
+        query = "SELECT SUM(amount) AS total FROM orders"
+
+        self.assertEqual([{"total": 30}], self.source.execute("orders", query, {"path": path}))
+        self.assertEqual({"orders"}, self.source._views)
+
+        self.assertEqual([{"total": 30}], self.source.execute("orders", query, {"path": path}))
+        self.assertEqual(set(), self.source._views)
+        self.assertEqual([{"total": 30}], self.source.execute("orders", query, {"path": path}))
+
+    def test_execute_keeps_parquet_file_as_view(self):
+        """Test that Parquet files are queried through one view instead of being loaded into a table."""
+        path = os.path.join(self.tmp_dir.name, "orders.parquet")
+        conn = create_duckdb_connection()
+        try:
+            conn.execute(f"COPY (SELECT range AS id FROM range(3)) TO '{path}' (FORMAT parquet)")
+        finally:
+            conn.close()
+        query = "SELECT COUNT(*) AS n FROM orders"
+
+        with patch.object(self.source, "_load_table", wraps=self.source._load_table) as load:
+            for _ in range(3):
+                self.assertEqual([{"n": 3}], self.source.execute("orders", query, {"path": path}))
+
+        self.assertEqual(1, load.call_count)
+        self.assertTrue(load.call_args.kwargs["view"])
+        self.assertEqual({"orders"}, self.source._views)
+        self.assertTrue(
+            self.source._connection.execute("SELECT current_setting('parquet_metadata_cache')").fetchone()[0]
+        )
+
+    def test_execute_does_not_change_shared_tables(self):
+        """Test that statements changing data run on their own connection, leaving the loaded table as is."""
+        path = self._write_csv("orders.csv", "id\n1\n2\n3\n")
+        query = "SELECT COUNT(*) AS n FROM orders"
+        self.source.execute("orders", query, {"path": path})
+        self.source.execute("orders", query, {"path": path})
+
+        # On its own connection, the model is a view over the file, which cannot be deleted from
+        with self.assertRaises(Exception):
+            self.source.execute("orders", "DELETE FROM orders WHERE id > 1 RETURNING id", {"path": path})
+        self.source.execute("orders", "CREATE TABLE copy AS SELECT * FROM orders", {"path": path})
+
+        self.assertEqual([{"n": 3}], self.source.execute("orders", query, {"path": path}))
+        self.assertEqual(["orders"], list(self.source._tables))
+        self.assertEqual(
+            [("orders",)], self.source._connection.execute("SELECT table_name FROM duckdb_tables()").fetchall()
+        )
+
+    def test_execute_does_not_read_tables_of_other_models(self):
+        """Test that a query only sees the table of its own model, not those loaded for other models."""
+        orders = self._write_csv("orders.csv", "id\n1\n")
+        customers = self._write_csv("customers.csv", "id\n1\n2\n")
+        self.source.execute("customers", "SELECT * FROM customers", {"path": customers})
+
+        with self.assertRaises(Exception):
+            self.source.execute("orders", "SELECT * FROM orders JOIN customers USING (id)", {"path": orders})
+        with self.assertRaises(Exception):
+            self.source.execute("orders", "SELECT * FROM main.customers", {"path": orders})
+        tables = self.source.execute("orders", "SELECT table_name FROM duckdb_tables()", {"path": orders})
+        self.assertEqual([], tables)
+
+    def test_execute_evicts_least_recently_used_tables(self):
+        """Test that only the configured number of tables is kept loaded."""
+        self.source.configure({"max_tables": 1})
+        orders = self._write_csv("orders.csv", "id\n1\n")
+        customers = self._write_csv("customers.csv", "id\n1\n2\n")
+
+        self.source.execute("orders", "SELECT * FROM orders", {"path": orders})
+        self.source.execute("customers", "SELECT * FROM customers", {"path": customers})
+
+        self.assertEqual(["customers"], list(self.source._tables))
+        records = self.source.execute("orders", "SELECT COUNT(*) AS n FROM orders", {"path": orders})
+        self.assertEqual([{"n": 1}], records)
+
+    def test_execute_reads_parquet_copy_after_eviction(self):
+        """Test that a repeatedly queried CSV file is reloaded from its Parquet copy."""
+        self.source.configure({"max_tables": 1})
+        orders = self._write_csv("orders.csv", "id,amount\n1,10\n2,20\n")
+        customers = self._write_csv("customers.csv", "id\n1\n")
+        query = "SELECT SUM(amount) AS total FROM orders"
+
+        self.source.execute("orders", query, {"path": orders})
+        self.source.execute("orders", query, {"path": orders})
+        self.source.execute("customers", "SELECT * FROM customers", {"path": customers})
+        self.assertEqual(["customers"], list(self.source._tables))
+
+        with patch.object(self.source, "_load_table", wraps=self.source._load_table) as load:
+            records = self.source.execute("orders", query, {"path": orders})
+
+        self.assertEqual([{"total": 30}], records)
+        load.assert_not_called()
+
+    def test_execute_without_connection_pooling_reads_parquet_copy(self):
+        """Test that a CSV file queried again without connection pooling is read from its Parquet copy."""
+        self.source.configure({"connection_pooling": False})
+        path = self._write_csv("orders.csv", "id,amount\n1,10\n")
+        query = "SELECT id, amount FROM orders"
+
+        self.assertEqual([{"id": 1, "amount": 10}], self.source.execute("orders", query, {"path": path}))
+        self.assertEqual([{"id": 1, "amount": 10}], self.source.execute("orders", query, {"path": path}))
+
+        with patch.object(self.source, "_load_table", wraps=self.source._load_table) as load:
+            self.assertEqual([{"id": 1, "amount": 10}], self.source.execute("orders", query, {"path": path}))
+        load.assert_not_called()
+
+        self._write_csv("orders.csv", "id,amount\n1,10\n2,20\n")
+        self.assertEqual(2, len(self.source.execute("orders", query, {"path": path})))
+
+    def test_execute_reads_parquet_copy_of_json_file(self):
+        """Test that a repeatedly queried JSON file is also reloaded from its Parquet copy."""
+        self.source.configure({"connection_pooling": False})
+        path = self._write_csv("orders.json", '[{"id": 1, "tags": ["a", "b"]}, {"id": 2, "tags": []}]')
+        query = "SELECT id, len(tags) AS n FROM orders ORDER BY id"
+        expected = [{"id": 1, "n": 2}, {"id": 2, "n": 0}]
+
+        self.assertEqual(expected, self.source.execute("orders", query, {"path": path}))
+        self.assertEqual(expected, self.source.execute("orders", query, {"path": path}))
+
+        with patch.object(self.source, "_load_table", wraps=self.source._load_table) as load:
+            self.assertEqual(expected, self.source.execute("orders", query, {"path": path}))
+        load.assert_not_called()
+
+    def test_execute_concurrently(self):
+        """Test that concurrent queries load each file once and return correct results."""
+        paths = {
+            name: self._write_csv(f"{name}.csv", "id\n" + "".join(f"{i}\n" for i in range(size)))
+            for name, size in (("orders", 3), ("customers", 5))
+        }
+
+        def count(name):
+            records = self.source.execute(name, f"SELECT COUNT(*) AS n FROM {name}", {"path": paths[name]})
+            return name, records[0]["n"]
+
+        with patch.object(self.source, "_load_table", wraps=self.source._load_table) as load:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(count, ["orders", "customers"] * 10))
+
+        self.assertEqual([("orders", 3), ("customers", 5)] * 10, results)
+        # One view and one table per model, however many threads queried it
+        self.assertEqual(4, load.call_count)
+
+    def test_execute_without_connection_pooling(self):
+        """Test that queries work with a fresh connection per query."""
+        self.source.configure({"connection_pooling": False})
+        path = self._write_csv("orders.csv", "id,amount\n1,10\n")
+
+        records = self.source.execute("orders", "SELECT id, amount FROM orders", {"path": path})
+
+        self.assertEqual([{"id": 1, "amount": 10}], records)
+
+    def test_determine_file_format(self):
+        """Test that the format comes from the configuration first, then from the extension."""
+        self.assertEqual("json", self.source._determine_file_format("orders.csv", {"format": " JSON "}))
+        self.assertEqual("parquet", self.source._determine_file_format("orders.PARQUET", {}))
+        self.assertEqual("csv", self.source._determine_file_format("orders.tsv", {}))
+        self.assertEqual("csv", self.source._determine_file_format("orders.unknown", {}))
+
+    def test_execute_uses_contract_field_types(self):
+        """Test that CSV columns are loaded with the types declared by the contract."""
+        path = self._write_csv("orders.csv", "order_id,amount\n\"0042\",10\n")
+        server_config = {
+            "path": path,
+            "model_fields": {"order_id": {"type": "text"}, "amount": {"type": "long"}},
+        }
+
+        records = self.source.execute("orders", "SELECT order_id, amount FROM orders", server_config)
+
+        self.assertEqual([{"order_id": "0042", "amount": 10}], records)
+
+    def test_execute_reads_contract_numbers_without_narrowing(self):
+        """Test that float and integer fields keep the values type detection would read."""
+        path = self._write_csv("prices.csv", "id,price\n3000000000,0.1\n1,19.99\n")
+        server_config = {
+            "path": path,
+            "model_fields": {"id": {"type": "integer"}, "price": {"type": "float"}},
+        }
+
+        with self.assertNoLogs("dataproduct-mcp.sources.data_plugins.local", level="WARNING"):
+            records = self.source.execute("prices", "SELECT id, price FROM prices ORDER BY id", server_config)
+
+        self.assertEqual([{"id": 1, "price": 19.99}, {"id": 3000000000, "price": 0.1}], records)
+
+    def test_execute_uses_contract_field_types_in_any_order(self):
+        """Test that declared types are matched by name when the contract lists columns in another order."""
+        path = self._write_csv("orders.csv", "order_id,amount,note\n\"0042\",10,x\n")
+        server_config = {
+            "path": path,
+            "model_fields": {"amount": {"type": "long"}, "order_id": {"type": "text"}},
+        }
+
+        with patch.object(self.source, "_scan_query", wraps=self.source._scan_query) as scan:
+            records = self.source.execute("orders", "SELECT order_id, amount FROM orders", server_config)
+
+        self.assertEqual([{"order_id": "0042", "amount": 10}], records)
+        self.assertFalse(scan.call_args.args[3])
+
+    def test_execute_skips_detection_when_contract_declares_all_columns(self):
+        """Test that the declared schema is used as is when it covers the whole file."""
+        path = self._write_csv("orders.csv", "order_id,amount\n\"0042\",10\n")
+        server_config = {
+            "path": path,
+            "model_fields": {"order_id": {"type": "text"}, "amount": {"type": "long"}},
+        }
+
+        with patch.object(self.source, "_scan_query", wraps=self.source._scan_query) as scan:
+            records = self.source.execute("orders", "SELECT order_id, amount FROM orders", server_config)
+
+        self.assertEqual([{"order_id": "0042", "amount": 10}], records)
+        self.assertTrue(scan.call_args.args[3])
+
+    def test_execute_falls_back_when_values_do_not_match_contract(self):
+        """Test that type detection is used when values cannot be converted to the declared types."""
+        path = self._write_csv("orders.csv", "id,amount\n1,10\nx,20\n")
+        server_config = {"path": path, "model_fields": {"id": {"type": "long"}, "amount": {"type": "long"}}}
+        query = "SELECT id, amount FROM orders ORDER BY amount"
+        expected = [{"id": "1", "amount": 10}, {"id": "x", "amount": 20}]
+
+        self.assertEqual(expected, self.source.execute("orders", query, server_config))
+        self.assertEqual(expected, self.source.execute("orders", query, server_config))
+
+    def test_execute_falls_back_when_contract_does_not_match(self):
+        """Test that type detection is used when the declared columns are not in the file."""
+        path = self._write_csv("orders.csv", "id,amount\n1,10\n")
+        server_config = {"path": path, "model_fields": {"missing": {"type": "text"}}}
+
+        records = self.source.execute("orders", "SELECT id, amount FROM orders", server_config)
+
+        self.assertEqual([{"id": 1, "amount": 10}], records)
+
+
+class TestLocalDataSourceRegistry(unittest.TestCase):
+    """Test looking up the local data source in the registry."""
+
+    def test_file_shares_local_instance(self):
+        """Test that the FILE alias uses the same instance as LOCAL."""
+        local = DataSourceRegistry.get_source(ServerType.LOCAL)
+
+        self.assertIsInstance(local, LocalDataSource)
+        self.assertIs(local, DataSourceRegistry.get_source(ServerType.FILE))
+
+    def test_server_type_lookup_ignores_case(self):
+        """Test that server types can be looked up from mixed-case strings."""
+        self.assertIs(ServerType.LOCAL, ServerType("Local"))
+        self.assertIs(ServerType.FILE, ServerType("FILE"))
+        self.assertIs(DataSourceRegistry.get_source(ServerType.LOCAL), DataSourceRegistry.get_source(ServerType("LOCAL")))
+
+
+class TestIterRecords(unittest.TestCase):
+    """Test converting DuckDB results into records."""
+
+    def test_iter_records_fetches_in_batches(self):
+        """Test that all records are returned when the result spans several batches."""
+        conn = create_duckdb_connection()
+        try:
+            result = conn.execute("SELECT range AS id, range * 2 AS doubled FROM range(5)")
+
+            records = list(iter_records(result, batch_size=2))
+        finally:
+            conn.close()
+
+        self.assertEqual([{"id": i, "doubled": i * 2} for i in range(5)], records)
+
+    def test_iter_records_keeps_values(self):
+        """Test that NULLs stay None and types NumPy cannot hold exactly keep their Python values."""
+        from decimal import Decimal
+
+        conn = create_duckdb_connection()
+        try:
+            plain = list(iter_records(conn.execute(
+                "SELECT 1 AS id, NULL::BIGINT AS n, 0.5::DOUBLE AS d, NULL::VARCHAR AS s, true AS b"
+            )))
+            decimal = list(iter_records(conn.execute("SELECT 1 AS id, 9.50::DECIMAL(4, 2) AS amount")))
+        finally:
+            conn.close()
+
+        self.assertEqual([{"id": 1, "n": None, "d": 0.5, "s": None, "b": True}], plain)
+        self.assertIs(int, type(plain[0]["id"]))
+        self.assertEqual([{"id": 1, "amount": Decimal("9.50")}], decimal)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+"""Tests for the S3 data source plugin."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import duckdb
+
+from dataproduct_mcp.sources.data_plugins.s3 import S3DataSource
+
+
+class TestS3DataSource(unittest.TestCase):
+    """Test resolving S3 server configurations."""
+
+    def setUp(self):
+        """Set up a source with query execution patched out."""
+        self.source = S3DataSource()
+        self.execute_patcher = patch.object(self.source, "_execute_duckdb_s3_query", return_value=[])
+        self.mock_execute = self.execute_patcher.start()
+
+    def tearDown(self):
+        """Stop patching."""
+        self.execute_patcher.stop()
+
+    def test_execute_with_bucket_and_path(self):
+        """Test that the bucket and path settings are combined into an S3 URI."""
+        self.source.execute("orders", "SELECT * FROM orders", {"bucket": "data", "path": "orders.csv"})
+
+        self.assertEqual("s3://data/orders.csv", self.mock_execute.call_args.args[0])
+
+    def test_execute_with_prefix_reads_files_by_glob(self):
+        """Test that a path ending in '/' is read as a glob over the files of its format."""
+        self.source.execute("orders", "SELECT * FROM orders", {"bucket": "data", "path": "orders/"})
+        self.assertEqual(("s3://data/orders/*.parquet", "parquet"), self.mock_execute.call_args.args[:2])
+
+        self.source.execute("orders", "SELECT * FROM orders", {"bucket": "data", "path": "orders/", "format": "json"})
+        self.assertEqual(("s3://data/orders/*.json", "json"), self.mock_execute.call_args.args[:2])
+
+        self.source.execute("orders", "SELECT * FROM orders", {"bucket": "data", "path": "orders/", "format": "delta"})
+        self.assertEqual(("s3://data/orders/", "delta"), self.mock_execute.call_args.args[:2])
+
+    def test_execute_rejects_bucket_not_allowed(self):
+        """Test that buckets outside the allowed list are rejected."""
+        self.source._allowed_buckets = {"data"}
+
+        with self.assertRaises(ValueError):
+            self.source.execute("orders", "SELECT 1", {"bucket": "private", "path": "orders.csv"})
+        self.mock_execute.assert_not_called()
+
+    def test_configure_checks_max_buckets(self):
+        """Test that more allowed buckets than the maximum are rejected when configuring."""
+        self.source.configure({"allowed_buckets": ["a", "b"], "max_buckets": 2})
+        self.assertEqual(frozenset({"a", "b"}), self.source._allowed_buckets)
+
+        with self.assertRaises(ValueError):
+            self.source.configure({"allowed_buckets": ["a", "b", "c"]})
+        self.assertEqual(frozenset({"a", "b"}), self.source._allowed_buckets)
+
+    def test_query_reports_misconfigured_buckets(self):
+        """Test that a query on S3 says why the source is unavailable when too many buckets are allowed."""
+        from dataproduct_mcp.asset_manager import AssetQueryError
+        from dataproduct_mcp.sources.data_source import DataSourceRegistry, ServerType
+
+        with (
+            patch.dict(os.environ, {"S3_ALLOWED_BUCKETS": "a,b,c", "S3_MAX_BUCKETS": "2"}),
+            patch.dict(DataSourceRegistry._instances, clear=True),
+            patch.dict(DataSourceRegistry._instance_errors, clear=True),
+        ):
+            with self.assertRaises(AssetQueryError) as context:
+                DataSourceRegistry.execute_query(ServerType.S3, "orders", "SELECT 1", {"bucket": "a", "path": "o.csv"})
+
+        self.assertIn("3 allowed buckets exceed the maximum of 2", str(context.exception))
+
+    def test_create_secret_query(self):
+        """Test that credentials, region and a custom endpoint are passed to DuckDB as one secret."""
+        server_config = {
+            "region": "eu-central-1",
+            "endpoint_url": "http://localhost:9000/",
+            "credentials": {"aws_access_key_id": "key", "aws_secret_access_key": "it's secret"},
+        }
+
+        self.assertEqual(
+            "CREATE OR REPLACE TEMPORARY SECRET s3_source (TYPE S3, REGION 'eu-central-1', KEY_ID 'key', "
+            "SECRET 'it''s secret', ENDPOINT 'localhost:9000', USE_SSL false, URL_STYLE 'path')",
+            self.source._create_secret_query(server_config)
+        )
+
+    def test_create_secret_query_without_credentials(self):
+        """Test that no keys are set when there are no credentials, so public buckets can be read."""
+        self.source._credentials = {"aws_access_key_id": None}
+        self.source._endpoint_url = None
+
+        self.assertEqual(
+            "CREATE OR REPLACE TEMPORARY SECRET s3_source (TYPE S3, REGION 'us-east-1')",
+            self.source._create_secret_query({"region": "us-east-1"})
+        )
+
+    def test_create_view_query_escapes_uri(self):
+        """Test that the file is exposed as a view, with quotes in the URI escaped."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "o'brien.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("id,amount\n1,10\n2,20\n")
+
+            conn = duckdb.connect(":memory:")
+            try:
+                conn.execute(self.source._create_view_query("csv", "orders", path))
+                total = conn.execute("SELECT SUM(amount) FROM orders").fetchone()[0]
+                table_type = conn.execute("SELECT table_type FROM information_schema.tables").fetchone()[0]
+            finally:
+                conn.close()
+
+        self.assertEqual(30, total)
+        self.assertEqual("VIEW", table_type)
+
+    def test_create_view_query_uses_declared_json_layout(self):
+        """Test that a declared JSON delimiter is passed to read_json, and detected otherwise."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "orders.json")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"id": 1, "amount": 10}\n{"id": 2, "amount": 20}\n')
+
+            conn = duckdb.connect(":memory:")
+            try:
+                declared = self.source._create_view_query("json", "orders", path, "new_line")
+                conn.execute(declared)
+                total = conn.execute("SELECT SUM(amount) FROM orders").fetchone()[0]
+                conn.execute(self.source._create_view_query("json", "orders", path))
+                detected = conn.execute("SELECT SUM(amount) FROM orders").fetchone()[0]
+            finally:
+                conn.close()
+
+        self.assertIn("format='newline_delimited'", declared)
+        self.assertEqual(30, total)
+        self.assertEqual(30, detected)
+
+    def test_create_view_query_scans_delta_table(self):
+        """Test that a Delta table is exposed as a view over delta_scan, so filters reach the scan."""
+        self.assertEqual(
+            """CREATE OR REPLACE TEMP VIEW "orders" AS SELECT * FROM delta_scan('s3://data/orders/');""",
+            self.source._create_view_query("delta", "orders", "s3://data/orders/"),
+        )
+
+
+class TestS3DataSourceConnections(unittest.TestCase):
+    """Test reusing DuckDB connections across S3 queries."""
+
+    def setUp(self):
+        """Set up a local file to stand in for an S3 object, and a source that does not need httpfs."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "orders.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("id,amount\n1,10\n2,20\n")
+
+        self.source = S3DataSource()
+        self.source._load_httpfs = lambda conn: None
+        self.source._create_secret_query = lambda server_config: f"SET VARIABLE region = '{server_config['region']}'"
+
+    def tearDown(self):
+        """Clean up the data directory."""
+        self.tmp_dir.cleanup()
+
+    def test_connection_is_reused_per_credentials(self):
+        """Test that queries with the same credentials share a connection, but each has its own view."""
+        from dataproduct_mcp.sources.data_plugins import s3
+
+        query = "SELECT SUM(amount) AS total FROM orders"
+        with patch.object(s3, "create_duckdb_connection", wraps=s3.create_duckdb_connection) as connect:
+            for region in ("eu-central-1", "eu-central-1", "us-east-1"):
+                records = self.source._execute_duckdb_s3_query(self.path, "csv", "orders", query, {"region": region})
+                self.assertEqual([{"total": 30}], records)
+
+        self.assertEqual(2, connect.call_count)
+        self.assertEqual(2, len(self.source._connections))
+        for conn in self.source._connections.values():
+            self.assertTrue(conn.execute("SELECT current_setting('parquet_metadata_cache')").fetchone()[0])
+
+    def test_connections_are_limited(self):
+        """Test that only the most recently used connections are kept."""
+        self.source._max_connections = 1
+
+        for region in ("eu-central-1", "us-east-1"):
+            self.source._execute_duckdb_s3_query(self.path, "csv", "orders", "SELECT 1 AS one", {"region": region})
+
+        self.assertEqual(["SET VARIABLE region = 'us-east-1'"], list(self.source._connections))
+
+
+if __name__ == "__main__":
+    unittest.main()
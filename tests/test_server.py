@@ -0,0 +1,179 @@
+"""Tests for the MCP tools of the server."""
+
+import asyncio
+import datetime
+import json
+import threading
+import time
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from dataproduct_mcp import server
+
+
+class TestDataproductsQuery(unittest.TestCase):
+    """Test the dataproducts_query tool."""
+
+    def test_query_returns_single_json_document(self):
+        """Test that records are serialized once, with dates and decimals as strings."""
+        records = [
+            {"id": 1, "amount": Decimal("9.50"), "ordered_at": datetime.datetime(2024, 1, 2, 3, 4, 5)},
+            {"id": 2, "amount": None, "ordered_at": None},
+        ]
+
+        with patch.object(server.DataAssetManager, "execute_query_async", return_value=records):
+            result = asyncio.run(server.dataproducts_query([{"product_id": "local:product/orders"}], "SELECT 1"))
+
+        self.assertIsInstance(result, str)
+        self.assertEqual(
+            [
+                {"id": 1, "amount": "9.50", "ordered_at": "2024-01-02T03:04:05"},
+                {"id": 2, "amount": None, "ordered_at": None},
+            ],
+            json.loads(result),
+        )
+
+    def test_query_columnar(self):
+        """Test that columnar results list the column names once, followed by the value rows."""
+        records = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+        with patch.object(server.DataAssetManager, "query_product", return_value=records):
+            result = asyncio.run(server.dataproducts_query(
+                [{"product_id": "local:product/orders"}], "SELECT 1", columnar=True
+            ))
+
+        self.assertEqual({"columns": ["id", "name"], "rows": [[1, "a"], [2, "b"]]}, json.loads(result))
+
+    def test_query_runs_outside_event_loop(self):
+        """Test that sources are queried in a worker thread, so the event loop is not blocked."""
+        threads = []
+
+        def query_product(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return [{"id": 1}]
+
+        with patch.object(server.DataAssetManager, "query_product", side_effect=query_product):
+            result = asyncio.run(server.dataproducts_query([{"product_id": "local:product/orders"}], "SELECT 1"))
+
+        self.assertEqual([{"id": 1}], json.loads(result))
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+
+
+
+class TestAssetTools(unittest.TestCase):
+    """Test the tools that return assets."""
+
+    def test_assets_are_loaded_outside_event_loop(self):
+        """Test that listing and loading assets runs in worker threads."""
+        threads = []
+
+        def record_thread(result):
+            def load(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return result
+            return load
+
+        identifier = server.AssetIdentifier.from_string("local:product/orders.dataproduct.yaml")
+        with (
+            patch.object(server.DataAssetManager, "list_assets", side_effect=record_thread([identifier])),
+            patch.object(server.DataAssetManager, "get_asset_content", side_effect=record_thread("id: orders")),
+            patch.object(server.DataAssetManager, "get_contract_by_id", side_effect=record_thread("id: c")),
+            patch.object(server.DataAssetManager, "get_contract_ids", return_value=[]),
+        ):
+            listed = asyncio.run(server.dataproducts_list())
+            product = asyncio.run(server.dataproducts_get("local:product/orders.dataproduct.yaml"))
+            contract = asyncio.run(server.dataproducts_get_output_port("local:contract/c.datacontract.yaml"))
+
+        self.assertEqual([{"id": "local:product/orders.dataproduct.yaml", "source": "local"}], listed)
+        self.assertEqual(("id: orders", "id: c"), (product, contract))
+        self.assertEqual(3, len(threads))
+        self.assertNotIn(threading.main_thread(), threads)
+
+
+    def test_concurrent_identical_calls_share_one_load(self):
+        """Test that identical calls in progress at the same time load the asset only once."""
+        def get_asset_content(identifier):
+            time.sleep(0.05)
+            return "id: orders"
+
+        async def get_concurrently(*identifiers):
+            return await asyncio.gather(*(server.dataproducts_get(identifier) for identifier in identifiers))
+
+        orders = "local:product/orders.dataproduct.yaml"
+        customers = "local:product/customers.dataproduct.yaml"
+        with (
+            patch.object(server.DataAssetManager, "get_asset_content", side_effect=get_asset_content) as load,
+            patch.object(server.DataAssetManager, "get_contract_ids", return_value=[]),
+        ):
+            results = asyncio.run(get_concurrently(orders, orders, orders, customers))
+            self.assertEqual(2, load.call_count)
+
+            # Once a call is done, the next one loads the asset again
+            asyncio.run(server.dataproducts_get(orders))
+            self.assertEqual(3, load.call_count)
+
+        self.assertEqual(["id: orders"] * 4, results)
+        self.assertEqual({}, server._in_flight)
+
+    def test_get_product_prefetches_linked_contracts(self):
+        """Test that the contracts of a product are loaded in the background, and shared with their requests."""
+        contract = "local:contract/orders.datacontract.yaml"
+        started = threading.Event()
+        release = threading.Event()
+
+        def get_contract_by_id(identifier):
+            started.set()
+            release.wait(5)
+            return "id: orders-contract"
+
+        async def get_product_then_contract():
+            product = await server.dataproducts_get("local:product/orders.dataproduct.yaml")
+            # The contract is requested while its prefetch is still loading it
+            await asyncio.to_thread(started.wait, 5)
+            release.set()
+            return product, await server.dataproducts_get_output_port(contract)
+
+        with (
+            patch.object(server.DataAssetManager, "get_asset_content", return_value="id: orders"),
+            patch.object(server.DataAssetManager, "get_contract_ids", return_value=[contract]),
+            patch.object(server.DataAssetManager, "get_contract_by_id", side_effect=get_contract_by_id) as load,
+        ):
+            result = asyncio.run(get_product_then_contract())
+
+        self.assertEqual(("id: orders", "id: orders-contract"), result)
+        load.assert_called_once_with(contract)
+
+    def test_calls_are_limited_per_source(self):
+        """Test that calls to one source wait for each other beyond the limit, and calls to other sources do not."""
+        lock = threading.Lock()
+        running = {}
+        peaks = {}
+
+        def get_asset_content(identifier):
+            with lock:
+                running[identifier.source] = running.get(identifier.source, 0) + 1
+                peaks[identifier.source] = max(peaks.get(identifier.source, 0), running[identifier.source])
+            time.sleep(0.05)
+            with lock:
+                running[identifier.source] -= 1
+            return "id: product"
+
+        async def get_concurrently(identifiers):
+            return await asyncio.gather(*(server.dataproducts_get(identifier) for identifier in identifiers))
+
+        identifiers = [f"local:product/p{i}.dataproduct.yaml" for i in range(4)]
+        identifiers += [f"datameshmanager:product/p{i}" for i in range(2)]
+        with (
+            patch.object(server, "MAX_CALLS_PER_SOURCE", 2),
+            patch.object(server, "_source_semaphores", {}),
+            patch.object(server.DataAssetManager, "get_asset_content", side_effect=get_asset_content),
+            patch.object(server.DataAssetManager, "get_contract_ids", return_value=[]),
+        ):
+            asyncio.run(get_concurrently(identifiers))
+
+        self.assertEqual({"local": 2, "datameshmanager": 2}, peaks)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""Tests for the SQL utilities."""
+
+import unittest
+
+from dataproduct_mcp.utils.sql_utils import quote_identifier, quote_literal
+
+
+class TestQuoting(unittest.TestCase):
+    """Test quoting identifiers and literals."""
+
+    def test_quote_identifier_escapes_quotes(self):
+        """Test that embedded double quotes are doubled."""
+        self.assertEqual('"orders"', quote_identifier("orders"))
+        self.assertEqual('"video-history ""v2"""', quote_identifier('video-history "v2"'))
+
+    def test_quote_identifier_rejects_invalid_names(self):
+        """Test that empty names and names with control characters are rejected."""
+        for name in ("", "orders\x00", "orders\n; DROP TABLE x"):
+            with self.assertRaises(ValueError):
+                quote_identifier(name)
+
+    def test_quote_literal_escapes_quotes(self):
+        """Test that embedded single quotes are doubled."""
+        self.assertEqual("'o''brien.csv'", quote_literal("o'brien.csv"))
+        self.assertEqual("'42'", quote_literal(42))
+
+
+if __name__ == "__main__":
+    unittest.main()
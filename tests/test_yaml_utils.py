@@ -0,0 +1,77 @@
+"""Tests for the YAML utilities."""
+
+import unittest
+
+import yaml
+
+from dataproduct_mcp.utils.yaml_utils import AssetParseError, dump_yaml, load_yaml, parse_yaml, peek_yaml_id
+
+
+class TestParseYaml(unittest.TestCase):
+    """Test parsing asset YAML content."""
+
+    def test_parse_yaml_keeps_existing_id(self):
+        """Test that an existing id is left unchanged."""
+        asset = parse_yaml("id: orders\ninfo:\n  title: Orders\n")
+
+        self.assertEqual("orders", asset["id"])
+        self.assertEqual("Orders", asset["info"]["title"])
+
+    def test_parse_yaml_default_id_is_stable(self):
+        """Test that the default id only depends on the content, not its type."""
+        content = "info:\n  title: Orders\n"
+
+        from_str = parse_yaml(content)
+        from_bytes = parse_yaml(content.encode("utf-8"))
+
+        self.assertTrue(from_str["id"].startswith("default_"))
+        self.assertEqual(len("default_") + 8, len(from_str["id"]))
+        self.assertEqual(from_str["id"], from_bytes["id"])
+
+    def test_parse_yaml_rejects_non_mapping(self):
+        """Test that content which is not a mapping is rejected."""
+        with self.assertRaises(AssetParseError):
+            parse_yaml("- a\n- b\n")
+
+
+class TestLoadDumpYaml(unittest.TestCase):
+    """Test loading and dumping YAML documents."""
+
+    def test_load_yaml_is_safe(self):
+        """Test that plain documents load and Python-specific tags are rejected."""
+        self.assertEqual({"id": "orders", "tags": ["a", "b"]}, load_yaml("id: orders\ntags: [a, b]\n"))
+
+        with self.assertRaises(yaml.YAMLError):
+            load_yaml("!!python/object/apply:os.getcwd []\n")
+
+    def test_dump_yaml_round_trips(self):
+        """Test that dumped documents load back unchanged."""
+        data = {"id": "orders", "info": {"title": "Orders", "description": "Line one\nline two\n"}, "tags": ["a"]}
+
+        self.assertEqual(data, load_yaml(dump_yaml(data)))
+
+    def test_dump_yaml_is_safe(self):
+        """Test that objects without a plain YAML representation are rejected."""
+        with self.assertRaises(yaml.YAMLError):
+            dump_yaml({"value": object()})
+
+
+class TestPeekYamlId(unittest.TestCase):
+    """Test reading the top-level id without a full parse."""
+
+    def test_peek_yaml_id_skips_nested_ids(self):
+        """Test that ids of nested mappings and sequences are ignored."""
+        content = "info:\n  id: nested\nservers:\n  - id: server\n    tags: [a, b]\nid: 'orders'\n"
+
+        self.assertEqual("orders", peek_yaml_id(content))
+
+    def test_peek_yaml_id_returns_none_without_scalar_id(self):
+        """Test that None is returned when there is no usable top-level id."""
+        self.assertIsNone(peek_yaml_id("info:\n  title: Orders\n"))
+        self.assertIsNone(peek_yaml_id("id:\n  nested: true\n"))
+        self.assertIsNone(peek_yaml_id("- id: orders\n"))
+        self.assertIsNone(peek_yaml_id("id: [unclosed\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()